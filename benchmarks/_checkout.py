@@ -0,0 +1,12 @@
+"""
+Puts the root of this checkout first on sys.path, so the benchmarks run against its pyntual without installing it.
+Benchmarks import it before pyntual.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
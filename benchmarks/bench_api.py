@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of every public call of pyntual.api against a local stub of the external API (see stub_server.py), on the
+recorded fixtures, on its synthetic catalog and on synthetic day series. For calls backed by a single request, the
+network time of _get_request (request and JSON decoding) and the parse time of _to_dataframe are reported apart from
+the end-to-end latency.
+
+Results are written as JSON, and can be compared against a previous run to detect regressions of the minimum
+latency, the least noisy statistic: the exit status is 1 if any case got slower than the tolerance allows.
+
+Usage: python benchmarks/bench_api.py [--rows 10000 100000 ...] [--repeat 5] [--output results.json]
+                                      [--compare baseline.json] [--tolerance 0.25] [--filter days]
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy
+import pandas
+
+import _checkout  # noqa: F401
+import pyntual
+import stub_server
+
+from pyntual import api
+from pyntual.api import decoding
+from pyntual.api.api import _get_request, _to_dataframe
+
+
+class Case:
+    """
+    Benchmarked call: the public function and its arguments, and the request behind it if it performs a single one.
+    """
+
+    def __init__(self,
+                 name: str,
+                 call: Callable[[api.Client], Any],
+                 path: Optional[str] = None,
+                 params: Optional[Dict[str, str]] = None,
+                 rows: Optional[int] = None) -> None:
+        self.name = name
+        self.call = call
+        self.path = path
+        self.params = params or {}
+        self.rows = rows
+
+
+def cases(sizes: List[int]) -> List[Case]:
+    """
+    Cases on the recorded fixtures, then on synthetic day series of every size.
+    """
+    day = datetime(2020, 9, 22)
+    result = [
+        Case('asset_provider', lambda client: api.asset_provider(3, client=client), 'asset_providers/3'),
+        Case('asset_providers', lambda client: api.asset_providers(client=client), 'asset_providers'),
+        Case('banks', lambda client: api.banks(client=client), 'banks'),
+        Case('banks[query]', lambda client: api.banks('de chile', client=client), 'banks', {'q': 'de chile'}),
+        Case('conceptual_asset', lambda client: api.conceptual_asset(25, client=client), 'conceptual_assets/25'),
+        Case('conceptual_assets', lambda client: api.conceptual_assets(client=client), 'conceptual_assets'),
+        Case('conceptual_assets[provider]', lambda client: api.conceptual_assets(3, client=client),
+             'asset_providers/3/conceptual_assets'),
+        Case('conceptual_assets[name]', lambda client: api.conceptual_assets(name='chile', client=client),
+             'conceptual_assets', {'name': 'chile'}),
+        Case('real_asset', lambda client: api.real_asset(166, client=client), 'real_assets/166'),
+        Case('real_assets', lambda client: api.real_assets(25, client=client), 'conceptual_assets/25/real_assets'),
+        Case('real_asset_days', lambda client: api.real_asset_days(166, client=client), 'real_assets/166/days'),
+        Case('real_asset_days[date]', lambda client: api.real_asset_days(166, date=day, client=client),
+             'real_assets/166/days', {'date': '2020-09-22'}),
+    ]
+    for rows in sizes:
+        path = f'real_assets/{rows}/days'
+        many = [rows + offset for offset in range(4)]
+        result += [
+            Case(f'real_asset_days[{rows}]', lambda client, id_=rows: api.real_asset_days(id_, client=client),
+                 path, rows=rows),
+            Case(f'real_asset_days[{rows},numpy]',
+                 lambda client, id_=rows: api.real_asset_days(id_, client=client, output='numpy'), rows=rows),
+            Case(f'real_asset_days[{rows},dict]',
+                 lambda client, id_=rows: api.real_asset_days(id_, client=client, output='dict'), rows=rows),
+            Case(f'real_asset_days_stream[{rows}]',
+                 lambda client, id_=rows: api.real_asset_days_stream(id_, client=client), rows=rows),
+            Case(f'iter_real_asset_days[{rows}]',
+                 lambda client, id_=rows: sum(len(batch) for batch in api.iter_real_asset_days(id_, client=client)),
+                 rows=rows),
+            Case(f'real_asset_days_many[4x{rows}]',
+                 lambda client, ids=many: api.real_asset_days_many(ids, max_workers=4, client=client),
+                 rows=sum(many)),
+        ]
+    return result + catalog_cases()
+
+
+def catalog_cases() -> List[Case]:
+    """
+    Cases on the synthetic catalog of the stub: bulk lookups, lineages, Parquet export, search indexes, and a crawl of
+    the whole catalog (10 asset providers, 20 conceptual assets, 40 real assets) followed by refreshes of the store.
+    """
+    state: Dict[str, Any] = {}
+
+    def search(client: api.Client) -> Any:
+        if 'index' not in state:
+            state['index'] = api.conceptual_assets_index(client)
+        return state['index'].search('chile')
+
+    def parquet(client: api.Client) -> Any:
+        with tempfile.TemporaryDirectory() as root:
+            return api.write_real_asset_days_parquet(range(1000, 1004), root, client=client)
+
+    def refresh(client: api.Client) -> Any:
+        if 'store' not in state:
+            state['store'] = api.DayStore(':memory:')
+            api.crawl(state['store'], client=client)
+        return api.refresh(state['store'], client=client)
+
+    return [
+        Case('asset_provider_many[listing]',
+             lambda client: api.asset_provider_many([120, 121, 122, 123, 124], client=client)),
+        Case('conceptual_asset_many[8]', lambda client: api.conceptual_asset_many(range(240, 248), client=client)),
+        Case('real_asset_many[16]', lambda client: api.real_asset_many(range(1000, 1016), client=client)),
+        Case('real_asset_lineage[4]', lambda client: api.real_asset_lineage(1003, client=client)),
+        Case('real_asset_days_lineage[4]', lambda client: api.real_asset_days_lineage(1003, client=client)),
+        Case('write_real_asset_days_parquet[4]', parquet),
+        Case('banks_index', lambda client: api.banks_index(client)),
+        Case('conceptual_assets_index.search', search),
+        Case('crawl', lambda client: api.crawl(api.DayStore(':memory:'), client=client)),
+        Case('refresh[up to date]', refresh),
+    ]
+
+
+def summary(times: List[float]) -> Dict[str, float]:
+    """
+    Minimum, median and 95th percentile (nearest rank) of timings, in milliseconds.
+    """
+    ordered = sorted(times)
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {'min': ordered[0] * 1e3, 'median': statistics.median(ordered) * 1e3, 'p95': p95 * 1e3}
+
+
+def timed(function: Callable[[], Any], repeat: int) -> List[float]:
+    """
+    Wall-clock times of a function, after a warm-up call.
+    """
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(case: Case, client: api.Client, repeat: int) -> Dict[str, Any]:
+    """
+    Measures a case.
+    """
+    result = {'case': case.name, 'repeat': repeat, 'rows': case.rows}
+    latency = summary(timed(lambda: case.call(client), repeat))
+    result['latency_ms'] = latency
+    result['network_ms'] = result['parse_ms'] = result['bytes'] = result['wire_bytes'] = None
+    if case.path is not None:
+        data = _get_request(case.path, client, **case.params)
+        result['rows'] = len(data)
+        response = client.session.get(client.url(case.path, **case.params))
+        result['bytes'] = len(response.content)
+        result['wire_bytes'] = int(response.headers.get('Content-Length', result['bytes']))
+        result['network_ms'] = summary(timed(lambda: _get_request(case.path, client, **case.params), repeat))
+        result['parse_ms'] = summary(timed(lambda: _to_dataframe(data), repeat))
+    seconds = latency['median'] / 1e3
+    result['rows_per_s'] = result['rows'] / seconds if result['rows'] else None
+    result['mb_per_s'] = result['bytes'] / seconds / 1e6 if result['bytes'] else None
+    return result
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    """
+    Cases whose minimum latency exceeds the baseline by more than the tolerance.
+    """
+    previous = {result['case']: result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        if result['case'] not in previous:
+            continue
+        old, new = previous[result['case']]['latency_ms']['min'], result['latency_ms']['min']
+        if new > old * (1 + tolerance):
+            regressions.append(f'{result["case"]}: {old:.2f} ms -> {new:.2f} ms (+{(new / old - 1) * 100:.0f}%)')
+    return regressions
+
+
+def print_table(results: List[dict]) -> None:
+    """
+    Human readable results, on stderr so stdout stays machine readable.
+    """
+    def median(value: Optional[dict]) -> str:
+        return f'{value["median"]:>10.2f}' if value else f'{"-":>10}'
+
+    print(f'{"case":<36} {"rows":>8} {"latency":>10} {"p95":>10} {"network":>10} {"parse":>10} {"rows/s":>12}',
+          file=sys.stderr)
+    for result in results:
+        rows_per_s = f'{result["rows_per_s"]:>12.0f}' if result['rows_per_s'] else f'{"-":>12}'
+        print(f'{result["case"]:<36} {result["rows"] or "-":>8} {median(result["latency_ms"])} '
+              f'{result["latency_ms"]["p95"]:>10.2f} {median(result["network_ms"])} {median(result["parse_ms"])} '
+              f'{rows_per_s}', file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='*', default=[10000, 100000], help='Sizes of synthetic series.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed calls of each case.')
+    parser.add_argument('--output', help='File the JSON results are written to, stdout if absent.')
+    parser.add_argument('--compare', help='JSON results of a previous run.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Accepted slowdown, as a fraction.')
+    parser.add_argument('--filter', default='', help='Only run cases whose name contains this text.')
+    parser.add_argument('--no-compression', action='store_true', help='Request uncompressed responses.')
+    args = parser.parse_args(argv)
+
+    server, base_url = stub_server.start()
+    results = []
+    try:
+        with api.Client(base_url=base_url, compression=not args.no_compression) as client:
+            for case in cases(args.rows):
+                if args.filter in case.name:
+                    results.append(run(case, client, args.repeat))
+    finally:
+        server.shutdown()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'pyntual': pyntual.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pandas.__version__,
+            'numpy': numpy.__version__,
+            'repeat': args.repeat,
+            'json_backend': decoding.backend(),
+            'accept_encoding': decoding.accept_encoding(not args.no_compression),
+        },
+        'results': results,
+    }
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f'regression: {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the import time of pyntual, which binds pandas, numpy, requests and asyncio lazily.
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = [
+    ('import pyntual.api', 'import pyntual.api'),
+    ('import pyntual.api + numpy', 'import pyntual.api, numpy'),
+    ('import pyntual.api + requests', 'import pyntual.api, requests'),
+    ('import pyntual.api + pandas + requests (eager)', 'import pyntual.api, pandas, requests'),
+]
+
+CHECK = "import sys, pyntual.api; print(' '.join(m for m in ('pandas', 'numpy', 'requests', 'asyncio') " \
+        "if m in sys.modules))"
+
+
+def measure(statement: str, runs: int) -> float:
+    """
+    Median wall-clock time, in milliseconds, of a fresh interpreter running a statement.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], cwd=ROOT, check=True)
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times)
+
+
+def main(runs: int) -> None:
+    loaded = subprocess.run([sys.executable, '-c', CHECK], cwd=ROOT, check=True, capture_output=True, text=True)
+    print(f'heavy modules loaded by import pyntual.api: {loaded.stdout.strip() or "none"}')
+    baseline = measure('pass', runs)
+    print(f'{"interpreter":<48} {baseline:>8.1f} ms')
+    for name, statement in STATEMENTS:
+        total = measure(statement, runs)
+        print(f'{name:<48} {total:>8.1f} ms {total - baseline:>8.1f} ms over the interpreter')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
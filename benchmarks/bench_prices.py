@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the as-of lookups of pyntual.api.PriceIndex: a batch of lookups through prices against the same lookups
+one at a time through price, over 100 series of ten years of days.
+
+Usage: python benchmarks/bench_prices.py [lookups ...]
+"""
+
+import sys
+import timeit
+import numpy as np
+
+import _checkout  # noqa: F401
+from pyntual.api import PriceIndex
+
+
+def build_index(series: int = 100) -> PriceIndex:
+    """
+    Index of daily series from 2010 to 2019, the price of each day being its offset from the first one.
+    """
+    index = PriceIndex()
+    dates = np.arange('2010-01-01', '2020-01-01', dtype='datetime64[D]')
+    for id_ in range(series):
+        index.add(id_, dates, np.arange(len(dates), dtype=np.float64))
+    return index
+
+
+def main(sizes: list) -> None:
+    index = build_index()
+    dates = np.arange('2010-01-01', '2020-01-01', dtype='datetime64[D]')
+    index.prices([0], dates[:1])
+    print(f'{"lookups":>8} {"batch (ms)":>11} {"per lookup (us)":>16} {"one by one (ms)":>16} {"speedup":>8}')
+    for lookups in sizes:
+        ids = np.random.default_rng(0).integers(0, 100, lookups)
+        wanted = dates[np.random.default_rng(1).integers(0, len(dates), lookups)]
+        batch = min(timeit.repeat(lambda: index.prices(ids, wanted), number=1, repeat=5)) * 1e3
+        # the loop is timed on at most 10000 lookups and scaled, it is linear in their number
+        sample = min(lookups, 10000)
+        pairs = list(zip(ids[:sample].tolist(), wanted[:sample].tolist()))
+        loop = min(timeit.repeat(lambda: [index.price(id_, day) for id_, day in pairs], number=1, repeat=3))
+        loop *= 1e3 * lookups / sample
+        print(f'{lookups:>8} {batch:>11.2f} {batch * 1e3 / lookups:>16.3f} {loop:>16.2f} {loop / batch:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the schema-driven _to_dataframe against the previous implementation, on synthetic day series.
+
+Usage: python benchmarks/bench_to_dataframe.py [rows ...]
+"""
+
+import json
+import sys
+import timeit
+import pandas as pd
+
+from datetime import date, timedelta
+
+import _checkout  # noqa: F401
+from pyntual.api.api import _to_dataframe
+from pyntual.api.schemas import get_schema
+
+
+def legacy_to_dataframe(data: list) -> pd.DataFrame:
+    """
+    Implementation of _to_dataframe up to version 0.2.3, kept as reference.
+    """
+    if len(data) == 0:
+        return pd.DataFrame()
+    dataframe = pd.DataFrame.from_records(map(lambda item: {'id': item['id'], **item['attributes']}, data))
+
+    inner_json_columns = ['last_day']
+    for column in dataframe.columns.to_list():
+        if column in inner_json_columns:
+            aux_df = pd.DataFrame.from_records(dataframe[column].to_list())
+            aux_df = aux_df.rename(columns=lambda name: f'{column}_{name}')
+            dataframe = dataframe.drop(columns=column).merge(aux_df, left_index=True, right_index=True)
+
+    integer_columns = ['id', 'max_scale']
+    float_columns = ['price', 'close_price', 'fixed_fee', 'variable_fee']
+    float_columns += [f'last_day_{attr}' for attr in float_columns]
+    date_columns = ['date', 'last_day_date']
+    for column in dataframe.columns:
+        if column in integer_columns:
+            try:
+                dataframe[column] = dataframe[column].astype(int)
+            except ValueError:
+                pass
+        elif column in float_columns:
+            dataframe[column] = pd.to_numeric(dataframe[column], errors='coerce')
+        elif column in date_columns:
+            dataframe[column] = pd.to_datetime(dataframe[column], errors='coerce')
+
+    return dataframe.sort_values('id').set_index('id').rename_axis(None)
+
+
+def synthetic_days(rows: int, id_: int = 166) -> list:
+    """
+    Day series of a real asset as returned by /real_assets/{id}/days, newest first.
+    """
+    start = date(2000, 1, 1)
+    data = []
+    for offset in reversed(range(rows)):
+        day = (start + timedelta(days=offset)).isoformat()
+        price = round(1000 + offset * 0.01, 4)
+        data.append({'id': f'{id_}-{day}', 'type': 'real_asset_day',
+                     'attributes': {'date': day, 'price': price, 'close_price': price, 'close_price_type': 'clp'}})
+    # round trip, so every item is a freshly decoded JSON object
+    return json.loads(json.dumps(data))
+
+
+def main(sizes: list) -> None:
+    categorical = get_schema('real_asset_day').replace(categorical=True, float32=True)
+    print(f'{"rows":>8} {"legacy (ms)":>12} {"schema (ms)":>12} {"speedup":>8} {"schema cat/f32 (ms)":>20}')
+    for rows in sizes:
+        data = synthetic_days(rows)
+        repeat = max(3, 20000 // rows)
+        legacy = min(timeit.repeat(lambda: legacy_to_dataframe(data), number=1, repeat=repeat)) * 1e3
+        schema = min(timeit.repeat(lambda: _to_dataframe(data), number=1, repeat=repeat)) * 1e3
+        compact = min(timeit.repeat(lambda: _to_dataframe(data, categorical), number=1, repeat=repeat)) * 1e3
+        print(f'{rows:>8} {legacy:>12.2f} {schema:>12.2f} {legacy / schema:>7.1f}x {compact:>20.2f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000])
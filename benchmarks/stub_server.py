@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+"""
+Local stub of the external API, serving the recorded responses of `tests/json_responses` and synthetic day series
+of any size, so benchmarks measure the client without the noise of the real network.
+
+/real_assets/{rows}/days, for any id other than 166, serves a synthetic series of that many days, honoring from_date
+and to_date. Other ids missing from the fixtures get a synthetic catalog: asset provider {id} lists conceptual assets
+2 * {id} and 2 * {id} + 1, conceptual asset {id} lists real assets 1000 + 2 * {id} % 1000 and the next one, and real
+assets are chained by fours through previous_asset_id (1003 continues 1002, which continues 1001, then 1000). Bodies
+are sent gzip compressed to clients accepting it.
+
+Usage: python benchmarks/stub_server.py [port]
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from bench_to_dataframe import synthetic_days
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'json_responses')
+
+# (path, sorted GET parameter names) -> fixture
+ROUTES = {
+    ('asset_providers', ()): 'asset_providers',
+    ('asset_providers/3', ()): 'asset_provider_3',
+    ('asset_providers/3/conceptual_assets', ()): 'conceptual_assets_3',
+    ('banks', ()): 'banks',
+    ('banks', ('q',)): 'banks_q_de_chile',
+    ('conceptual_assets', ()): 'conceptual_assets',
+    ('conceptual_assets', ('name',)): 'conceptual_assets_name_chile',
+    ('conceptual_assets', ('run',)): 'conceptual_assets_full',
+    ('conceptual_assets/25', ()): 'conceptual_asset_25',
+    ('conceptual_assets/25/real_assets', ()): 'real_assets_25',
+    ('real_assets/166', ()): 'real_asset_166',
+    ('real_assets/166/days', ()): 'real_asset_days_166',
+    ('real_assets/166/days', ('date',)): 'real_asset_days_166_20200922',
+    ('real_assets/166/days', ('from_date', 'to_date')): 'real_asset_days_166_20200922_25',
+}
+
+
+class Bodies:
+    """
+    Encoded response bodies, built once and kept for every following request.
+    """
+
+    def __init__(self) -> None:
+        self._bodies: Dict[object, bytes] = {}
+        self._gzipped: Dict[object, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: object, build: Callable[[], object]) -> bytes:
+        with self._lock:
+            if key not in self._bodies:
+                self._bodies[key] = json.dumps(build()).encode('utf-8')
+            return self._bodies[key]
+
+    def gzipped(self, body: bytes) -> bytes:
+        with self._lock:
+            # bodies are kept, so their identity is a stable key
+            if id(body) not in self._gzipped:
+                self._gzipped[id(body)] = gzip.compress(body, compresslevel=6)
+            return self._gzipped[id(body)]
+
+    def route(self, path: str, params: Dict[str, list]) -> Optional[bytes]:
+        """
+        Body of a request, None if the stub does not know it.
+        """
+        path = path.strip('/')
+        if path.startswith('api/'):
+            path = path[len('api/'):]
+        fixture = ROUTES.get((path, tuple(sorted(params))))
+        if fixture is not None:
+            return self.get(fixture, lambda: _load(fixture))
+        parts = path.split('/')
+        if len(parts) < 2 or not parts[1].isdigit():
+            return None
+        resource, id_, rest = parts[0], int(parts[1]), '/'.join(parts[2:])
+        if (resource, rest) == ('real_assets', 'days'):
+            low, high = params.get('from_date', [''])[0], params.get('to_date', ['9999'])[0]
+            return self.get((id_, low, high), lambda: {'data': [item for item in synthetic_days(id_, id_)
+                                                                if low <= item['attributes']['date'] <= high]})
+        if (resource, rest) == ('asset_providers', 'conceptual_assets'):
+            return self.get(path, lambda: {'data': [_item('conceptual_asset', child) for child in _children(id_)]})
+        if (resource, rest) == ('conceptual_assets', 'real_assets'):
+            return self.get(path, lambda: {'data': [_item('real_asset', 1000 + child % 1000)
+                                                    for child in _children(id_)]})
+        if rest == '' and resource in ('asset_providers', 'conceptual_assets', 'real_assets'):
+            return self.get(path, lambda: {'data': _item(resource[:-1], id_)})
+        return None
+
+
+def _children(id_: int) -> List[int]:
+    return [2 * id_, 2 * id_ + 1]
+
+
+def _item(type_: str, id_: int) -> dict:
+    """
+    Synthetic item of the catalog. The days of real asset {id} span {id} days from 2000-01-01, see synthetic_days.
+    """
+    attributes = {'name': f'Synthetic {type_.replace("_", " ")} {id_}'}
+    if type_ == 'real_asset':
+        # position in its chain of four, 0 being the oldest; each one is in use for 250 days
+        link, first = id_ % 4, date(2000, 1, 1)
+        attributes.update({
+            'start_date': (first + timedelta(days=250 * link)).isoformat() if link else None,
+            'end_date': (first + timedelta(days=250 * link + 249)).isoformat() if link < 3 else None,
+            'previous_asset_id': id_ - 1 if link else None,
+            'last_day': {'close_price': round(1000 + (id_ - 1) * 0.01, 4),
+                         'date': (first + timedelta(days=id_ - 1)).isoformat()},
+        })
+    return {'id': str(id_), 'type': type_, 'attributes': attributes}
+
+
+def _load(fixture: str) -> dict:
+    with open(os.path.join(FIXTURES, f'{fixture}.json')) as fixture_file:
+        return json.load(fixture_file)
+
+
+def _handler(bodies: Bodies) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # headers and body are sent apart, Nagle's algorithm would hold the body for a delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            body = bodies.route(url.path, parse_qs(url.query))
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = bodies.gzipped(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return Handler
+
+
+def start(port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Starts the stub in a background thread.
+
+    :param port: Port to listen on, any free one if zero.
+    :return: Server, to be shut down, and base url to be given to pyntual.api.Client.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), _handler(Bodies()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/api'
+
+
+if __name__ == '__main__':
+    stub, base_url = start(int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    print(f'serving {base_url}, Ctrl-C to stop')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.shutdown()
@@ -0,0 +1,34 @@
+import importlib
+
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access. Heavy dependencies (pandas, numpy, requests)
+    are bound through it, so importing pyntual stays cheap until a DataFrame or a request is actually needed.
+    """
+
+    def __init__(self, name: str, extra: Optional[str] = None) -> None:
+        """
+        :param name: Absolute name of the module.
+        :param extra: Extra of pyntual installing the module, if it is an optional dependency.
+        """
+        self.__name = name
+        self.__extra = extra
+        self.__module: Optional[ModuleType] = None
+
+    def __getattr__(self, attribute: str) -> Any:
+        if self.__module is None:
+            try:
+                self.__module = importlib.import_module(self.__name)
+            except ImportError as error:
+                if self.__extra is None:
+                    raise
+                raise ImportError(f'{self.__name} is required for this feature, '
+                                  f'install it with: pip install pyntual[{self.__extra}]') from error
+        return getattr(self.__module, attribute)
+
+    def __repr__(self) -> str:
+        return f'<lazy module {self.__name!r}{"" if self.__module is None else " (loaded)"}>'
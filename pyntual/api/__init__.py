@@ -7,15 +7,76 @@ from .api import (
     real_asset,
     real_assets,
     real_asset_days,
+    iter_real_asset_days,
+    real_asset_days_stream,
 )
+from .aio import AsyncClient
+from .archive import Archive
+from .bulk import (
+    asset_provider_many,
+    conceptual_asset_many,
+    real_asset_days_many,
+    real_asset_many,
+    write_real_asset_days_parquet,
+)
+from .cache import CacheInfo, ResponseCache, ValidatorCache
+from .client import (
+    Client,
+    get_default_client,
+    set_default_client,
+)
+from .crawler import CrawlResult, crawl
+from .lineage import LineageSegment, real_asset_days_lineage, real_asset_lineage
+from .metrics import MetricsAggregator, RequestMetrics
+from .prices import PriceIndex
+from .refresh import RefreshResult, RefreshTask, plan_refresh, refresh
+from .schemas import Schema, configure_schemas
+from .search import SearchIndex, banks_index, conceptual_assets_index
+from .store import DayStore
+from .throttling import RateLimiter, RetryPolicy
 
 __all__ = [
     'asset_provider',
+    'asset_provider_many',
     'asset_providers',
     'banks',
     'conceptual_asset',
+    'conceptual_asset_many',
     'conceptual_assets',
     'real_asset',
+    'real_asset_many',
     'real_assets',
     'real_asset_days',
+    'real_asset_lineage',
+    'real_asset_days_lineage',
+    'real_asset_days_many',
+    'real_asset_days_stream',
+    'write_real_asset_days_parquet',
+    'iter_real_asset_days',
+    'banks_index',
+    'conceptual_assets_index',
+    'crawl',
+    'plan_refresh',
+    'refresh',
+    'get_default_client',
+    'set_default_client',
+    'configure_schemas',
+    'Archive',
+    'AsyncClient',
+    'CacheInfo',
+    'Client',
+    'CrawlResult',
+    'DayStore',
+    'LineageSegment',
+    'MetricsAggregator',
+    'PriceIndex',
+    'RateLimiter',
+    'RefreshResult',
+    'RefreshTask',
+    'RequestMetrics',
+    'ResponseCache',
+    'RetryPolicy',
+    'Schema',
+    'SearchIndex',
+    'ValidatorCache',
 ]
@@ -0,0 +1,339 @@
+import os
+
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from .._lazy import LazyModule
+from .api import Output, _convert, _real_asset_days_request, _verify_output, _verify_type
+from .cache import CacheKey, cache_key
+from .client import Client, get_default_client
+from .decoding import loads
+
+asyncio = LazyModule('asyncio')
+httpx = LazyModule('httpx', extra='async')
+pd = LazyModule('pandas')
+requests = LazyModule('requests')
+
+
+def _timeout(timeout: Optional[Union[float, Tuple[float, float]]]) -> 'httpx.Timeout':
+    """
+    Internal utility that turns a Client timeout, a single value or a (connect, read) tuple, into an httpx.Timeout.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class AsyncClient:
+    """
+    Asyncio counterpart of Client. Requests are performed on the event loop by an httpx.AsyncClient, so awaiting
+    hundreds of calls takes neither threads nor blocking calls, and an asyncio.Semaphore keeps at most
+    max_concurrency of them in flight. Requires httpx, install it with: pip install pyntual[async].
+
+    It follows the configuration of a Client: base url, timeout, compression, response cache, archive, rate limiter,
+    retry policy and coalescing of identical requests in flight. Validators and hooks are only honored by Client.
+    Connections are bound to the event loop they are opened in, a client used from a new loop opens new ones.
+    """
+
+    def __init__(self,
+                 client: Optional[Client] = None,
+                 max_concurrency: int = 16,
+                 transport: Optional['httpx.AsyncBaseTransport'] = None) -> None:
+        """
+        :param client: Client whose configuration is followed, a new one with the default configuration if absent.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param transport: Transport of the httpx.AsyncClient, such as httpx.MockTransport (optional).
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError(f'max_concurrency ({max_concurrency}) must be a positive int.')
+        self.client = client or Client()
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self._loop: Optional['asyncio.AbstractEventLoop'] = None
+        self._session: Optional['httpx.AsyncClient'] = None
+        self._semaphore: Optional['asyncio.Semaphore'] = None
+        self._flights: Dict[CacheKey, 'asyncio.Future'] = {}
+
+    async def get(self, path: str, **kwargs: str) -> list:
+        """
+        Async version of Client.get. Data served by the cache or shared by concurrent identical requests is shared
+        with other callers, and must not be mutated.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param kwargs: GET parameters (optional).
+        :return: List of JSON response.
+        """
+        self._bind()
+        cache = self.client.cache
+        if cache is None or not cache.cacheable(path):
+            return await self._coalesced(path, kwargs, lambda: self._fetch(path, kwargs))
+        key = cache_key(path, kwargs)
+        data = cache.get(key)
+        if data is None:
+            async def fetch() -> list:
+                return cache.set(key, await self._fetch(path, kwargs))
+            data = await self._coalesced(path, kwargs, fetch)
+        return data
+
+    async def _coalesced(self, path: str, params: dict, fetch: Callable[[], Awaitable[list]]) -> list:
+        """
+        Internal utility that performs a request, or awaits an identical one in progress and shares its data. The
+        request is shielded, so a cancelled caller does not cancel it for the others.
+        """
+        if self.client.flights is None:
+            return await fetch()
+        key = cache_key(path, params)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(fetch())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(flight)
+
+    async def _fetch(self, path: str, params: dict) -> list:
+        """
+        Internal utility that serves a GET request from the archive, or performs it and records it to the archive.
+        """
+        archive = self.client.archive
+        if archive is None:
+            return await self._download(path, params)
+        try:
+            data = archive.lookup(path, params)
+        except requests.exceptions.HTTPError as error:
+            # archived failures are raised as httpx raises them
+            request = httpx.Request('GET', self.client.url(path, **params))
+            response = httpx.Response(error.response.status_code, request=request)
+            raise httpx.HTTPStatusError(str(error), request=request, response=response) from None
+        if data is None:
+            try:
+                data = await self._download(path, params)
+            except httpx.HTTPStatusError as error:
+                archive.record_failure(path, params, error.response.status_code, error.response.reason_phrase)
+                raise
+            archive.record(path, params, data)
+        return data
+
+    async def _download(self, path: str, params: dict) -> list:
+        """
+        Internal utility that performs the GET request, waiting for the rate limiter and retrying transient failures
+        as the retry policy states. Only the attempts themselves hold the semaphore, not the delays between them.
+        """
+        session, semaphore = self._bind()
+        url, retry, rate_limiter = self.client.url(path, **params), self.client.retry, self.client.rate_limiter
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async()
+            try:
+                async with semaphore:
+                    response = await session.get(url)
+            except httpx.TransportError:
+                if retry is None or attempt >= retry.retries:
+                    raise
+                delay = retry.delay(attempt)
+            else:
+                if retry is None or attempt >= retry.retries or response.status_code not in retry.statuses:
+                    break
+                delay = retry.delay(attempt, response.headers.get('Retry-After'))
+            await asyncio.sleep(delay)
+            attempt += 1
+        response.raise_for_status()
+        data = loads(response.content)['data']
+        return data if isinstance(data, list) else [data]
+
+    def _bind(self) -> Tuple['httpx.AsyncClient', 'asyncio.Semaphore']:
+        """
+        Internal utility that returns the session and semaphore of the running event loop, opening them on the first
+        request of each loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            headers = {} if self.client.compression else {'Accept-Encoding': 'identity'}
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            self._session = httpx.AsyncClient(timeout=_timeout(self.client.timeout), headers=headers, limits=limits,
+                                              transport=self.transport)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._flights = {}
+            self._loop = loop
+        return self._session, self._semaphore
+
+    async def aclose(self) -> None:
+        """
+        Closes the connections opened in the running event loop, without waiting for any other request.
+        """
+        if self._session is not None and self._loop is asyncio.get_running_loop():
+            await self._session.aclose()
+        self._loop = self._session = self._semaphore = None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+_default_async_client: Optional[AsyncClient] = None
+
+
+def get_default_async_client() -> AsyncClient:
+    """
+    Returns the async client used by calls that do not receive one, creating it on first use. It follows the default
+    Client, so both share its cache, archive, rate limiter and retry policy.
+
+    :return: Default async client.
+    """
+    global _default_async_client
+    if _default_async_client is None:
+        _default_async_client = AsyncClient(get_default_client())
+    return _default_async_client
+
+
+def set_default_async_client(client: AsyncClient) -> None:
+    """
+    Replaces the async client used by calls that do not receive one.
+
+    :param client: New default async client.
+    """
+    if not isinstance(client, AsyncClient):
+        raise TypeError(f'client ({client}) must be AsyncClient, not {type(client).__name__}.')
+    global _default_async_client
+    _default_async_client = client
+
+
+async def _get_output(path: str, client: Optional[AsyncClient], output: str, **kwargs: str) -> Output:
+    """
+    Internal utility that performs a GET request and converts its response into the requested output, see
+    pyntual.api.api._get_output.
+    """
+    data = await (client or get_default_async_client()).get(path, **kwargs)
+    return _convert(data, output)
+
+
+async def asset_provider(id_: int, client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.asset_provider.
+
+    :param id_: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    _verify_type(id_, int, 'Asset provider id')
+    return await _get_output(os.path.join('asset_providers', str(id_)), client, output)
+
+
+async def asset_providers(client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.asset_providers.
+
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    return await _get_output('asset_providers', client, output)
+
+
+async def banks(query: Optional[str] = None, client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.banks.
+
+    :param query: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    if query:
+        return await _get_output('banks', client, output, q=query)
+    return await _get_output('banks', client, output)
+
+
+async def conceptual_asset(id_: int, client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.conceptual_asset.
+
+    :param id_: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    _verify_type(id_, int, 'Conceptual asset id')
+    return await _get_output(os.path.join('conceptual_assets', str(id_)), client, output)
+
+
+async def conceptual_assets(asset_provider_id: Optional[int] = None,
+                            run: Optional[str] = None,
+                            name: Optional[str] = None,
+                            client: Optional[AsyncClient] = None,
+                            output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.conceptual_assets.
+
+    :param asset_provider_id: parameter on external API.
+    :param run: parameter on external API.
+    :param name: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    path = 'conceptual_assets'
+    if asset_provider_id:
+        _verify_type(asset_provider_id, int, 'Asset provider id')
+        path = os.path.join('asset_providers', str(asset_provider_id), path)
+
+    params = {key: value for key, value in [('run', run), ('name', name)] if value}
+    return await _get_output(path, client, output, **params)
+
+
+async def real_asset(id_: int, client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.real_asset.
+
+    :param id_: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    _verify_type(id_, int, 'Asset id')
+    return await _get_output(os.path.join('real_assets', str(id_)), client, output)
+
+
+async def real_assets(conceptual_asset_id: int, client: Optional[AsyncClient] = None, output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.real_assets.
+
+    :param conceptual_asset_id: parameter on external API.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    _verify_type(conceptual_asset_id, int, 'Conceptual asset id')
+    return await _get_output(os.path.join('conceptual_assets', str(conceptual_asset_id), 'real_assets'), client, output)
+
+
+async def real_asset_days(id_: int,
+                          date: Optional[datetime] = None,
+                          to_date: Optional[datetime] = None,
+                          from_date: Optional[datetime] = None,
+                          client: Optional[AsyncClient] = None,
+                          output: str = 'pandas') -> Output:
+    """
+    Async version of pyntual.api.real_asset_days, without date-window chunking.
+
+    :param id_: parameter on external API.
+    :param date: parameter on external API. If set, to_date and from_date must be absent.
+    :param to_date: parameter on external API. If set, date must be absent.
+    :param from_date: parameter on external API. If set, date must be absent.
+    :param client: Async client performing the request, the default async client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    path, params = _real_asset_days_request(id_, date, to_date, from_date)
+    return await _get_output(path, client, output, **params)
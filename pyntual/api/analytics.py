@@ -0,0 +1,199 @@
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
+
+from .._lazy import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+Matrix = Union['pd.DataFrame', 'np.ndarray']
+
+PERIODS_PER_YEAR = 252
+
+
+def price_matrix(days: Union['pd.DataFrame', Mapping[int, 'pd.DataFrame']],
+                 column: str = 'price',
+                 fill: bool = True) -> 'pd.DataFrame':
+    """
+    Aligns the day series of many real assets into a date x real_asset_id matrix, the input of every other function
+    of this module.
+
+    :param days: Either the long output of real_asset_days_many, indexed by (real_asset_id, date), or a mapping from
+        real asset id to its real_asset_days DataFrame.
+    :param column: Column used as values, such as 'price' or 'close_price'.
+    :param fill: If set, gaps inside each series (dates published for other assets only) hold the previous price.
+        Dates before the first and after the last price of a series are left missing either way.
+    :return: Pandas DataFrame indexed by date, one float64 column per real asset.
+    """
+    if isinstance(days, pd.DataFrame):
+        if days.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='date'), dtype='float64')
+        matrix = days[column].unstack(level='real_asset_id')
+    else:
+        series = {id_: dataframe.set_index('date')[column] for id_, dataframe in days.items() if not dataframe.empty}
+        if not series:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='date'), dtype='float64')
+        matrix = pd.DataFrame(series).rename_axis(index='date', columns='real_asset_id')
+    matrix = matrix.sort_index().astype('float64')
+    if fill:
+        matrix = pd.DataFrame(_fill_inside(matrix.to_numpy()), index=matrix.index, columns=matrix.columns)
+    return matrix
+
+
+def returns(prices: Matrix, periods: int = 1) -> Matrix:
+    """
+    Simple returns of every series over a number of rows, p[t] / p[t - periods] - 1.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :param periods: Number of rows the return spans.
+    :return: Matrix of returns of the same shape, the first periods rows are missing.
+    """
+    _verify_periods(periods, 'periods')
+    values, wrap = _unwrap(prices)
+    result = np.full_like(values, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[periods:] = values[periods:] / values[:-periods] - 1
+    return wrap(result)
+
+
+def rolling_returns(prices: Matrix, window: int, periods_per_year: Optional[float] = None) -> Matrix:
+    """
+    Returns of every series over a rolling window of rows, compounded over the window, optionally annualized.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :param window: Number of rows of the window, such as 21 for a monthly window of daily prices.
+    :param periods_per_year: If set, returns are annualized as (1 + r) ** (periods_per_year / window) - 1.
+    :return: Matrix of returns of the same shape, the first window rows are missing.
+    """
+    result = returns(prices, window)
+    if periods_per_year is None:
+        return result
+    values, wrap = _unwrap(result)
+    with np.errstate(invalid='ignore'):
+        return wrap((1 + values) ** (periods_per_year / window) - 1)
+
+
+def annualized_volatility(prices: Matrix,
+                          periods_per_year: float = PERIODS_PER_YEAR) -> Union['pd.Series', 'np.ndarray']:
+    """
+    Annualized volatility of every series: sample standard deviation of its daily returns times the square root of
+    periods_per_year. Missing returns are skipped.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :param periods_per_year: Number of rows per year.
+    :return: Volatility of each asset, missing for series with less than two returns.
+    """
+    values, wrap = _unwrap(returns(prices))
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    zeroed = np.where(valid, values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = zeroed.sum(axis=0) / count
+        variance = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0) / (count - 1)
+    variance[count < 2] = np.nan
+    return wrap(np.sqrt(variance * periods_per_year), axis=1)
+
+
+def drawdowns(prices: Matrix) -> Matrix:
+    """
+    Drawdown of every series at each date: the loss from its highest price so far, p[t] / max(p[:t + 1]) - 1.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :return: Matrix of non positive drawdowns of the same shape, missing where the price is.
+    """
+    values, wrap = _unwrap(prices)
+    if len(values) == 0:
+        return wrap(values.copy())
+    # fmax skips missing prices, so the running maximum survives gaps
+    peak = np.fmax.accumulate(values, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return wrap(values / peak - 1)
+
+
+def max_drawdown(prices: Matrix) -> Union['pd.Series', 'np.ndarray']:
+    """
+    Maximum drawdown of every series: the largest loss from a peak to a later trough.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :return: Non positive maximum drawdown of each asset, missing for series without prices.
+    """
+    values, wrap = _unwrap(drawdowns(prices))
+    lowest = np.where(np.isnan(values), np.inf, values).min(axis=0, initial=np.inf)
+    lowest[np.isinf(lowest)] = np.nan
+    return wrap(lowest, axis=1)
+
+
+def correlation(prices: Matrix, min_periods: int = 2) -> Matrix:
+    """
+    Correlation matrix of the daily returns of every pair of series, each pair over the dates both have a return.
+    Pairwise sums are computed for every pair at once, as matrix products over the zero-filled returns and their
+    validity mask.
+
+    :param prices: Date x asset matrix of prices, see price_matrix.
+    :param min_periods: Minimum number of common returns of a pair, its correlation is missing below it.
+    :return: Asset x asset correlation matrix.
+    """
+    _verify_periods(min_periods, 'min_periods')
+    values, _ = _unwrap(returns(prices))
+    valid = (~np.isnan(values)).astype(np.float64)
+    zeroed = np.where(valid > 0, values, 0.0)
+
+    # for a pair (i, j): count, sums and sums of squares of i and j over their common dates, and sum of products
+    count = valid.T @ valid
+    sum_i = zeroed.T @ valid
+    sum_j = sum_i.T
+    squares_i = (zeroed ** 2).T @ valid
+    squares_j = squares_i.T
+    products = zeroed.T @ zeroed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sum_i * sum_j / count
+        variance_i = squares_i - sum_i ** 2 / count
+        variance_j = squares_j - sum_j ** 2 / count
+        result = covariance / np.sqrt(variance_i * variance_j)
+    result[(count < min_periods) | (variance_i <= 0) | (variance_j <= 0)] = np.nan
+    result = np.clip(result, -1.0, 1.0)
+    diagonal = np.diag_indices_from(result)
+    result[diagonal] = np.where(np.isnan(result[diagonal]), np.nan, 1.0)
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(result, index=prices.columns, columns=prices.columns)
+    return result
+
+
+def _fill_inside(values: 'np.ndarray') -> 'np.ndarray':
+    """
+    Internal utility that replaces missing values by the previous valid one of their column, only between the first
+    and the last valid value of the column.
+    """
+    if values.size == 0:
+        return values
+    valid = ~np.isnan(values)
+    rows = np.arange(len(values))[:, None]
+    previous = np.maximum.accumulate(np.where(valid, rows, 0), axis=0)
+    filled = np.take_along_axis(values, previous, axis=0)
+    last = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+    filled[rows > last] = np.nan
+    return filled
+
+
+def _unwrap(matrix: Matrix) -> Tuple['np.ndarray', Callable[..., Any]]:
+    """
+    Internal utility that reads a date x asset matrix as a float64 array, along with a function wrapping results
+    back into the labels of the input: a DataFrame of the same shape (axis=0), or a Series per column (axis=1).
+    """
+    if isinstance(matrix, pd.DataFrame):
+        def wrap(result: 'np.ndarray', axis: int = 0) -> Any:
+            if axis == 1:
+                return pd.Series(result, index=matrix.columns)
+            return pd.DataFrame(result, index=matrix.index, columns=matrix.columns)
+        return matrix.to_numpy(dtype=np.float64, na_value=np.nan), wrap
+    values = np.asarray(matrix, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError(f'prices must be a date x asset matrix, not a {values.ndim}-dimensional array.')
+    return values, lambda result, axis=0: result
+
+
+def _verify_periods(value: int, name: str) -> None:
+    """
+    Internal utility that asserts a positive number of rows. Raises ValueError.
+    """
+    if not isinstance(value, int) or value < 1:
+        raise ValueError(f'{name} ({value}) must be a positive int.')
@@ -1,69 +1,122 @@
 import os
-import requests
-import pandas as pd
 
-from requests import utils
-from typing import Any, Type, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_, datetime, time, timedelta
+from itertools import islice
+from time import sleep
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
 
+from .._lazy import LazyModule
+from .cache import CachedData
+from .client import Client, get_default_client
+from .metrics import measure, timer
+from .schemas import Schema, get_schema
+from .throttling import RetryPolicy
 
-def _get_request(path: str, **kwargs: str) -> list:
+pa = LazyModule('pyarrow', extra='arrow')
+pd = LazyModule('pandas')
+requests = LazyModule('requests')
+
+OUTPUTS = ('pandas', 'numpy', 'dict', 'arrow')
+Output = Union['pd.DataFrame', 'pa.Table', Dict[str, Sequence]]
+
+
+def _get_request(path: str, client: Optional[Client] = None, **kwargs: str) -> list:
     """
     Internal utility to wrap the logic of a GET request. It returns the raw JSON response as a list of dictionaries, if
     the response is a single dict, it is wrapped in a list. It raises an error if the response is not 200.
 
     :param path: URI of the request, not including base of the url nor GET parameters.
+    :param client: Client performing the request, the default client if absent.
     :param kwargs: GET parameters (optional).
     :return: List of JSON response.
     """
-    url = os.path.join('https://fintual.cl/api', path)
-    if kwargs:
-        args = '&'.join([f'{key}={value}' for key, value in kwargs.items()])
-        url = utils.requote_uri(f'{url}?{args}')
-    request = requests.get(url)
-    request.raise_for_status()
-    data = request.json()['data']
-    return data if type(data) == list else [data]
+    return (client or get_default_client()).get(path, **kwargs)
+
+
+def _get_output(path: str, client: Optional[Client], output: str, **kwargs: str) -> Output:
+    """
+    Internal utility that performs a GET request and converts its response into the requested output. If the client
+    has hooks, the build time is reported along with the request, in the same RequestMetrics.
 
+    :param path: URI of the request, not including base of the url nor GET parameters.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :param kwargs: GET parameters (optional).
+    :return: Pandas DataFrame, or mapping from column name to its values.
+    """
+    client = client or get_default_client()
+    if not client.hooks:
+        return _convert(client.get(path, **kwargs), output)
+    with measure(client.hooks, path, kwargs) as metrics:
+        data = client.get(path, **kwargs)
+        with timer(metrics, 'build_time'):
+            return _convert(data, output)
 
-def _to_dataframe(data: list) -> pd.DataFrame:
+
+def _to_dataframe(data: list, schema: Optional[Schema] = None) -> 'pd.DataFrame':
     """
-    Internal utility to wrap the logic of turning an external API response into a dataframe using
-    DataFrame.from_records constructor. It also handles JSON flattening and type casting.
+    Internal utility to wrap the logic of turning an external API response into a dataframe. Typed columns are built
+    straight from the JSON data following the schema of the resource type, see pyntual.api.schemas.
 
     :param data: List of JSON data from external API.
+    :param schema: Schema of the data, looked up by the resource type if absent.
     :return: Pandas DataFrame from data records.
     """
     if len(data) == 0:
         return pd.DataFrame()
-    dataframe = pd.DataFrame.from_records(map(lambda item: {'id': item['id'], **item['attributes']}, data))
-
-    # handling nested json (one level only)
-    inner_json_columns = ['last_day']
-    for column in dataframe.columns.to_list():
-        if column in inner_json_columns:
-            aux_df = pd.DataFrame.from_records(dataframe[column].to_list())
-            aux_df = aux_df.rename(columns=lambda name: f'{column}_{name}')
-            dataframe = dataframe.drop(columns=column).merge(aux_df, left_index=True, right_index=True)
-
-    # type casting
-    integer_columns = ['id', 'max_scale']
-    float_columns = ['price', 'close_price', 'fixed_fee', 'variable_fee']
-    float_columns += [f'last_day_{attr}' for attr in float_columns]
-    date_columns = ['date', 'last_day_date']
-    for column in dataframe.columns:
-        if column in integer_columns:
-            # Apparently there are non integer ids. (?)
-            try:
-                dataframe[column] = dataframe[column].astype(int)
-            except ValueError:
-                pass
-        elif column in float_columns:
-            dataframe[column] = pd.to_numeric(dataframe[column], errors='coerce')
-        elif column in date_columns:
-            dataframe[column] = pd.to_datetime(dataframe[column], errors='coerce')
+    return (schema or get_schema(data[0].get('type'))).build(data)
+
 
-    return dataframe.sort_values('id').set_index('id').rename_axis(None)
+def _convert(data: list, output: str) -> Output:
+    """
+    Internal utility that turns an external API response into the requested output. Only the pandas output imports
+    pandas; 'numpy' builds typed NumPy columns and 'dict' keeps the columns as parsed, both in the order of the
+    external API, and 'arrow' builds a pyarrow Table sorted by id. Outputs of data served by a ResponseCache or a
+    ValidatorCache are built once, and copied afterwards, but Arrow tables, which are immutable; they are built again
+    once configure_schemas replaces the schema they were built with.
+
+    :param data: List of JSON data from external API.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+    :return: Pandas DataFrame, Arrow table, or mapping from column name to its values.
+    """
+    schema = get_schema(data[0].get('type') if data else None)
+    if not isinstance(data, CachedData):
+        return _build_output(data, output, schema)
+    built = data.memo.get(output)
+    if built is None or built[0] is not schema:
+        built = data.memo[output] = (schema, _build_output(data, output, schema))
+    result = built[1]
+    if output == 'arrow':
+        return result
+    elif output == 'pandas':
+        return result.copy()
+    elif output == 'numpy':
+        return {name: values.copy() for name, values in result.items()}
+    return {name: list(values) for name, values in result.items()}
+
+
+def _build_output(data: list, output: str, schema: Schema) -> Output:
+    """
+    Internal utility that builds an output from scratch, see _convert.
+    """
+    if output == 'pandas':
+        return _to_dataframe(data, schema)
+    if output == 'numpy':
+        return schema.arrays(data)
+    elif output == 'arrow':
+        return schema.table(data)
+    return {name: list(values) for name, values in schema.flatten(data).items()}
+
+
+def _verify_output(output: str) -> None:
+    """
+    Internal utility to assert a proper output format. Raises ValueError.
+
+    :param output: Variable to be asserted.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'output ({output}) must be one of {", ".join(OUTPUTS)}.')
 
 
 def _verify_type(variable: Any, type_: Type, name: str) -> None:
@@ -88,113 +141,141 @@ def _date_to_str(date: datetime) -> str:
     return date.strftime('%Y-%m-%d')
 
 
-def asset_provider(id_: int) -> pd.DataFrame:
+def asset_provider(id_: int,
+                   client: Optional[Client] = None,
+                   output: str = 'pandas') -> Output:
     """
     Corresponds to /asset_providers/{id} on external API.
 
     :param id_: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     _verify_type(id_, int, 'Asset provider id')
     path = os.path.join('asset_providers', str(id_))
-    return _to_dataframe(_get_request(path))
+    return _get_output(path, client, output)
 
 
-def asset_providers() -> pd.DataFrame:
+def asset_providers(client: Optional[Client] = None,
+                    output: str = 'pandas') -> Output:
     """
     Corresponds to /asset_providers on external API.
 
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
-    return _to_dataframe(_get_request('asset_providers'))
+    _verify_output(output)
+    return _get_output('asset_providers', client, output)
 
 
-def banks(query: Optional[str] = None) -> pd.DataFrame:
+def banks(query: Optional[str] = None,
+          client: Optional[Client] = None,
+          output: str = 'pandas') -> Output:
     """
     Corresponds to /banks on external API.
 
     :param query: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     if query:
-        data = _get_request('banks', q=query)
-    else:
-        data = _get_request('banks')
-    return _to_dataframe(data)
+        return _get_output('banks', client, output, q=query)
+    return _get_output('banks', client, output)
 
 
-def conceptual_asset(id_: int) -> pd.DataFrame:
+def conceptual_asset(id_: int,
+                     client: Optional[Client] = None,
+                     output: str = 'pandas') -> Output:
     """
     Corresponds to /conceptual_assets/{id} on external API.
 
     :param id_: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     _verify_type(id_, int, 'Conceptual asset id')
     path = os.path.join('conceptual_assets', str(id_))
-    return _to_dataframe(_get_request(path))
+    return _get_output(path, client, output)
 
 
 def conceptual_assets(asset_provider_id: Optional[int] = None,
                       run: Optional[str] = None,
-                      name: Optional[str] = None) -> pd.DataFrame:
+                      name: Optional[str] = None,
+                      client: Optional[Client] = None,
+                      output: str = 'pandas') -> Output:
     """
     Corresponds to /conceptual_assets and /asset_providers/{asset_provider_id}/conceptual_assets on external API.
 
     :param asset_provider_id: parameter on external API.
     :param run: parameter on external API.
     :param name: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     path = 'conceptual_assets'
     if asset_provider_id:
         _verify_type(asset_provider_id, int, 'Asset provider id')
         path = os.path.join('asset_providers', str(asset_provider_id), path)
 
-    if run or name:
-        params = {key: value for key, value in [('run', run), ('name', name)] if value}
-        data = _get_request(path, **params)
-    else:
-        data = _get_request(path)
-    return _to_dataframe(data)
+    params = {key: value for key, value in [('run', run), ('name', name)] if value}
+    return _get_output(path, client, output, **params)
 
 
-def real_asset(id_: int) -> pd.DataFrame:
+def real_asset(id_: int,
+               client: Optional[Client] = None,
+               output: str = 'pandas') -> Output:
     """
     Corresponds to /real_assets/{id} on external API.
 
     :param id_: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     _verify_type(id_, int, 'Asset id')
     path = os.path.join('real_assets', str(id_))
-    return _to_dataframe(_get_request(path))
+    return _get_output(path, client, output)
 
 
-def real_assets(conceptual_asset_id: int) -> pd.DataFrame:
+def real_assets(conceptual_asset_id: int,
+                client: Optional[Client] = None,
+                output: str = 'pandas') -> Output:
     """
     Corresponds to /conceptual_assets/{conceptual_asset_id}/real_assets on external API.
 
     :param conceptual_asset_id: parameter on external API.
-    :return: Pandas DataFrame with the response data.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
     """
+    _verify_output(output)
     _verify_type(conceptual_asset_id, int, 'Conceptual asset id')
     path = os.path.join('conceptual_assets', str(conceptual_asset_id), 'real_assets')
-    return _to_dataframe(_get_request(path))
+    return _get_output(path, client, output)
 
 
-def real_asset_days(id_: int,
-                    date: Optional[datetime] = None,
-                    to_date: Optional[datetime] = None,
-                    from_date: Optional[datetime] = None) -> pd.DataFrame:
+def _real_asset_days_request(id_: int,
+                             date: Optional[datetime] = None,
+                             to_date: Optional[datetime] = None,
+                             from_date: Optional[datetime] = None) -> Tuple[str, Dict[str, str]]:
     """
-    Corresponds to /real_assets/{real_asset_id}/days on external API.
+    Internal utility that validates the parameters of /real_assets/{real_asset_id}/days.
 
     :param id_: parameter on external API.
     :param date: parameter on external API. If set, to_date and from_date must be absent.
     :param to_date: parameter on external API. If set, date must be absent.
     :param from_date: parameter on external API. If set, date must be absent.
-    :return: Pandas DataFrame with the response data.
+    :return: Path and GET parameters of the request.
     """
     _verify_type(id_, int, 'Real asset id')
     if date and (to_date or from_date):
@@ -203,14 +284,211 @@ def real_asset_days(id_: int,
 
     if date:
         _verify_type(date, datetime, 'Date')
-        data = _get_request(path, date=_date_to_str(date))
+        return path, {'date': _date_to_str(date)}
     elif to_date or from_date:
         params = {key: value for key, value in [('to_date', to_date), ('from_date', from_date)] if value}
         for key in params.keys():
             _verify_type(params[key], datetime, key)
             params[key] = _date_to_str(params[key])
-        data = _get_request(path, **params)
+        return path, params
     else:
-        data = _get_request(path)
+        return path, {}
+
 
-    return _to_dataframe(data)
+def _real_asset_days_data(id_: int,
+                          date: Optional[datetime] = None,
+                          to_date: Optional[datetime] = None,
+                          from_date: Optional[datetime] = None,
+                          client: Optional[Client] = None) -> list:
+    """
+    Internal utility that validates the parameters of /real_assets/{real_asset_id}/days and performs the request.
+
+    :param id_: parameter on external API.
+    :param date: parameter on external API. If set, to_date and from_date must be absent.
+    :param to_date: parameter on external API. If set, date must be absent.
+    :param from_date: parameter on external API. If set, date must be absent.
+    :param client: Client performing the request, the default client if absent.
+    :return: List of JSON response.
+    """
+    path, params = _real_asset_days_request(id_, date, to_date, from_date)
+    return _get_request(path, client, **params)
+
+
+def _date_windows(from_date: datetime, to_date: datetime, days: int) -> List[Tuple[datetime, datetime]]:
+    """
+    Internal utility that splits [from_date, to_date] into consecutive windows of at most the given number of days.
+
+    :param from_date: First date of the range.
+    :param to_date: Last date of the range.
+    :param days: Maximum length of each window.
+    :return: Inclusive (from_date, to_date) windows, newest first.
+    """
+    windows, end = [], datetime.combine(to_date.date(), time())
+    from_date = datetime.combine(from_date.date(), time())
+    while end >= from_date:
+        start = max(from_date, end - timedelta(days=days - 1))
+        windows.append((start, end))
+        end = start - timedelta(days=1)
+    return windows
+
+
+def _real_asset_days_chunked(id_: int,
+                             to_date: Optional[datetime],
+                             from_date: Optional[datetime],
+                             chunk_days: int,
+                             max_workers: int,
+                             retries: int,
+                             client: Optional[Client]) -> list:
+    """
+    Internal utility that requests /real_assets/{real_asset_id}/days by date windows, concurrently, retrying each
+    failing window on its own with exponential backoff, unless the client has a retry policy of its own. Without
+    from_date, the history starts at the real asset start_date; when it is unknown, waves of windows are requested
+    backwards until a whole wave comes back empty.
+
+    :return: List of JSON response, without repeated days.
+    """
+    _verify_type(chunk_days, int, 'chunk_days')
+    if chunk_days < 1:
+        raise ValueError(f'chunk_days ({chunk_days}) must be positive.')
+    _verify_type(retries, int, 'retries')
+    if retries < 0:
+        raise ValueError(f'retries ({retries}) must not be negative.')
+    for key, value in [('to_date', to_date), ('from_date', from_date)]:
+        if value:
+            _verify_type(value, datetime, key)
+    to_date = to_date or datetime.combine(date_.today(), time())
+    if not from_date:
+        start_date = _get_request(os.path.join('real_assets', str(id_)), client)[0]['attributes'].get('start_date')
+        from_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+
+    client = client or get_default_client()
+    # a client retry policy already retries each request, retrying its windows again would multiply the attempts
+    policy = RetryPolicy(retries=retries) if client.retry is None else None
+
+    def fetch(window: Tuple[datetime, datetime]) -> list:
+        attempt = 0
+        while True:
+            try:
+                return _real_asset_days_data(id_, to_date=window[1], from_date=window[0], client=client)
+            except requests.exceptions.HTTPError as error:
+                if policy is None or attempt >= policy.retries or error.response is None or \
+                        error.response.status_code < 500:
+                    raise
+            except requests.exceptions.RequestException:
+                if policy is None or attempt >= policy.retries:
+                    raise
+            sleep(policy.delay(attempt))
+            attempt += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if from_date:
+            results = list(executor.map(fetch, _date_windows(from_date, to_date, chunk_days)))
+        else:
+            results, end = [], to_date
+            while True:
+                wave = _date_windows(end - timedelta(days=chunk_days * max_workers - 1), end, chunk_days)
+                wave_results = list(executor.map(fetch, wave))
+                results += wave_results
+                if not any(wave_results):
+                    break
+                end = wave[-1][0] - timedelta(days=1)
+    return list({item['id']: item for items in results for item in items}.values())
+
+
+def real_asset_days(id_: int,
+                    date: Optional[datetime] = None,
+                    to_date: Optional[datetime] = None,
+                    from_date: Optional[datetime] = None,
+                    client: Optional[Client] = None,
+                    output: str = 'pandas',
+                    chunk_days: Optional[int] = None,
+                    max_workers: int = 8,
+                    retries: int = 2) -> Output:
+    """
+    Corresponds to /real_assets/{real_asset_id}/days on external API.
+
+    :param id_: parameter on external API.
+    :param date: parameter on external API. If set, to_date and from_date must be absent.
+    :param to_date: parameter on external API. If set, date must be absent.
+    :param from_date: parameter on external API. If set, date must be absent.
+    :param client: Client performing the request, the default client if absent.
+    :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. Only 'pandas' imports pandas, see _convert.
+    :param chunk_days: If set, the range is requested concurrently by windows of this many days, and stitched back.
+    :param max_workers: Maximum number of windows requested at once, if chunk_days is set.
+    :param retries: Number of times a failing window is requested again, with exponential backoff, if chunk_days is
+        set. Ignored if the client has a retry policy, which retries every request already.
+    :return: Pandas DataFrame with the response data, or its columns for the other outputs.
+    """
+    _verify_output(output)
+    if chunk_days is not None and not date:
+        _verify_type(id_, int, 'Real asset id')
+        data = _real_asset_days_chunked(id_, to_date, from_date, chunk_days, max_workers, retries, client)
+        return _convert(data, output)
+    path, params = _real_asset_days_request(id_, date, to_date, from_date)
+    return _get_output(path, client, output, **params)
+
+
+def _iter_batches(items: Iterable[dict], batch_size: int) -> Iterator['pd.DataFrame']:
+    """
+    Internal utility that groups JSON items into DataFrames of at most batch_size rows.
+
+    :param items: JSON items from external API.
+    :param batch_size: Maximum number of rows of each DataFrame.
+    :return: Iterator of Pandas DataFrames.
+    """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f'batch_size ({batch_size}) must be a positive int.')
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if len(batch) == 0:
+            return
+        yield _to_dataframe(batch)
+
+
+def iter_real_asset_days(id_: int,
+                         date: Optional[datetime] = None,
+                         to_date: Optional[datetime] = None,
+                         from_date: Optional[datetime] = None,
+                         batch_size: int = 10000,
+                         client: Optional[Client] = None) -> Iterator['pd.DataFrame']:
+    """
+    Streaming version of pyntual.api.real_asset_days: the response is parsed while it is received, and yielded as
+    DataFrames of at most batch_size rows, in the order of the external API (newest days first).
+
+    :param id_: parameter on external API.
+    :param date: parameter on external API. If set, to_date and from_date must be absent.
+    :param to_date: parameter on external API. If set, date must be absent.
+    :param from_date: parameter on external API. If set, date must be absent.
+    :param batch_size: Maximum number of rows of each DataFrame.
+    :param client: Client performing the request, the default client if absent.
+    :return: Iterator of Pandas DataFrames with the response data.
+    """
+    path, params = _real_asset_days_request(id_, date, to_date, from_date)
+    return _iter_batches((client or get_default_client()).stream(path, **params), batch_size)
+
+
+def real_asset_days_stream(id_: int,
+                           date: Optional[datetime] = None,
+                           to_date: Optional[datetime] = None,
+                           from_date: Optional[datetime] = None,
+                           batch_size: int = 10000,
+                           client: Optional[Client] = None) -> 'pd.DataFrame':
+    """
+    Low memory version of pyntual.api.real_asset_days, returning the same DataFrame. Peak memory is bounded by the
+    typed batches instead of the raw body and its decoded tree.
+
+    :param id_: parameter on external API.
+    :param date: parameter on external API. If set, to_date and from_date must be absent.
+    :param to_date: parameter on external API. If set, date must be absent.
+    :param from_date: parameter on external API. If set, date must be absent.
+    :param batch_size: Maximum number of rows parsed at once.
+    :param client: Client performing the request, the default client if absent.
+    :return: Pandas DataFrame with the response data.
+    """
+    batches = list(iter_real_asset_days(id_, date, to_date, from_date, batch_size, client))
+    if len(batches) == 0:
+        return pd.DataFrame()
+    # newest days come first, so reversing the batches usually leaves the index sorted
+    dataframe = pd.concat(batches[::-1]) if len(batches) > 1 else batches[0]
+    return dataframe if dataframe.index.is_monotonic_increasing else dataframe.sort_index()
@@ -0,0 +1,165 @@
+import gzip
+import json
+import os
+import threading
+import zlib
+
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from .._lazy import LazyModule
+from .cache import CacheKey, cache_key
+from .decoding import loads
+
+requests = LazyModule('requests')
+
+RECORD = 'record'
+REPLAY = 'replay'
+AUTO = 'auto'
+MODES = (RECORD, REPLAY, AUTO)
+
+
+class _Failure(NamedTuple):
+    """
+    Internal record of a request the external API answered with an error status.
+    """
+    status: int
+    reason: str
+
+
+class Archive:
+    """
+    Local archive of external API responses, to run the same calls many times against a fixed snapshot, offline. It
+    is opt-in, by passing it to a Client:
+
+    - 'record' performs every request and captures its data, starting a new archive.
+    - 'replay' serves every request from the archive, without any network access; requests not archived raise
+      KeyError.
+    - 'auto' serves archived requests and records the others, appending them to the archive.
+
+    Requests are keyed by path and GET parameters, as in ResponseCache. Requests answered with an error status are
+    archived too, and replaying them raises the same requests.exceptions.HTTPError. The archive is a gzip compressed
+    file of JSON lines, one per request, flushed as responses arrive; a file cut short (by a crash while recording)
+    keeps every complete line. Archived data is shared with every caller, and must not be mutated.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY) -> None:
+        """
+        :param path: Path of the archive, such as 'snapshot.jsonl.gz'.
+        :param mode: One of 'record', 'replay' or 'auto'.
+        """
+        if mode not in MODES:
+            raise ValueError(f'mode ({mode}) must be one of {", ".join(MODES)}.')
+        self.path = path
+        self.mode = mode
+        self._entries: Dict[CacheKey, Union[list, _Failure]] = {}
+        self._lock = threading.Lock()
+        self._file: Optional[Any] = None
+        if mode == REPLAY or (mode == AUTO and os.path.exists(path)):
+            self._load()
+
+    def lookup(self, path: str, params: Dict[str, Any]) -> Optional[list]:
+        """
+        Archived data of a request, if it is to be served from the archive.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param params: GET parameters.
+        :return: Archived data, None if the request is to be performed.
+        """
+        if self.mode == RECORD:
+            return None
+        key = cache_key(path, params)
+        with self._lock:
+            data = self._entries.get(key)
+        if data is None and self.mode == REPLAY:
+            raise KeyError(f'{key[0]} with params {dict(key[1])} is not in the archive {self.path}.')
+        if isinstance(data, _Failure):
+            response = requests.models.Response()
+            response.status_code, response.reason, response.url = data.status, data.reason, key[0]
+            response.raise_for_status()
+        return data
+
+    def record(self, path: str, params: Dict[str, Any], data: list) -> None:
+        """
+        Captures the data of a request performed. Nothing is captured in 'replay' mode.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param params: GET parameters.
+        :param data: List of JSON data from external API.
+        """
+        self._write(path, params, {'data': data}, data)
+
+    def record_failure(self, path: str, params: Dict[str, Any], status: int, reason: str = '') -> None:
+        """
+        Captures the error status a request performed was answered with. Nothing is captured in 'replay' mode.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param params: GET parameters.
+        :param status: HTTP status of the response, such as 404.
+        :param reason: Reason phrase of the response, such as 'Not Found'.
+        """
+        self._write(path, params, {'status': status, 'reason': reason}, _Failure(status, reason))
+
+    def keys(self) -> List[CacheKey]:
+        """
+        Keys of the archived requests, see pyntual.api.cache.cache_key.
+
+        :return: Sorted list of keys.
+        """
+        with self._lock:
+            return sorted(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """
+        Finishes writing the archive.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'Archive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _write(self, path: str, params: Dict[str, Any], fields: dict, entry: Union[list, _Failure]) -> None:
+        """
+        Internal utility that appends a line to the archive, flushing it so that it survives a crash.
+        """
+        if self.mode == REPLAY:
+            return
+        key = cache_key(path, params)
+        line = json.dumps({'path': key[0], 'params': dict(key[1]), **fields}, separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                # recording starts a new archive, auto mode appends a new gzip member to it
+                self._file = gzip.open(self.path, 'wt' if self.mode == RECORD else 'at', encoding='utf-8')
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._entries[key] = entry
+
+    def _load(self) -> None:
+        """
+        Internal utility that reads every complete line of the archive, later lines of a request replacing earlier
+        ones.
+        """
+        with gzip.open(self.path, 'rb') as archive_file:
+            try:
+                for line in archive_file:
+                    if not line.endswith(b'\n'):
+                        break
+                    entry = loads(line)
+                    key = cache_key(entry['path'], entry['params'])
+                    if 'status' in entry:
+                        self._entries[key] = _Failure(entry['status'], entry['reason'])
+                    else:
+                        self._entries[key] = entry['data']
+            except (EOFError, zlib.error):
+                pass
@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .._lazy import LazyModule
+from .api import _get_request, _real_asset_days_data, _to_dataframe, _verify_type
+from .client import Client
+from .schemas import get_schema
+
+ds = LazyModule('pyarrow.dataset', extra='arrow')
+np = LazyModule('numpy')
+pa = LazyModule('pyarrow', extra='arrow')
+pc = LazyModule('pyarrow.compute', extra='arrow')
+pd = LazyModule('pandas')
+requests = LazyModule('requests')
+
+logger = logging.getLogger(__name__)
+
+
+def _unique_ids(ids: Iterable[int], name: str) -> List[int]:
+    """
+    Internal utility that validates a collection of ids and drops repeated ones, keeping their order.
+
+    :param ids: Collection of ids.
+    :param name: Name of the ids to be displayed on error message.
+    :return: List of unique ids.
+    """
+    ids = list(dict.fromkeys(ids))
+    for id_ in ids:
+        _verify_type(id_, int, name)
+    return ids
+
+
+def _days_dataframe(data: Dict[int, list]) -> 'pd.DataFrame':
+    """
+    Internal utility that builds a single DataFrame from the /days responses of many real assets, indexed by
+    (real_asset_id, date).
+
+    :param data: Mapping from real asset id to its list of JSON data.
+    :return: Pandas DataFrame with the response data.
+    """
+    records = [{'id': item['id'], 'attributes': {'real_asset_id': id_, **item['attributes']}}
+               for id_, items in data.items() for item in items]
+    if len(records) == 0:
+        index = pd.MultiIndex.from_arrays([[], []], names=['real_asset_id', 'date'])
+        return pd.DataFrame(index=index)
+    return _to_dataframe(records).set_index(['real_asset_id', 'date']).sort_index()
+
+
+def _days_table(data: Dict[int, list]) -> 'pa.Table':
+    """
+    Internal utility that builds a single Arrow table from the /days responses of many real assets, with a leading
+    real_asset_id column and sorted by (real_asset_id, date), without pandas.
+
+    :param data: Mapping from real asset id to its list of JSON data.
+    :return: Arrow table with the response data.
+    """
+    tables = []
+    for id_, items in sorted(data.items()):
+        if len(items) == 0:
+            continue
+        table = get_schema(items[0].get('type')).table(items)
+        if 'date' in table.column_names:
+            table = table.sort_by('date')
+        tables.append(table.add_column(0, 'real_asset_id', pa.array(np.full(table.num_rows, id_, dtype=np.int64))))
+    if len(tables) == 0:
+        return pa.table({'real_asset_id': pa.array([], pa.int64()), 'date': pa.array([], pa.date32())})
+    return pa.concat_tables(tables, promote_options='default')
+
+
+def _fetch_days_many(ids: List[int],
+                     to_date: Optional[datetime],
+                     from_date: Optional[datetime],
+                     max_workers: int,
+                     client: Optional[Client]) -> Tuple[Dict[int, list], Dict[int, Exception]]:
+    """
+    Internal utility that fetches /real_assets/{real_asset_id}/days for many real assets in parallel.
+
+    :return: Mapping from real asset id to its list of JSON data, and mapping from failing id to its exception.
+    """
+    for key, value in [('to_date', to_date), ('from_date', from_date)]:
+        if value:
+            _verify_type(value, datetime, key)
+
+    def fetch(id_: int) -> list:
+        return _real_asset_days_data(id_, to_date=to_date, from_date=from_date, client=client)
+
+    data, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {id_: executor.submit(fetch, id_) for id_ in ids}
+        for id_, future in futures.items():
+            try:
+                data[id_] = future.result()
+            except Exception as error:
+                errors[id_] = error
+    return data, errors
+
+
+def real_asset_days_many(ids: Iterable[int],
+                         to_date: Optional[datetime] = None,
+                         from_date: Optional[datetime] = None,
+                         wide: bool = False,
+                         price_column: str = 'price',
+                         max_workers: int = 16,
+                         client: Optional[Client] = None,
+                         output: str = 'pandas') -> Union['pd.DataFrame', 'pa.Table']:
+    """
+    Fetches /real_assets/{real_asset_id}/days for many real assets in parallel. A failing id does not abort the
+    batch, its exception is reported in the ``errors`` entry of DataFrame.attrs, a dict keyed by id. Arrow tables
+    report the failing ids and their messages as JSON, in the ``errors`` entry of their schema metadata.
+
+    :param ids: Real asset ids, repeated ones are fetched once.
+    :param to_date: parameter on external API.
+    :param from_date: parameter on external API.
+    :param wide: If set, returns a date x real_asset_id matrix of price_column instead of the long format.
+    :param price_column: Column used as values of the wide matrix.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :param output: Either 'pandas' or 'arrow', which builds a long format table straight from the JSON data.
+    :return: Pandas DataFrame indexed by (real_asset_id, date), or by date if wide is set; or Arrow table sorted by
+        (real_asset_id, date).
+    """
+    if output not in ('pandas', 'arrow'):
+        raise ValueError(f'output ({output}) must be one of pandas, arrow.')
+    if wide and output == 'arrow':
+        raise ValueError('Cannot set wide along with the arrow output.')
+    ids = _unique_ids(ids, 'Real asset id')
+    data, errors = _fetch_days_many(ids, to_date, from_date, max_workers, client)
+
+    if output == 'arrow':
+        messages = {str(id_): f'{type(error).__name__}: {error}' for id_, error in errors.items()}
+        return _days_table(data).replace_schema_metadata({'errors': json.dumps(messages)})
+    dataframe = _days_dataframe(data)
+    if wide:
+        if dataframe.empty:
+            dataframe = pd.DataFrame(index=pd.DatetimeIndex([], name='date'))
+        else:
+            dataframe = dataframe[price_column].unstack(level='real_asset_id')
+    dataframe.attrs['errors'] = errors
+    return dataframe
+
+
+def write_real_asset_days_parquet(ids: Iterable[int],
+                                  root_path: str,
+                                  to_date: Optional[datetime] = None,
+                                  from_date: Optional[datetime] = None,
+                                  max_workers: int = 16,
+                                  client: Optional[Client] = None,
+                                  existing_data_behavior: str = 'delete_matching') -> Dict[int, Exception]:
+    """
+    Fetches /real_assets/{real_asset_id}/days for many real assets in parallel and writes them as a Parquet dataset,
+    hive partitioned by real asset and year (root_path/real_asset_id=166/year=2020/...). Tables are built straight
+    from the JSON data, pandas is never involved. Requires pyarrow.
+
+    :param ids: Real asset ids, repeated ones are fetched once.
+    :param root_path: Directory of the dataset.
+    :param to_date: parameter on external API.
+    :param from_date: parameter on external API.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :param existing_data_behavior: As in pyarrow.dataset.write_dataset. By default every partition written replaces
+        the previous one, so years must be fetched whole; 'overwrite_or_ignore' adds files next to the existing ones.
+    :return: Mapping from failing id to its exception, the other ids are written.
+    """
+    ids = _unique_ids(ids, 'Real asset id')
+    data, errors = _fetch_days_many(ids, to_date, from_date, max_workers, client)
+    table = _days_table(data)
+    if table.num_rows == 0:
+        return errors
+    table = table.append_column('year', pc.year(table['date']).cast(pa.int32()))
+    ds.write_dataset(table, root_path, format='parquet', partitioning=['real_asset_id', 'year'],
+                     partitioning_flavor='hive', existing_data_behavior=existing_data_behavior)
+    return errors
+
+
+def _fetch_items(paths: Dict[int, str],
+                 max_workers: int,
+                 client: Optional[Client]) -> Tuple[Dict[int, dict], List[int], Dict[int, Exception]]:
+    """
+    Internal utility that fetches single items, such as /real_assets/{id}, in parallel.
+
+    :param paths: Mapping from id to the URI of its item.
+    :return: Mapping from id to its JSON data, ids not found (404) and mapping from failing id to its exception. An
+        item whose id is not the requested one is an error too.
+    """
+    found, missing, errors = {}, [], {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {id_: executor.submit(_get_request, path, client) for id_, path in paths.items()}
+        for id_, future in futures.items():
+            try:
+                data = future.result()
+            except requests.exceptions.HTTPError as error:
+                if error.response is not None and error.response.status_code == 404:
+                    missing.append(id_)
+                else:
+                    errors[id_] = error
+                continue
+            except Exception as error:
+                errors[id_] = error
+                continue
+            if len(data) == 0:
+                missing.append(id_)
+            elif str(data[0].get('id')) != str(id_):
+                errors[id_] = ValueError(f'{paths[id_]} returned the item with id {data[0].get("id")}.')
+            else:
+                found[id_] = data[0]
+    return found, missing, errors
+
+
+def _lookup_many(ids: Iterable[int],
+                 name: str,
+                 path: str,
+                 listing: bool,
+                 listing_threshold: Optional[int],
+                 max_workers: int,
+                 client: Optional[Client]) -> 'pd.DataFrame':
+    """
+    Internal utility that fetches many items of a resource, from its listing when there are at least
+    listing_threshold ids, and one by one otherwise; ids absent from the listing, or every id if the listing fails,
+    are still requested one by one.
+
+    :param ids: Ids of the items, repeated ones are fetched once.
+    :param name: Name of the ids to be displayed on error message.
+    :param path: URI of the resource, such as 'real_assets'.
+    :param listing: Whether path itself lists every item of the resource.
+    :param listing_threshold: Minimum number of ids for the listing to be requested, never if None.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Pandas DataFrame with the items found, reporting the others in its attrs.
+    """
+    ids = _unique_ids(ids, name)
+    if listing_threshold is not None:
+        _verify_type(listing_threshold, int, 'listing_threshold')
+
+    found = {}
+    if listing and listing_threshold is not None and len(ids) >= listing_threshold:
+        wanted = set(ids)
+        try:
+            items = _get_request(path, client)
+        except Exception as error:
+            logger.warning('%s listing failed, requesting each id: %s', path, error)
+            items = []
+        for item in items:
+            if int(item['id']) in wanted:
+                found[int(item['id'])] = item
+    paths = {id_: os.path.join(path, str(id_)) for id_ in ids if id_ not in found}
+    fetched, missing, errors = _fetch_items(paths, max_workers, client)
+    found.update(fetched)
+
+    dataframe = _to_dataframe([found[id_] for id_ in ids if id_ in found])
+    dataframe.attrs['missing'] = missing
+    dataframe.attrs['errors'] = errors
+    return dataframe
+
+
+def asset_provider_many(ids: Iterable[int],
+                        listing_threshold: Optional[int] = 4,
+                        max_workers: int = 16,
+                        client: Optional[Client] = None) -> 'pd.DataFrame':
+    """
+    Fetches many /asset_providers/{id} at once. From listing_threshold ids on, /asset_providers is requested once
+    and filtered locally; it lists a few dozen providers, so it pays off early. Fewer ids, or every id if the listing
+    fails, are requested in parallel. Ids not found are reported in the ``missing`` entry of DataFrame.attrs, a list,
+    and ids failing otherwise in its ``errors`` entry, a dict keyed by id.
+
+    :param ids: Asset provider ids, repeated ones are fetched once.
+    :param listing_threshold: Minimum number of ids for the listing to be requested, never if None.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Pandas DataFrame with the data of pyntual.api.asset_provider, a row per asset provider found.
+    """
+    return _lookup_many(ids, 'Asset provider id', 'asset_providers', True, listing_threshold, max_workers, client)
+
+
+def conceptual_asset_many(ids: Iterable[int],
+                          listing_threshold: Optional[int] = 32,
+                          max_workers: int = 16,
+                          client: Optional[Client] = None) -> 'pd.DataFrame':
+    """
+    Fetches many /conceptual_assets/{id} at once. From listing_threshold ids on, /conceptual_assets is requested once
+    and filtered locally; it lists thousands of conceptual assets, so it only pays off for larger batches. Fewer ids,
+    or every id if the listing fails, are requested in parallel. Ids not found are reported in the ``missing`` entry
+    of DataFrame.attrs, a list, and ids failing otherwise in its ``errors`` entry, a dict keyed by id.
+
+    :param ids: Conceptual asset ids, repeated ones are fetched once.
+    :param listing_threshold: Minimum number of ids for the listing to be requested, never if None.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Pandas DataFrame with the data of pyntual.api.conceptual_asset, a row per conceptual asset found.
+    """
+    return _lookup_many(ids, 'Conceptual asset id', 'conceptual_assets', True, listing_threshold, max_workers,
+                        client)
+
+
+def real_asset_many(ids: Iterable[int],
+                    max_workers: int = 16,
+                    client: Optional[Client] = None) -> 'pd.DataFrame':
+    """
+    Fetches many /real_assets/{id} in parallel; the external API has no listing of every real asset. Ids not found
+    are reported in the ``missing`` entry of DataFrame.attrs, a list, and ids failing otherwise in its ``errors``
+    entry, a dict keyed by id.
+
+    :param ids: Real asset ids, repeated ones are fetched once.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Pandas DataFrame with the data of pyntual.api.real_asset, a row per real asset found.
+    """
+    return _lookup_many(ids, 'Real asset id', 'real_assets', False, None, max_workers, client)
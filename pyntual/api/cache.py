@@ -0,0 +1,236 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a ResponseCache or a ValidatorCache, in the spirit of functools.lru_cache.cache_info.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def cache_key(path: str, params: Dict[str, Any]) -> CacheKey:
+    """
+    Normalized key of a request: the path without surrounding slashes and its GET parameters sorted by name.
+
+    :param path: URI of the request, not including base of the url nor GET parameters.
+    :param params: GET parameters.
+    :return: Hashable key.
+    """
+    return path.strip('/'), tuple(sorted((key, str(value)) for key, value in params.items()))
+
+
+class ResponseCache:
+    """
+    In-process TTL cache of API responses with LRU eviction, meant for the slowly changing catalog endpoints. It is
+    opt-in, by passing it to a Client. Entries are held as CachedData and served without copying, as ValidatorCache
+    does: the outputs built from them are memoized, and copied for each caller, but the raw data is shared and must
+    not be mutated.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 256, include_days: bool = False) -> None:
+        """
+        :param ttl: Seconds an entry stays valid.
+        :param maxsize: Maximum number of entries, the least recently used one is evicted beyond it.
+        :param include_days: If set, /real_assets/{id}/days responses are cached too.
+        """
+        if ttl <= 0 or maxsize < 1:
+            raise ValueError(f'ttl ({ttl}) and maxsize ({maxsize}) must be positive.')
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.include_days = include_days
+        self._entries: 'OrderedDict[CacheKey, Tuple[float, CachedData]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def cacheable(self, path: str) -> bool:
+        """
+        Whether responses of a path are cached.
+
+        :param path: URI of the request.
+        :return: True if cached.
+        """
+        return self.include_days or not path.rstrip('/').endswith('days')
+
+    def get(self, key: CacheKey) -> Optional[list]:
+        """
+        Cached data of a request, if present and not expired.
+
+        :param key: Key of the request, see cache_key.
+        :return: Cached data, None on miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: CacheKey, data: list) -> 'CachedData':
+        """
+        Stores the data of a request, evicting the least recently used entries beyond maxsize. The data is kept as is,
+        it must not be mutated afterwards.
+
+        :param key: Key of the request, see cache_key.
+        :param data: List of JSON response.
+        :return: Data as stored, to be served in place of the given one.
+        """
+        data = data if isinstance(data, CachedData) else CachedData(data)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return data
+
+    def invalidate(self, path: Optional[str] = None) -> int:
+        """
+        Drops cached entries.
+
+        :param path: If set, only entries of this path, or nested under it, are dropped. Otherwise every entry.
+        :return: Number of dropped entries.
+        """
+        with self._lock:
+            if path is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            prefix = path.strip('/')
+            keys = [key for key in self._entries if key[0] == prefix or key[0].startswith(f'{prefix}/')]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def info(self) -> CacheInfo:
+        """
+        Hit and miss statistics.
+
+        :return: Cache statistics.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+
+class CachedData(list):
+    """
+    List of JSON data served by a ResponseCache or a ValidatorCache. Items are shared with the cache, so they must not
+    be mutated; the memo holds the outputs already built from them (DataFrames, arrays), along with the schema they
+    were built with, so a cache hit or a 304 response skips the parsing and the building altogether.
+    """
+    __slots__ = ('memo',)
+
+    def __init__(self, data: list, memo: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(data)
+        self.memo = {} if memo is None else memo
+
+
+class ValidatorCache:
+    """
+    HTTP conditional revalidation cache. It keeps the ETag and Last-Modified validators of responses along with their
+    parsed data, sends them back as If-None-Match and If-Modified-Since, and serves the parsed data on 304 Not
+    Modified. Data stays fresh, since every call still reaches the external API. It is opt-in, by passing it to a
+    Client.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        :param maxsize: Maximum number of entries, the least recently used one is evicted beyond it.
+        """
+        if maxsize < 1:
+            raise ValueError(f'maxsize ({maxsize}) must be positive.')
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[CacheKey, Tuple[Dict[str, str], CachedData]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def headers(self, key: CacheKey) -> Dict[str, str]:
+        """
+        Conditional headers of a request.
+
+        :param key: Key of the request, see cache_key.
+        :return: If-None-Match and If-Modified-Since headers, empty if the request is unknown.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[0]) if entry else {}
+
+    def not_modified(self, key: CacheKey) -> CachedData:
+        """
+        Data of a request answered with 304 Not Modified.
+
+        :param key: Key of the request, see cache_key.
+        :return: Data stored with the validators, sharing its memo.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f'No validators stored for {key}.')
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return CachedData(entry[1], entry[1].memo)
+
+    def store(self, key: CacheKey, response_headers: Mapping[str, str], data: list) -> list:
+        """
+        Stores the validators of a 200 response along with its data, if it has any.
+
+        :param key: Key of the request, see cache_key.
+        :param response_headers: Headers of the response.
+        :param data: List of JSON response.
+        :return: Data to be returned to the caller.
+        """
+        validators = {header: response_headers.get(validator)
+                      for header, validator in [('If-None-Match', 'ETag'), ('If-Modified-Since', 'Last-Modified')]}
+        validators = {header: value for header, value in validators.items() if isinstance(value, str)}
+        with self._lock:
+            self._misses += 1
+            if not validators:
+                self._entries.pop(key, None)
+                return data
+            data = CachedData(data)
+            self._entries[key] = (validators, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return CachedData(data, data.memo)
+
+    def invalidate(self, path: Optional[str] = None) -> int:
+        """
+        Drops stored validators.
+
+        :param path: If set, only entries of this path, or nested under it, are dropped. Otherwise every entry.
+        :return: Number of dropped entries.
+        """
+        with self._lock:
+            if path is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            prefix = path.strip('/')
+            keys = [key for key in self._entries if key[0] == prefix or key[0].startswith(f'{prefix}/')]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def info(self) -> CacheInfo:
+        """
+        Revalidation statistics: hits are 304 responses, misses are 200 responses.
+
+        :return: Cache statistics.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
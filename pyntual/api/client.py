@@ -0,0 +1,337 @@
+import os
+import time
+
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from .._lazy import LazyModule
+from .archive import Archive
+from .cache import ResponseCache, ValidatorCache, cache_key
+from .coalescing import SingleFlight
+from .decoding import accept_encoding, decode_response
+from .metrics import Hook, RequestMetrics, current, measure, timer
+from .streaming import iter_data
+from .throttling import RateLimiter, RetryPolicy
+
+requests = LazyModule('requests')
+
+
+class Client:
+    """
+    HTTP client for the external API. It owns a pooled requests.Session, so consecutive calls reuse keep-alive
+    connections instead of opening a new TCP+TLS connection per request. Every API call accepts an optional client,
+    when absent the default one is used (see get_default_client).
+    """
+    BASE_URL = 'https://fintual.cl/api'
+
+    def __init__(self,
+                 base_url: str = BASE_URL,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = (5.0, 60.0),
+                 cache: Optional[ResponseCache] = None,
+                 validators: Optional[ValidatorCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 hooks: Optional[Iterable[Hook]] = None,
+                 coalesce: bool = True,
+                 compression: bool = True,
+                 archive: Optional[Archive] = None) -> None:
+        """
+        :param base_url: Base of the url of the external API.
+        :param pool_connections: Number of connection pools (one per host) to cache.
+        :param pool_maxsize: Maximum number of connections kept alive per pool.
+        :param timeout: Timeout in seconds, either a single value or a (connect, read) tuple. None waits forever.
+        :param cache: In-process response cache (optional).
+        :param validators: HTTP conditional revalidation cache (optional).
+        :param rate_limiter: Rate limiter every request waits for, possibly shared with other clients (optional).
+        :param retry: Retry policy for transient failures, failures raise right away if absent.
+        :param hooks: Functions receiving the RequestMetrics of every request, see pyntual.api.metrics.
+        :param coalesce: If set, concurrent identical requests from many threads (or tasks of an AsyncClient built
+            on this client) share a single HTTP request, see pyntual.api.coalescing.
+        :param compression: If set, responses are requested compressed with every coding urllib3 can decode: gzip and
+            deflate, plus brotli and zstd when their packages are installed. Bodies are decoded by orjson when it is
+            installed, see pyntual.api.decoding.
+        :param archive: Local archive responses are recorded to or replayed from, see pyntual.api.archive
+            (optional).
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.compression = compression
+        self.cache = cache
+        self.validators = validators
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.hooks = list(hooks or ())
+        self.flights = SingleFlight() if coalesce else None
+        self.archive = archive
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': accept_encoding(compression)})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def url(self, path: str, **kwargs: str) -> str:
+        """
+        Builds the full url of a request.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param kwargs: GET parameters (optional).
+        :return: Full url, quoted.
+        """
+        url = os.path.join(self.base_url, path)
+        if kwargs:
+            args = '&'.join([f'{key}={value}' for key, value in kwargs.items()])
+            url = requests.utils.requote_uri(f'{url}?{args}')
+        return url
+
+    def get(self, path: str, **kwargs: str) -> list:
+        """
+        Performs a GET request through the pooled session. It returns the raw JSON response as a list of
+        dictionaries, if the response is a single dict, it is wrapped in a list. It raises an error if the response
+        is not 200. Data revalidated through the validators, or shared by concurrent identical requests, is shared with
+        other callers, and must not be mutated.
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param kwargs: GET parameters (optional).
+        :return: List of JSON response.
+        """
+        if not self.hooks:
+            return self._get(path, **kwargs)
+        with measure(self.hooks, path, kwargs) as metrics:
+            data = self._get(path, **kwargs)
+            metrics.rows = len(data)
+            return data
+
+    def _get(self, path: str, **kwargs: str) -> list:
+        """
+        Internal utility that serves a GET request from the cache, or performs it.
+        """
+        if self.cache is None or not self.cache.cacheable(path):
+            return self._coalesced(path, kwargs, lambda: self._fetch(path, **kwargs))
+        key = cache_key(path, kwargs)
+        data = self.cache.get(key)
+        if data is None:
+            def fetch() -> list:
+                return self.cache.set(key, self._fetch(path, **kwargs))
+            data = self._coalesced(path, kwargs, fetch)
+        else:
+            metrics = current()
+            if metrics is not None:
+                metrics.source = 'cache'
+        return data
+
+    def _coalesced(self, path: str, params: dict, fetch: Callable[[], list]) -> list:
+        """
+        Internal utility that performs a request, or waits for an identical one in progress and shares its data.
+        """
+        if self.flights is None:
+            return fetch()
+        data, shared = self.flights.do(cache_key(path, params), fetch)
+        metrics = current()
+        if shared and metrics is not None:
+            metrics.source = 'coalesced'
+        return data
+
+    def _fetch(self, path: str, **kwargs: str) -> list:
+        """
+        Internal utility that serves a GET request from the archive, or performs it and records it to the archive.
+        """
+        if self.archive is None:
+            return self._download(path, **kwargs)
+        data = self.archive.lookup(path, kwargs)
+        if data is not None:
+            metrics = current()
+            if metrics is not None:
+                metrics.source = 'archive'
+            return data
+        try:
+            data = self._download(path, **kwargs)
+        except requests.exceptions.HTTPError as error:
+            if error.response is not None:
+                self.archive.record_failure(path, kwargs, error.response.status_code, error.response.reason)
+            raise
+        self.archive.record(path, kwargs, data)
+        return data
+
+    def _download(self, path: str, **kwargs: str) -> list:
+        """
+        Internal utility that performs the GET request through the pooled session, revalidating it if the client
+        holds validators; a 304 for validators dropped meanwhile is requested again unconditionally. Measured calls get
+        their network fields filled.
+        """
+        metrics = current()
+        data = None
+        with timer(metrics, 'network_time'):
+            if self.validators is None:
+                request = self._send(self.url(path, **kwargs))
+            else:
+                key = cache_key(path, kwargs)
+                request = self._send(self.url(path, **kwargs), headers=self.validators.headers(key))
+                if request.status_code == 304:
+                    try:
+                        data = self.validators.not_modified(key)
+                    except KeyError:
+                        # the validators were evicted or invalidated while the request was in flight
+                        request = self._send(self.url(path, **kwargs), headers={})
+            if metrics is not None:
+                metrics.status = request.status_code
+                metrics.ttfb = request.elapsed.total_seconds()
+                metrics.bytes = _wire_bytes(request)
+        if data is not None:
+            if metrics is not None:
+                metrics.source = 'not_modified'
+            return data
+        request.raise_for_status()
+        with timer(metrics, 'decode_time'):
+            data = decode_response(request)['data']
+        data = data if isinstance(data, list) else [data]
+        return data if self.validators is None else self.validators.store(key, request.headers, data)
+
+    def _send(self, url: str, **kwargs: Any) -> 'requests.Response':
+        """
+        Internal utility that sends a GET request through the pooled session, waiting for the rate limiter and
+        retrying transient failures as the retry policy states. The last response is returned whatever its status.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if self.retry is None or attempt >= self.retry.retries:
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if self.retry is None or attempt >= self.retry.retries or \
+                        response.status_code not in self.retry.statuses:
+                    return response
+                delay = self.retry.delay(attempt, response.headers.get('Retry-After'))
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def stream(self, path: str, chunk_size: int = 1 << 16, **kwargs: str) -> Iterator[dict]:
+        """
+        Performs a GET request through the pooled session, parsing the body while it is received. Items of the data
+        member are yielded one at a time, bypassing the cache. It raises an error if the response is not 200. With an
+        archive, archived requests are replayed, and the others are recorded once fully read (which holds their items
+        in memory).
+
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param chunk_size: Number of bytes read from the connection at once.
+        :param kwargs: GET parameters (optional).
+        :return: Iterator of JSON items.
+        """
+        if self.archive is None:
+            yield from self._stream(path, chunk_size, **kwargs)
+            return
+        data = self.archive.lookup(path, kwargs)
+        if data is not None:
+            yield from data
+            return
+        items = []
+        try:
+            for item in self._stream(path, chunk_size, **kwargs):
+                items.append(item)
+                yield item
+        except requests.exceptions.HTTPError as error:
+            if error.response is not None:
+                self.archive.record_failure(path, kwargs, error.response.status_code, error.response.reason)
+            raise
+        self.archive.record(path, kwargs, items)
+
+    def _stream(self, path: str, chunk_size: int, **kwargs: str) -> Iterator[dict]:
+        """
+        Internal utility that performs a streamed GET request, see stream.
+        """
+        if not self.hooks:
+            with self._send(self.url(path, **kwargs), stream=True) as request:
+                request.raise_for_status()
+                yield from iter_data(request.iter_content(chunk_size))
+            return
+
+        # the generator is suspended between items, so its metrics cannot be opened on the thread like get does;
+        # the network time spans the whole body, parsing included
+        metrics, start = RequestMetrics(path, kwargs), time.perf_counter()
+        metrics.rows = 0
+        try:
+            with self._send(self.url(path, **kwargs), stream=True) as request:
+                metrics.status = request.status_code
+                metrics.ttfb = request.elapsed.total_seconds()
+                try:
+                    request.raise_for_status()
+                    for item in iter_data(request.iter_content(chunk_size)):
+                        metrics.rows += 1
+                        yield item
+                finally:
+                    metrics.bytes = _wire_bytes(request)
+        except GeneratorExit:
+            raise
+        except BaseException as error:
+            metrics.error = f'{type(error).__name__}: {error}'
+            raise
+        finally:
+            metrics.network_time = time.perf_counter() - start
+            for hook in self.hooks:
+                hook(metrics)
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+_default_client: Optional[Client] = None
+
+
+def get_default_client() -> Client:
+    """
+    Returns the client used by API calls that do not receive one, creating it on first use.
+
+    :return: Default client.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = Client()
+    return _default_client
+
+
+def set_default_client(client: Client) -> None:
+    """
+    Replaces the client used by API calls that do not receive one.
+
+    :param client: New default client.
+    """
+    _verify_client(client)
+    global _default_client
+    _default_client = client
+
+
+def _verify_client(client: Client) -> None:
+    """
+    Internal utility to assert a proper client. Raises TypeError.
+
+    :param client: Variable to be asserted.
+    """
+    if not isinstance(client, Client):
+        raise TypeError(f'client ({client}) must be Client, not {type(client).__name__}.')
+
+
+def _wire_bytes(response: 'requests.Response') -> int:
+    """
+    Internal utility that counts the bytes a response took on the wire, before urllib3 decompressed its body.
+
+    :param response: Response of the external API, already read.
+    :return: Number of bytes of the body as received.
+    """
+    if response.raw is None:
+        return len(response.content)
+    return response.raw.tell()
@@ -0,0 +1,86 @@
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    """
+    Internal utility holding the outcome of a call in progress.
+    """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in progress, callers asking for the same key wait
+    for it and share its result, or its exception, instead of running it again. Nothing is kept once the call
+    returns, so calls that do not overlap in time are never merged.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._calls = self._shared = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs a function, unless a call for the same key is already in progress, in which case its outcome is awaited.
+
+        :param key: Key identifying identical calls.
+        :param function: Call to be run.
+        :return: Result of the call, and whether it was shared from another caller.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._calls += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = function()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of calls in progress.
+        """
+        with self._lock:
+            return len(self._flights)
+
+    @property
+    def calls(self) -> int:
+        """
+        Number of calls actually run.
+        """
+        with self._lock:
+            return self._calls
+
+    @property
+    def shared(self) -> int:
+        """
+        Number of callers served the outcome of another caller's call.
+        """
+        with self._lock:
+            return self._shared
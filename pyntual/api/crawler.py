@@ -0,0 +1,315 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .api import _verify_type, asset_providers, conceptual_assets, real_assets
+from .client import Client
+from .store import DayStore
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ('asset_providers', 'conceptual_assets', 'real_assets')
+
+_STOP = object()
+
+
+class CrawlResult(NamedTuple):
+    """
+    Summary of a crawl: number of items completed by this run at each level, and the items that failed, keyed by
+    level and id, with their error message.
+    """
+    asset_providers: int
+    conceptual_assets: int
+    real_assets: int
+    errors: Dict[str, Dict[Optional[int], str]]
+
+
+class Checkpoint:
+    """
+    Progress of a crawl, persisted as JSON. For each level it keeps the items discovered and the items completed: an
+    asset provider is completed once its conceptual assets are discovered, a conceptual asset once its real assets
+    are, and a real asset once its days are stored. Interrupted runs resume from the discovered items not completed.
+    """
+
+    def __init__(self, path: Optional[str] = None, interval: float = 5.0) -> None:
+        """
+        :param path: Path of the JSON file, loaded if present. Progress is only kept in memory if absent.
+        :param interval: Minimum number of seconds between two writes of the file.
+        """
+        self.path = path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._saved = time.monotonic()
+        self._discovered: Dict[str, set] = {level: set() for level in LEVELS}
+        self._completed: Dict[str, set] = {level: set() for level in LEVELS}
+        self._errors: Dict[str, Dict[Optional[int], str]] = {level: {} for level in LEVELS}
+        self._scheduled: Dict[str, set] = {level: set() for level in LEVELS}
+        if path and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                state = json.load(checkpoint_file)
+            for level in LEVELS:
+                self._discovered[level].update(state[level]['discovered'])
+                self._completed[level].update(state[level]['completed'])
+
+    def discover(self, level: str, ids: Iterable[int]) -> List[int]:
+        """
+        Records items found at a level.
+
+        :param level: One of LEVELS.
+        :param ids: Ids of the items.
+        :return: Ids to be processed: neither completed nor already returned by this checkpoint.
+        """
+        with self._lock:
+            ids = [id_ for id_ in dict.fromkeys(ids)
+                   if id_ not in self._completed[level] and id_ not in self._scheduled[level]]
+            self._discovered[level].update(ids)
+            self._scheduled[level].update(ids)
+            return ids
+
+    def complete(self, level: str, id_: int) -> None:
+        """
+        Records an item as completed, writing the file if the interval elapsed.
+
+        :param level: One of LEVELS.
+        :param id_: Id of the item.
+        """
+        with self._lock:
+            self._completed[level].add(id_)
+            self._errors[level].pop(id_, None)
+        if time.monotonic() - self._saved >= self.interval:
+            self.save()
+
+    def fail(self, level: str, id_: Optional[int], error: Exception) -> None:
+        """
+        Records an item as failed, it stays pending for the next run.
+
+        :param level: One of LEVELS.
+        :param id_: Id of the item, None for the listing of the level itself.
+        :param error: Raised exception.
+        """
+        with self._lock:
+            self._errors[level][id_] = f'{type(error).__name__}: {error}'
+
+    def pending(self, level: str) -> List[int]:
+        """
+        Items discovered at a level and not completed yet.
+
+        :param level: One of LEVELS.
+        :return: Sorted ids.
+        """
+        with self._lock:
+            return sorted(self._discovered[level] - self._completed[level])
+
+    def errors(self) -> Dict[str, Dict[Optional[int], str]]:
+        """
+        Items failed during this run.
+
+        :return: Error messages keyed by level and id.
+        """
+        with self._lock:
+            return {level: dict(errors) for level, errors in self._errors.items()}
+
+    def save(self) -> None:
+        """
+        Writes the file atomically, if the checkpoint has a path.
+        """
+        with self._lock:
+            self._saved = time.monotonic()
+            if not self.path:
+                return
+            state = {level: {'discovered': sorted(self._discovered[level]),
+                             'completed': sorted(self._completed[level])} for level in LEVELS}
+            temporary = f'{self.path}.tmp'
+            with open(temporary, 'w') as checkpoint_file:
+                json.dump(state, checkpoint_file)
+            os.replace(temporary, self.path)
+
+    def remove(self) -> None:
+        """
+        Deletes the file, so the next run starts from scratch.
+        """
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _Stage:
+    """
+    Internal utility: pool of worker threads consuming a bounded queue. Its queue is closed once every producer is
+    done, by a stop sentinel per worker, and a stage is itself a producer of the next stage, so stages shut down one
+    after the other. Once the crawl is stopped, new items are dropped and queued ones are drained without being
+    handled, so every blocked producer gets room and every worker reaches its sentinel.
+    """
+
+    def __init__(self,
+                 handle: Callable[[int], None],
+                 workers: int,
+                 queue_size: int,
+                 stopped: threading.Event,
+                 downstream: Optional['_Stage'] = None) -> None:
+        self.handle = handle
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.stopped = stopped
+        self.downstream = downstream
+        self._lock = threading.Lock()
+        self._producers = 0
+        self._running = workers
+        if downstream is not None:
+            downstream.open()
+        self.threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def open(self) -> None:
+        with self._lock:
+            self._producers += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._producers -= 1
+            if self._producers > 0:
+                return
+        for _ in self.threads:
+            self.queue.put(_STOP)
+
+    def put(self, item: int) -> None:
+        """
+        Blocks until the queue has room. Items are dropped once the crawl is stopped.
+        """
+        if not self.stopped.is_set():
+            self.queue.put(item)
+
+    def join(self) -> None:
+        for thread in self.threads:
+            while thread.is_alive():
+                thread.join(0.1)
+
+    def _work(self) -> None:
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _STOP:
+                    break
+                if not self.stopped.is_set():
+                    self.handle(item)
+        finally:
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last and self.downstream is not None:
+                self.downstream.close()
+
+
+def _ids(columns: dict) -> List[int]:
+    """
+    Internal utility that reads the ids of a 'dict' output.
+    """
+    return [int(id_) for id_ in columns.get('id', [])]
+
+
+def crawl(store: DayStore,
+          checkpoint: Optional[str] = None,
+          to_date: Optional[datetime] = None,
+          from_date: Optional[datetime] = None,
+          max_workers: int = 8,
+          queue_size: int = 256,
+          client: Optional[Client] = None) -> CrawlResult:
+    """
+    Walks the whole catalog, /asset_providers -> /asset_providers/{id}/conceptual_assets ->
+    /conceptual_assets/{id}/real_assets -> /real_assets/{id}/days, storing every real asset's days in a DayStore.
+
+    Each level is a stage of worker threads fed through a bounded queue, so listings and days are fetched at the same
+    time while memory stays bounded. A failing item does not abort the crawl, it is reported in the result and
+    retried by the next run; a failing /asset_providers listing is reported under id None, while the items left
+    pending by a previous run are still crawled. Progress is written to the checkpoint, so an interrupted crawl
+    resumes where it stopped; the checkpoint is deleted once a crawl completes without failures. Days already held by
+    the store are not requested again either way.
+
+    :param store: Store the days are saved to.
+    :param checkpoint: Path of the JSON checkpoint file, progress is not persisted if absent.
+    :param to_date: Last date to be held, today if absent.
+    :param from_date: First date to be held, the whole history if absent.
+    :param max_workers: Number of worker threads of each stage.
+    :param queue_size: Maximum number of items waiting between two stages.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Summary of the crawl.
+    """
+    _verify_type(store, DayStore, 'store')
+    if max_workers < 1 or queue_size < 1:
+        raise ValueError(f'max_workers ({max_workers}) and queue_size ({queue_size}) must be positive.')
+    progress = Checkpoint(checkpoint)
+    completed = {level: 0 for level in LEVELS}
+    counter = threading.Lock()
+    stopped = threading.Event()
+
+    def step(level: str, id_: int, work: Callable[[int], Optional[List[int]]], next_stage: Optional[_Stage]) -> None:
+        try:
+            children = work(id_)
+        except Exception as error:
+            logger.warning('%s %s failed: %s', level, id_, error)
+            progress.fail(level, id_, error)
+            return
+        if next_stage is not None:
+            for child in progress.discover(LEVELS[LEVELS.index(level) + 1], children):
+                next_stage.put(child)
+        progress.complete(level, id_)
+        with counter:
+            completed[level] += 1
+
+    def days(id_: int) -> None:
+        store.sync(id_, to_date, from_date, client)
+
+    def list_real_assets(id_: int) -> List[int]:
+        return _ids(real_assets(id_, client=client, output='dict'))
+
+    def list_conceptual_assets(id_: int) -> List[int]:
+        return _ids(conceptual_assets(id_, client=client, output='dict'))
+
+    real_assets_stage = _Stage(lambda id_: step('real_assets', id_, days, None), max_workers, queue_size, stopped)
+    conceptual_assets_stage = _Stage(lambda id_: step('conceptual_assets', id_, list_real_assets, real_assets_stage),
+                                     max_workers, queue_size, stopped, real_assets_stage)
+    asset_providers_stage = _Stage(lambda id_: step('asset_providers', id_, list_conceptual_assets,
+                                                    conceptual_assets_stage),
+                                   max_workers, queue_size, stopped, conceptual_assets_stage)
+    stages = [asset_providers_stage, conceptual_assets_stage, real_assets_stage]
+
+    try:
+        for stage in stages:
+            stage.open()
+        try:
+            # items left pending by a previous run go first, so an interrupted crawl finishes what it started
+            for level, stage in [('real_assets', real_assets_stage), ('conceptual_assets', conceptual_assets_stage)]:
+                for id_ in progress.discover(level, progress.pending(level)):
+                    stage.put(id_)
+            try:
+                provider_ids = _ids(asset_providers(client=client, output='dict'))
+            except Exception as error:
+                logger.warning('asset_providers failed: %s', error)
+                progress.fail('asset_providers', None, error)
+                provider_ids = []
+            for id_ in progress.discover('asset_providers', provider_ids):
+                asset_providers_stage.put(id_)
+        except BaseException:
+            stopped.set()
+            raise
+        finally:
+            for stage in stages:
+                stage.close()
+        for stage in stages:
+            stage.join()
+    finally:
+        # on interruption, in-flight requests are let finish so their results are recorded
+        stopped.set()
+        for stage in stages:
+            stage.join()
+        progress.save()
+
+    errors = progress.errors()
+    if not any(errors.values()):
+        progress.remove()
+    return CrawlResult(completed['asset_providers'], completed['conceptual_assets'], completed['real_assets'], errors)
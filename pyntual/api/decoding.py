@@ -0,0 +1,74 @@
+import json
+
+from typing import Any, Callable, Optional, Union
+
+from .._lazy import LazyModule
+
+requests = LazyModule('requests')
+urllib3 = LazyModule('urllib3')
+
+_loads: Optional[Callable[[Union[bytes, str]], Any]] = None
+
+
+def backend() -> str:
+    """
+    JSON backend decoding response bodies: 'orjson' when it is installed, 'json' (the standard library) otherwise.
+
+    :return: Name of the backend.
+    """
+    return _backend().__module__.split('.')[0]
+
+
+def _backend() -> Callable[[Union[bytes, str]], Any]:
+    """
+    Internal utility that picks the JSON backend once, on first use.
+    """
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+            _loads = orjson.loads
+        except ImportError:
+            _loads = json.loads
+    return _loads
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """
+    Decodes a JSON document with the fastest backend available. Documents the fast backend rejects (such as NaN
+    literals) are decoded again by the standard library, which raises json.JSONDecodeError if they are invalid.
+
+    :param body: JSON document, as UTF-8 bytes or str.
+    :return: Decoded document.
+    """
+    decode = _backend()
+    if decode is json.loads:
+        return decode(body)
+    try:
+        return decode(body)
+    except json.JSONDecodeError:
+        return json.loads(body)
+
+
+def decode_response(response: 'requests.Response') -> Any:
+    """
+    Decodes the JSON body of a response straight from its raw bytes, skipping the text decoding and charset detection
+    of requests.Response.json.
+
+    :param response: Response of the external API, already decompressed by urllib3.
+    :return: Decoded body.
+    """
+    return loads(response.content)
+
+
+def accept_encoding(compression: bool = True) -> str:
+    """
+    Value of the Accept-Encoding header: every content coding urllib3 can decode here, gzip and deflate always,
+    brotli when brotli (or brotlicffi) is installed and zstd when zstandard is.
+
+    :param compression: If unset, compressed responses are refused.
+    :return: Header value.
+    """
+    if not compression:
+        return 'identity'
+    return urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
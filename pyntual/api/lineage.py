@@ -0,0 +1,125 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date as date_, datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from .._lazy import LazyModule
+from .api import _real_asset_days_data, _to_dataframe, _verify_type, real_asset
+from .client import Client
+
+pd = LazyModule('pandas')
+
+
+class LineageSegment(NamedTuple):
+    """
+    Real asset of a lineage, with the dates it was in use, None where unknown.
+    """
+    real_asset_id: int
+    start_date: Optional[date_]
+    end_date: Optional[date_]
+
+
+def _parse_date(text: Optional[str]) -> Optional[date_]:
+    """
+    Internal utility that parses an optional yyyy-mm-dd date, None if absent or invalid.
+    """
+    try:
+        return datetime.strptime(text, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _walk(id_: int, client: Optional[Client], max_length: int) -> Iterator[LineageSegment]:
+    """
+    Internal utility that follows previous_asset_id from a real asset, yielding each segment as soon as it is known,
+    newest first. Raises ValueError on cycles and on chains longer than max_length.
+    """
+    _verify_type(id_, int, 'Real asset id')
+    newest, seen = id_, set()
+    while id_ is not None:
+        if id_ in seen:
+            raise ValueError(f'Lineage of real asset {newest} has a cycle at {id_}.')
+        if len(seen) >= max_length:
+            raise ValueError(f'Lineage of real asset {newest} is longer than max_length ({max_length}).')
+        seen.add(id_)
+        columns = real_asset(id_, client=client, output='dict')
+        yield LineageSegment(id_, _parse_date(columns['start_date'][0]), _parse_date(columns['end_date'][0]))
+        previous = columns['previous_asset_id'][0]
+        id_ = int(previous) if previous not in (None, '') else None
+
+
+def real_asset_lineage(id_: int, client: Optional[Client] = None, max_length: int = 64) -> List[LineageSegment]:
+    """
+    Resolves the chain of real assets a real asset continues, following /real_assets/{id}.previous_asset_id.
+
+    :param id_: Id of the newest real asset of the chain.
+    :param client: Client performing the requests, the default client if absent.
+    :param max_length: Maximum number of real assets of the chain.
+    :return: Segments of the chain, oldest first.
+    """
+    return list(_walk(id_, client, max_length))[::-1]
+
+
+def real_asset_days_lineage(id_: int,
+                            to_date: Optional[datetime] = None,
+                            from_date: Optional[datetime] = None,
+                            max_workers: int = 8,
+                            client: Optional[Client] = None,
+                            max_length: int = 64) -> 'pd.DataFrame':
+    """
+    Days of a real asset and of every real asset it continues (see real_asset_lineage), stitched into one continuous
+    series with a single row per date. Where segments overlap, the newest one wins.
+
+    The days of each segment are requested as soon as the segment is resolved, while the walk up the chain goes on,
+    and only for the dates the segment was in use. The walk stops at the first segment in use on from_date.
+
+    :param id_: Id of the newest real asset of the chain.
+    :param to_date: parameter on external API.
+    :param from_date: parameter on external API.
+    :param max_workers: Maximum number of days requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :param max_length: Maximum number of real assets of the chain.
+    :return: Pandas DataFrame indexed by date, with the real_asset_id each day comes from and the columns of
+        pyntual.api.real_asset_days.
+    """
+    for key, value in [('to_date', to_date), ('from_date', from_date)]:
+        if value:
+            _verify_type(value, datetime, key)
+    if from_date and to_date and from_date > to_date:
+        raise ValueError('from_date must not be after to_date.')
+    first = from_date.date() if from_date else None
+    last = to_date.date() if to_date else None
+
+    segments: List[LineageSegment] = []
+    futures: Dict[int, Future] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for segment in _walk(id_, client, max_length):
+            if first and segment.end_date and segment.end_date < first:
+                break
+            segments.append(segment)
+            start = max(filter(None, [first, segment.start_date]), default=None)
+            end = min(filter(None, [last, segment.end_date]), default=None)
+            if start is None or end is None or start <= end:
+                futures[segment.real_asset_id] = executor.submit(
+                    _real_asset_days_data,
+                    segment.real_asset_id,
+                    to_date=datetime.combine(end, datetime.min.time()) if end else None,
+                    from_date=datetime.combine(start, datetime.min.time()) if start else None,
+                    client=client,
+                )
+            if first and segment.start_date and segment.start_date <= first:
+                break
+        data = {segment_id: future.result() for segment_id, future in futures.items()}
+
+    # segments are newest first, so the first record of a date wins
+    records, seen = [], set()
+    for segment in segments:
+        for item in data.get(segment.real_asset_id, []):
+            day = item['attributes'].get('date')
+            if day is None or day in seen:
+                continue
+            seen.add(day)
+            records.append({'id': item['id'], 'attributes': {'real_asset_id': segment.real_asset_id,
+                                                             **item['attributes']}})
+    if len(records) == 0:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='date'))
+    return _to_dataframe(records).set_index('date').sort_index()
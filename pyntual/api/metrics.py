@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+Hook = Callable[['RequestMetrics'], None]
+
+FIELDS = ('bytes', 'ttfb', 'network_time', 'decode_time', 'build_time', 'rows')
+
+_ID = re.compile(r'(?<=/)\d+(?=/|$)')
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """
+    Measurements of a single request to the external API, handed to the hooks of the Client once it is done. Times
+    are in seconds, the network time includes the waits of the rate limiter and of retries. Fields that do not apply
+    are None, such as the network fields of a response served by a ResponseCache, or the build fields of a request
+    whose output is built elsewhere (bulk and chunked calls, DayStore).
+    """
+    __slots__ = ('path', 'params', 'source', 'status', 'bytes', 'ttfb', 'network_time', 'decode_time', 'build_time',
+                 'rows', 'error')
+
+    def __init__(self, path: str, params: Dict[str, str]) -> None:
+        """
+        :param path: URI of the request, not including base of the url nor GET parameters.
+        :param params: GET parameters.
+        """
+        self.path = path.strip('/')
+        self.params = dict(params)
+        self.source: str = 'network'  # 'network', 'cache', 'not_modified', 'coalesced' or 'archive'
+        self.status: Optional[int] = None
+        self.bytes: Optional[int] = None  # as received, before decompression
+        self.ttfb: Optional[float] = None
+        self.network_time: Optional[float] = None
+        self.decode_time: Optional[float] = None
+        self.build_time: Optional[float] = None
+        self.rows: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def endpoint(self) -> str:
+        """
+        Path with its ids replaced by a placeholder, such as 'real_assets/{id}/days'.
+        """
+        return _ID.sub('{id}', self.path)
+
+    def as_dict(self) -> dict:
+        """
+        Every field, plus the endpoint.
+
+        :return: Mapping from field name to its value.
+        """
+        return {'endpoint': self.endpoint, **{name: getattr(self, name) for name in self.__slots__}}
+
+    def __repr__(self) -> str:
+        return f'RequestMetrics({", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)})'
+
+
+def current() -> Optional[RequestMetrics]:
+    """
+    Metrics of the API call running on this thread, if the call is measured.
+
+    :return: Metrics being filled, None outside measured calls.
+    """
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def measure(hooks: Sequence[Hook], path: str, params: Dict[str, str]) -> Iterator[RequestMetrics]:
+    """
+    Opens the metrics of an API call on this thread, so the request fills them, and hands them to the hooks once the
+    block exits, failed or not. Nested calls are measured by the outermost block.
+
+    :param hooks: Functions receiving the metrics.
+    :param path: URI of the request, not including base of the url nor GET parameters.
+    :param params: GET parameters.
+    :return: Context manager yielding the metrics.
+    """
+    outer = current()
+    if outer is not None:
+        yield outer
+        return
+    metrics = _local.metrics = RequestMetrics(path, params)
+    try:
+        yield metrics
+    except BaseException as error:
+        metrics.error = f'{type(error).__name__}: {error}'
+        raise
+    finally:
+        _local.metrics = None
+        for hook in hooks:
+            hook(metrics)
+
+
+@contextmanager
+def timer(metrics: Optional[RequestMetrics], field: str) -> Iterator[None]:
+    """
+    Times the block into a field of the metrics, if any.
+
+    :param metrics: Metrics to be filled, nothing is timed if None.
+    :param field: Name of the field.
+    :return: Context manager.
+    """
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, field, time.perf_counter() - start)
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    """
+    Internal utility: percentile of sorted values, linearly interpolated between the closest ranks.
+    """
+    position = (len(ordered) - 1) * percentile / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class MetricsAggregator:
+    """
+    Hook keeping the metrics of every request, summarized as percentiles per endpoint. It is thread safe, and is
+    meant to be passed among the hooks of a Client::
+
+        aggregator = MetricsAggregator()
+        client = Client(hooks=[aggregator])
+        ...
+        aggregator.summary()['real_assets/{id}/days']['network_time']['p95']
+    """
+
+    def __init__(self, maxlen: Optional[int] = None) -> None:
+        """
+        :param maxlen: Maximum number of metrics kept per endpoint, the oldest ones are dropped beyond it.
+        """
+        self.maxlen = maxlen
+        self._metrics: Dict[str, List[RequestMetrics]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            kept = self._metrics.setdefault(metrics.endpoint, [])
+            kept.append(metrics)
+            if self.maxlen is not None and len(kept) > self.maxlen:
+                del kept[:len(kept) - self.maxlen]
+
+    def records(self, endpoint: Optional[str] = None) -> List[RequestMetrics]:
+        """
+        Metrics kept so far.
+
+        :param endpoint: If set, only the metrics of this endpoint.
+        :return: List of metrics, in arrival order for a single endpoint.
+        """
+        with self._lock:
+            if endpoint is not None:
+                return list(self._metrics.get(endpoint, []))
+            return [metrics for kept in self._metrics.values() for metrics in kept]
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Percentiles of every measured field, per endpoint. Fields are only summarized over the requests that
+        measured them, their count is given along.
+
+        :param percentiles: Percentiles to be computed, between 0 and 100.
+        :return: Mapping from endpoint to field to statistic ('count', 'mean', 'p50', ...) to its value.
+        """
+        percentiles = list(percentiles)
+        with self._lock:
+            kept = {endpoint: list(metrics) for endpoint, metrics in self._metrics.items()}
+        summary = {}
+        for endpoint, metrics in sorted(kept.items()):
+            fields = {'requests': {'count': len(metrics),
+                                   'errors': sum(1 for item in metrics if item.error is not None)}}
+            for field in FIELDS:
+                values = sorted(getattr(item, field) for item in metrics if getattr(item, field) is not None)
+                if not values:
+                    continue
+                fields[field] = {'count': len(values), 'mean': sum(values) / len(values),
+                                 **{f'p{percentile:g}': _percentile(values, percentile) for percentile in percentiles}}
+            summary[endpoint] = fields
+        return summary
+
+    def reset(self) -> None:
+        """
+        Drops every metric kept.
+        """
+        with self._lock:
+            self._metrics.clear()
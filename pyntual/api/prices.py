@@ -0,0 +1,193 @@
+import threading
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .._lazy import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# lookups are keyed by (slot of the real asset << _SHIFT) + days since the epoch, sorted as a single array
+_SHIFT = 32
+_OFFSET = 1 << 31
+# int64 view of numpy's NaT
+_NAT = -(1 << 63)
+
+
+class PriceIndex:
+    """
+    In-memory point-in-time index of the prices of many real assets, answering "price of an asset as of a date" by
+    binary search over sorted date arrays instead of filtering DataFrames. Dates without a price (weekends, holidays)
+    fall back to the previous known price.
+
+    Every series is held in one flat array sorted by (real asset, date), so a batch of lookups over any mix of assets
+    and dates is a single vectorized searchsorted.
+    """
+
+    def __init__(self, max_staleness: Optional[int] = None) -> None:
+        """
+        :param max_staleness: If set, a price older than this many days before the requested date is not used.
+        """
+        if max_staleness is not None and max_staleness < 0:
+            raise ValueError(f'max_staleness ({max_staleness}) must not be negative.')
+        self.max_staleness = max_staleness
+        self._series: Dict[int, Tuple['np.ndarray', 'np.ndarray']] = {}
+        self._lock = threading.Lock()
+        self._built: Optional[Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']] = None
+
+    @classmethod
+    def from_days(cls,
+                  days: Union['pd.DataFrame', Mapping[int, 'pd.DataFrame']],
+                  column: str = 'price',
+                  max_staleness: Optional[int] = None) -> 'PriceIndex':
+        """
+        Builds an index from real_asset_days data.
+
+        :param days: Either the long output of real_asset_days_many, indexed by (real_asset_id, date), or a mapping
+            from real asset id to its real_asset_days DataFrame.
+        :param column: Column used as prices, such as 'price' or 'close_price'.
+        :param max_staleness: If set, a price older than this many days before the requested date is not used.
+        :return: New index.
+        """
+        index = cls(max_staleness)
+        if isinstance(days, pd.DataFrame):
+            if not days.empty:
+                ids = days.index.get_level_values('real_asset_id').to_numpy()
+                dates = days.index.get_level_values('date').to_numpy()
+                prices = days[column].to_numpy()
+                order = np.argsort(ids, kind='stable')
+                ids, dates, prices = ids[order], dates[order], prices[order]
+                bounds = np.flatnonzero(np.diff(ids)) + 1
+                for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(ids)]):
+                    index.add(int(ids[start]), dates[start:end], prices[start:end])
+        else:
+            for id_, dataframe in days.items():
+                index.add(id_, dataframe['date'].to_numpy(), dataframe[column].to_numpy())
+        return index
+
+    def add(self, id_: int, dates: Iterable[Any], prices: Iterable[float]) -> None:
+        """
+        Adds, or replaces, the price series of a real asset. Missing prices are dropped; of repeated dates, the last
+        price is kept.
+
+        :param id_: Real asset id.
+        :param dates: Dates of the prices, in any order.
+        :param prices: Prices.
+        """
+        days = _to_days(dates)
+        values = np.asarray(prices, dtype=np.float64)
+        if days.shape != values.shape:
+            raise ValueError(f'dates ({days.shape}) and prices ({values.shape}) must have the same length.')
+        valid = ~(np.isnan(values) | np.isnat(days.view('datetime64[D]')))
+        days, values = days[valid], values[valid]
+        # stable sort of the reversed series keeps the last price of a repeated date first, unique keeps the first
+        order = np.argsort(days[::-1], kind='stable')
+        days, values = days[::-1][order], values[::-1][order]
+        days, first = np.unique(days, return_index=True)
+        with self._lock:
+            self._series[id_] = (days, values[first])
+            self._built = None
+
+    def remove(self, id_: int) -> None:
+        """
+        Drops the price series of a real asset.
+
+        :param id_: Real asset id.
+        """
+        with self._lock:
+            del self._series[id_]
+            self._built = None
+
+    @property
+    def ids(self) -> List[int]:
+        """
+        Real asset ids held, sorted.
+        """
+        with self._lock:
+            return sorted(self._series)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def price(self, id_: int, date: Any) -> float:
+        """
+        Price of a real asset as of a date.
+
+        :param id_: Real asset id.
+        :param date: Date, as date, datetime, numpy.datetime64, pandas.Timestamp or 'yyyy-mm-dd'.
+        :return: Last price published on or before the date, NaN if there is none (or it is too stale).
+        """
+        if id_ not in self._series:
+            raise KeyError(f'Real asset {id_} is not indexed.')
+        days, values = self._series[id_]
+        wanted = int(_to_days(date))
+        position = int(days.searchsorted(wanted, side='right')) - 1
+        if wanted == _NAT or position < 0:
+            return float('nan')
+        if self.max_staleness is not None and wanted - days[position] > self.max_staleness:
+            return float('nan')
+        return float(values[position])
+
+    def prices(self,
+               ids: Union[int, Iterable[int]],
+               dates: Any,
+               return_dates: bool = False) -> Union['np.ndarray', Tuple['np.ndarray', 'np.ndarray']]:
+        """
+        Prices of many (real asset, date) pairs as of their date, in a single vectorized search. Ids and dates are
+        broadcast against each other, so one asset can be looked up at many dates, or many assets at one date.
+
+        :param ids: Real asset id(s). Ids not indexed get NaN.
+        :param dates: Date(s), as date, datetime, numpy.datetime64, pandas.Timestamp or 'yyyy-mm-dd'.
+        :param return_dates: If set, the dates of the prices used are returned along, NaT where there is none.
+        :return: Array of prices, NaN where there is none, and the array of their dates if return_dates is set.
+        """
+        indexed, keys, values, days = self._build()
+        ids, days_wanted = np.broadcast_arrays(np.asarray(ids, dtype=np.int64), _to_days(dates))
+        if len(keys) == 0:
+            result = np.full(ids.shape, np.nan)
+            return (result, np.full(ids.shape, _NAT).view('datetime64[D]')) if return_dates else result
+        slot = np.minimum(np.searchsorted(indexed, ids), len(indexed) - 1)
+        slot = np.where(indexed[slot] == ids, slot, -1)
+
+        wanted = (slot << _SHIFT) + (days_wanted + _OFFSET)
+        position = np.searchsorted(keys, wanted, side='right') - 1
+        clipped = np.maximum(position, 0)
+        found = (slot >= 0) & (position >= 0) & (keys[clipped] >> _SHIFT == slot) & (days_wanted != _NAT)
+        if self.max_staleness is not None:
+            found &= days_wanted - days[clipped] <= self.max_staleness
+
+        result = np.where(found, values[clipped], np.nan)
+        if not return_dates:
+            return result
+        return result, np.where(found, days[clipped], _NAT).view('datetime64[D]')
+
+    def _build(self) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Internal utility that concatenates every series into the flat sorted arrays, once per change.
+        """
+        with self._lock:
+            if self._built is None:
+                ids = sorted(self._series)
+                series = [self._series[id_] for id_ in ids]
+                days = np.concatenate([item[0] for item in series]) if series else np.empty(0, dtype=np.int64)
+                values = np.concatenate([item[1] for item in series]) if series else np.empty(0)
+                lengths = [len(item[0]) for item in series]
+                keys = (np.repeat(np.arange(len(ids), dtype=np.int64), lengths) << _SHIFT) + (days + _OFFSET)
+                self._built = np.asarray(ids, dtype=np.int64), keys, values, days
+            return self._built
+
+
+def _to_days(dates: Any) -> 'np.ndarray':
+    """
+    Internal utility that turns dates of any supported type into days since the epoch, as int64. Missing dates
+    become the int64 minimum, the NaT of numpy.
+    """
+    if hasattr(dates, 'to_numpy'):
+        dates = dates.to_numpy()
+    array = np.asarray(dates)
+    if array.dtype.kind != 'M':
+        array = np.asarray(dates, dtype='datetime64[D]')
+    return array.astype('datetime64[D]').view(np.int64)
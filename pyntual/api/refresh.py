@@ -0,0 +1,170 @@
+import logging
+import math
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from .._lazy import LazyModule
+from .api import _verify_type, asset_providers, conceptual_assets, real_assets
+from .client import Client
+from .store import DayStore
+
+logger = logging.getLogger(__name__)
+
+pd = LazyModule('pandas')
+
+MISSING = 'missing'
+REVISED = 'revised'
+
+
+class RefreshTask(NamedTuple):
+    """
+    Days of a real asset to be requested by a refresh: a date range not held locally ('missing'), or the last
+    published day, held with a close price other than the one listed ('revised').
+    """
+    real_asset_id: int
+    from_date: date_
+    to_date: date_
+    reason: str
+
+
+class RefreshResult(NamedTuple):
+    """
+    Summary of a refresh: number of real assets checked, tasks completed, and the items that failed, keyed by level
+    ('asset_providers', 'conceptual_assets' or 'real_assets') and id, with their error message. Failed tasks are
+    keyed by the RefreshTask itself instead of its id, since a real asset may have several.
+    """
+    real_assets: int
+    tasks: List[RefreshTask]
+    errors: Dict[str, Dict[Union[int, RefreshTask], str]]
+
+
+def plan_refresh(store: DayStore,
+                 listing: 'pd.DataFrame',
+                 from_date: Optional[datetime] = None) -> List[RefreshTask]:
+    """
+    Compares the last day published of real assets, as listed by /conceptual_assets/{id}/real_assets, with the days
+    held by a store, without requesting anything. Real assets whose latest day held is as recent as the listed one,
+    with the same close price, need no request at all; the others only need their missing dates up to the listed day.
+
+    :param store: Store holding the local copy of the days.
+    :param listing: Output of pyntual.api.real_assets, or several of them concatenated, indexed by real asset id.
+    :param from_date: First date to be held, the whole history if absent.
+    :return: Tasks in order of real asset id, empty if the store is up to date.
+    """
+    _verify_type(store, DayStore, 'store')
+    if from_date:
+        _verify_type(from_date, datetime, 'from_date')
+    start = from_date.date() if from_date else date_.min
+    if listing.empty or 'last_day_date' not in listing.columns:
+        return []
+    listing = listing[~listing.index.duplicated(keep='last')].sort_index()
+    close_prices = listing['last_day_close_price'] if 'last_day_close_price' in listing.columns else None
+    held = store.last_days(int(id_) for id_ in listing.index)
+
+    tasks = []
+    for id_, last_date in listing['last_day_date'].items():
+        id_ = int(id_)
+        if pd.isna(last_date):
+            continue
+        last_date = pd.Timestamp(last_date).date()
+        if last_date < start:
+            continue
+        if id_ in held and held[id_][0] >= last_date:
+            close_price = None if close_prices is None else close_prices.loc[id_]
+            held_price = held[id_][1]
+            if held[id_][0] == last_date and not _same_price(close_price, held_price):
+                tasks.append(RefreshTask(id_, last_date, last_date, REVISED))
+            continue
+        missing = store.missing_ranges(id_, start, last_date)
+        if not missing:
+            # the dates are marked as held, yet the listed day is not: it was published late
+            missing = [(max(start, held[id_][0] + timedelta(days=1)) if id_ in held else start, last_date)]
+        tasks.extend(RefreshTask(id_, missing_start, missing_end, MISSING) for missing_start, missing_end in missing)
+    return tasks
+
+
+def _same_price(listed: Optional[float], held: Optional[float]) -> bool:
+    """
+    Internal utility that compares a listed close price with a held one, missing prices are not compared.
+    """
+    try:
+        listed, held = float(listed), float(held)
+    except (TypeError, ValueError):
+        return True
+    if math.isnan(listed) or math.isnan(held):
+        return True
+    return math.isclose(listed, held, rel_tol=1e-12, abs_tol=0.0)
+
+
+def refresh(store: DayStore,
+            conceptual_asset_ids: Optional[Iterable[int]] = None,
+            from_date: Optional[datetime] = None,
+            max_workers: int = 8,
+            client: Optional[Client] = None) -> RefreshResult:
+    """
+    Brings a store up to date using the last day published of each real asset: the real assets of each conceptual
+    asset are listed, the listing is compared with the store (see plan_refresh), and only the stale real assets have
+    their missing days requested. A daily refresh costs one listing per conceptual asset plus one request per real
+    asset that actually published new days, instead of one request per real asset.
+
+    A failing listing or task does not abort the refresh, it is reported in the result and retried by the next run.
+
+    :param store: Store the days are saved to.
+    :param conceptual_asset_ids: Conceptual assets to be refreshed, the whole catalog if absent.
+    :param from_date: First date to be held, the whole history if absent.
+    :param max_workers: Maximum number of requests in flight.
+    :param client: Client performing the requests, the default client if absent.
+    :return: Summary of the refresh.
+    """
+    _verify_type(store, DayStore, 'store')
+    if max_workers < 1:
+        raise ValueError(f'max_workers ({max_workers}) must be positive.')
+    errors: Dict[str, Dict[Union[int, RefreshTask], str]] = {'asset_providers': {}, 'conceptual_assets': {},
+                                                             'real_assets': {}}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if conceptual_asset_ids is None:
+            provider_ids = [int(id_) for id_ in asset_providers(client=client, output='dict').get('id', [])]
+            futures = {id_: executor.submit(conceptual_assets, id_, client=client, output='dict')
+                       for id_ in provider_ids}
+            conceptual_asset_ids = []
+            for id_, future in futures.items():
+                try:
+                    columns = future.result()
+                except Exception as error:
+                    logger.warning('asset_providers %s failed: %s', id_, error)
+                    errors['asset_providers'][id_] = f'{type(error).__name__}: {error}'
+                    continue
+                conceptual_asset_ids += [int(conceptual_asset_id) for conceptual_asset_id in columns.get('id', [])]
+        conceptual_asset_ids = list(dict.fromkeys(conceptual_asset_ids))
+
+        futures = {id_: executor.submit(real_assets, id_, client=client) for id_ in conceptual_asset_ids}
+        frames = []
+        for id_, future in futures.items():
+            try:
+                frame = future.result()
+            except Exception as error:
+                logger.warning('conceptual_assets %s failed: %s', id_, error)
+                errors['conceptual_assets'][id_] = f'{type(error).__name__}: {error}'
+                continue
+            if not frame.empty:
+                frames.append(frame)
+        listing = pd.concat(frames) if frames else pd.DataFrame()
+
+        tasks = plan_refresh(store, listing, from_date)
+        futures = [(task, executor.submit(store.fetch, task.real_asset_id, task.from_date, task.to_date, client))
+                   for task in tasks]
+        done = []
+        for task, future in futures:
+            try:
+                future.result()
+            except Exception as error:
+                logger.warning('real_assets %s (%s %s to %s) failed: %s', task.real_asset_id, task.reason,
+                               task.from_date, task.to_date, error)
+                errors['real_assets'][task] = f'{type(error).__name__}: {error}'
+                continue
+            done.append(task)
+
+    return RefreshResult(len(listing.index.unique()), done, errors)
@@ -0,0 +1,299 @@
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence
+
+from .._lazy import LazyModule
+
+np = LazyModule('numpy')
+pa = LazyModule('pyarrow', extra='arrow')
+pd = LazyModule('pandas')
+
+INTEGER = 'integer'
+FLOAT = 'float'
+PRICE = 'price'
+DATE = 'date'
+CATEGORY = 'category'
+OBJECT = 'object'
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+class Schema:
+    """
+    Column types of an external API resource. It builds a typed DataFrame straight from the JSON data, one column at a
+    time, instead of building an untyped DataFrame and casting it afterwards.
+
+    Columns are declared with one of the kinds INTEGER, FLOAT, PRICE (a float that may be stored as float32), DATE,
+    CATEGORY (a string that may be stored as categorical) and OBJECT (kept as parsed). Attributes holding a nested
+    JSON object (one level only) are flattened into '{attribute}_{name}' columns, appended at the end.
+    """
+
+    def __init__(self,
+                 columns: Dict[str, str],
+                 nested: Optional[Dict[str, Dict[str, str]]] = None,
+                 categorical: bool = False,
+                 float32: bool = False) -> None:
+        """
+        :param columns: Kind of each attribute, 'id' included. Attributes not declared are kept as parsed.
+        :param nested: Kind of each attribute of nested JSON objects, by name of the object.
+        :param categorical: If set, CATEGORY columns are stored as pandas Categorical.
+        :param float32: If set, PRICE columns are stored as float32.
+        """
+        self.columns = columns
+        self.nested = nested or {}
+        self.categorical = categorical
+        self.float32 = float32
+
+    def replace(self, categorical: Optional[bool] = None, float32: Optional[bool] = None) -> 'Schema':
+        """
+        Copy of the schema with other dtype choices.
+
+        :param categorical: If set, CATEGORY columns are stored as pandas Categorical.
+        :param float32: If set, PRICE columns are stored as float32.
+        :return: New schema.
+        """
+        return Schema(self.columns,
+                      self.nested,
+                      self.categorical if categorical is None else categorical,
+                      self.float32 if float32 is None else float32)
+
+    def kind(self, column: str) -> str:
+        """
+        Kind of a column, nested ones addressed by their flattened name.
+
+        :param column: Name of the column.
+        :return: Kind of the column, OBJECT if not declared.
+        """
+        if column in self.columns:
+            return self.columns[column]
+        for name, kinds in self.nested.items():
+            if column.startswith(f'{name}_'):
+                return kinds.get(column[len(name) + 1:], OBJECT)
+        return OBJECT
+
+    def flatten(self, data: list) -> Dict[str, Sequence]:
+        """
+        Columns of the JSON data of the external API as parsed, without building anything: 'id' first, nested
+        objects flattened at the end, rows in the order of the external API.
+
+        :param data: List of JSON data from external API.
+        :return: Mapping from column name to its values.
+        """
+        if len(data) == 0:
+            return {}
+        attributes = [item['attributes'] for item in data]
+        columns, nested_columns = {'id': [item['id'] for item in data]}, {}
+        for name, values in self._transpose(attributes).items():
+            if name in self.nested:
+                inner = [value or {} for value in values]
+                for inner_name, inner_values in self._transpose(inner).items():
+                    nested_columns[f'{name}_{inner_name}'] = inner_values
+            else:
+                columns[name] = values
+        columns.update(nested_columns)
+        return columns
+
+    def arrays(self, data: list) -> Dict[str, 'np.ndarray']:
+        """
+        Typed NumPy columns of the JSON data of the external API, without importing pandas. Dates are datetime64[D],
+        undeclared and string columns are object arrays. Rows are in the order of the external API.
+
+        :param data: List of JSON data from external API.
+        :return: Mapping from column name to its array.
+        """
+        return {name: self._cast_array(values, self.kind(name)) for name, values in self.flatten(data).items()}
+
+    def table(self, data: list) -> 'pa.Table':
+        """
+        Builds a pyarrow Table straight from the JSON data of the external API, without pandas. Columns are typed as
+        in arrays, numeric and date ones handed to Arrow without copying Python objects; missing values are nulls and
+        CATEGORY columns are dictionary encoded if categorical is set. Rows are sorted by id, as in build.
+
+        :param data: List of JSON data from external API.
+        :return: Arrow table with an 'id' column first.
+        """
+        if len(data) == 0:
+            return pa.table({})
+        columns = self.arrays(data)
+        order = _sort_order(columns['id'])
+        return pa.table({name: self._cast_arrow(values if order is None else values[order], self.kind(name))
+                         for name, values in columns.items()})
+
+    def build(self, data: list) -> 'pd.DataFrame':
+        """
+        Builds a DataFrame from the JSON data of the external API, indexed and sorted by id.
+
+        :param data: List of JSON data from external API.
+        :return: Pandas DataFrame from data records.
+        """
+        if len(data) == 0:
+            return pd.DataFrame()
+        columns = {name: self._cast(values, self.kind(name)) for name, values in self.flatten(data).items()}
+        index = columns.pop('id')
+        dataframe = pd.DataFrame(columns, index=index)
+
+        # the external API usually sorts its responses, either way
+        if dataframe.index.is_monotonic_increasing:
+            return dataframe
+        elif dataframe.index.is_monotonic_decreasing:
+            return dataframe.iloc[::-1]
+        return dataframe.sort_index()
+
+    @staticmethod
+    def _transpose(records: List[dict]) -> Dict[str, Sequence]:
+        """
+        Internal utility that turns a list of JSON objects into a mapping from attribute name to its list of values.
+        Objects usually share their attributes, so every value is fetched in a single pass; a missing one is None.
+        """
+        names = list(dict.fromkeys(chain.from_iterable(records)))
+        if len(names) == 0:
+            return {}
+        try:
+            if len(names) == 1:
+                return {names[0]: list(map(itemgetter(names[0]), records))}
+            return dict(zip(names, zip(*map(itemgetter(*names), records))))
+        except KeyError:
+            return {name: [record.get(name) for record in records] for name in names}
+
+    def _cast(self, values: list, kind: str) -> Any:
+        """
+        Internal utility that turns the values of a column into an array of its kind.
+        """
+        if kind == INTEGER:
+            # Apparently there are non integer ids. (?)
+            try:
+                return np.asarray(values, dtype=np.int64)
+            except (ValueError, TypeError):
+                return values
+        elif kind in (FLOAT, PRICE):
+            dtype = np.float32 if kind == PRICE and self.float32 else np.float64
+            try:
+                return np.asarray(values, dtype=dtype)
+            except (ValueError, TypeError):
+                return pd.to_numeric(values, errors='coerce').astype(dtype)
+        elif kind == DATE:
+            dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+            failed = dates.isna() & pd.notna(np.asarray(values, dtype=object))
+            if failed.any():
+                # other forms, such as a time part or an offset, are parsed one at a time
+                dates = pd.DatetimeIndex([_parse_date(value) if fail else date
+                                          for value, date, fail in zip(values, dates, failed)])
+            return dates
+        elif kind == CATEGORY and self.categorical:
+            return pd.Categorical(values)
+        return values
+
+    def _cast_array(self, values: Sequence, kind: str) -> 'np.ndarray':
+        """
+        Internal utility that turns the values of a column into a NumPy array of its kind, coercing invalid values.
+        """
+        if kind == INTEGER:
+            try:
+                return np.asarray(values, dtype=np.int64)
+            except (ValueError, TypeError):
+                pass
+        elif kind in (FLOAT, PRICE):
+            dtype = np.float32 if kind == PRICE and self.float32 else np.float64
+            try:
+                return np.asarray(values, dtype=dtype)
+            except (ValueError, TypeError):
+                return np.asarray([_coerce(float, value) for value in values], dtype=dtype)
+        elif kind == DATE:
+            try:
+                return np.asarray(values, dtype='datetime64[D]')
+            except (ValueError, TypeError):
+                return np.asarray([_coerce(np.datetime64, value) for value in values], dtype='datetime64[D]')
+        return np.asarray(values, dtype=object)
+
+    def _cast_arrow(self, values: 'np.ndarray', kind: str) -> 'pa.Array':
+        """
+        Internal utility that turns a typed NumPy column into an Arrow array, NaN and NaT becoming nulls.
+        """
+        array = pa.array(values, from_pandas=True)
+        if kind == CATEGORY and self.categorical:
+            return array.dictionary_encode()
+        return array
+
+
+def _sort_order(ids: 'np.ndarray') -> Any:
+    """
+    Internal utility: indexer sorting rows by id, None if they already are. The external API usually sorts its
+    responses, either way.
+    """
+    if len(ids) < 2:
+        return None
+    try:
+        steps = ids[1:] >= ids[:-1]
+        if steps.all():
+            return None
+        if (ids[1:] <= ids[:-1]).all():
+            return slice(None, None, -1)
+        return np.argsort(ids, kind='stable')
+    except TypeError:
+        return None
+
+
+def _parse_date(value: Any) -> 'pd.Timestamp':
+    """
+    Internal utility that parses a single date in any form pandas understands, NaT if it is invalid. Dates with an
+    offset are converted to UTC.
+    """
+    timestamp = pd.to_datetime(value, errors='coerce')
+    if timestamp is not pd.NaT and timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp
+
+
+def _coerce(type_: Any, value: Any) -> Any:
+    """
+    Internal utility that converts a single value, None if it is invalid.
+    """
+    try:
+        return type_(value)
+    except (ValueError, TypeError):
+        return None
+
+
+_LAST_DAY = {'price': PRICE, 'close_price': PRICE, 'fixed_fee': FLOAT, 'variable_fee': FLOAT, 'date': DATE}
+
+DEFAULT_SCHEMA = Schema(
+    {'id': INTEGER, 'max_scale': INTEGER, 'price': PRICE, 'close_price': PRICE, 'fixed_fee': FLOAT,
+     'variable_fee': FLOAT, 'date': DATE},
+    nested={'last_day': _LAST_DAY},
+)
+
+SCHEMAS = {
+    'asset_provider': Schema({'id': INTEGER, 'name': OBJECT}),
+    'bank': Schema({'id': INTEGER, 'name': OBJECT}),
+    'conceptual_asset': Schema({'id': INTEGER, 'name': OBJECT, 'symbol': OBJECT, 'category': CATEGORY,
+                                'currency': CATEGORY, 'max_scale': INTEGER, 'run': OBJECT, 'data_source': OBJECT}),
+    'real_asset': Schema({'id': INTEGER, 'name': OBJECT, 'symbol': OBJECT, 'serie': OBJECT, 'start_date': OBJECT,
+                          'end_date': OBJECT, 'previous_asset_id': OBJECT},
+                         nested={'last_day': _LAST_DAY}),
+    'real_asset_day': Schema({'id': INTEGER, 'date': DATE, 'price': PRICE, 'close_price': PRICE,
+                              'close_price_type': CATEGORY}),
+}
+
+
+def get_schema(type_: str) -> Schema:
+    """
+    Schema of a resource type of the external API, the permissive default schema for unknown types.
+
+    :param type_: Value of the 'type' member of the JSON data.
+    :return: Schema of the resource.
+    """
+    return SCHEMAS.get(type_, DEFAULT_SCHEMA)
+
+
+def configure_schemas(categorical: Optional[bool] = None, float32: Optional[bool] = None) -> None:
+    """
+    Changes the dtype choices of every registered schema, affecting every following API call; outputs memoized by
+    the caches are built again with the new schemas.
+
+    :param categorical: If set, category, currency and close_price_type are stored as pandas Categorical.
+    :param float32: If set, prices are stored as float32.
+    """
+    global DEFAULT_SCHEMA
+    DEFAULT_SCHEMA = DEFAULT_SCHEMA.replace(categorical, float32)
+    for type_, schema in SCHEMAS.items():
+        SCHEMAS[type_] = schema.replace(categorical, float32)
@@ -0,0 +1,239 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .api import Output, _convert, _get_request, _verify_output, _verify_type
+from .client import Client
+
+# separates names in the searched text, it is never part of a normalized query
+_SEPARATOR = '\x00'
+_SPACES = re.compile(r'\s+')
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Search form of a text: accents removed, case folded and runs of whitespace collapsed, so 'Banco  de Chile' and
+    'banco de chilé' match.
+
+    :param text: Text to be normalized, None is treated as empty.
+    :return: Normalized text.
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES.sub(' ', stripped.casefold().replace(_SEPARATOR, ' ')).strip()
+
+
+def normalize_run(run: Optional[str]) -> str:
+    """
+    Search form of a run (Chilean tax id): dots, hyphens and whitespace removed and case folded, so '8.929-K' and
+    '8929k' match.
+
+    :param run: Run to be normalized, None is treated as empty.
+    :return: Normalized run.
+    """
+    return re.sub(r'[\s.\-]', '', run or '').casefold()
+
+
+class _Snapshot(NamedTuple):
+    """
+    Internal utility holding the structures of an index built from one listing, swapped as a whole on refresh.
+    """
+    items: List[dict]
+    names: List[str]
+    text: str
+    starts: List[int]
+    heads: Tuple[List[str], List[int]]
+    words: Tuple[List[str], List[int]]
+    runs: Dict[str, List[int]]
+    built: float
+
+
+class SearchIndex:
+    """
+    In-memory search index over a listing of the external API, answering name searches and run lookups without any
+    request, in the time of a few string scans. It is built from the unfiltered listing (see banks_index and
+    conceptual_assets_index) and refreshed from it on demand, or once older than max_age.
+
+    Searches are accent and case insensitive. Matches are ranked: names starting with the query first, then names
+    with a later word starting with it, then names containing it inside a word, each group in alphabetical order.
+    """
+
+    def __init__(self, load: Callable[[], list], max_age: Optional[float] = None) -> None:
+        """
+        :param load: Function returning the listing, as a list of JSON data from external API.
+        :param max_age: If set, seconds after which the next search refreshes the index first.
+        """
+        if max_age is not None and max_age <= 0:
+            raise ValueError(f'max_age ({max_age}) must be positive.')
+        self.load = load
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = self._build(load())
+
+    def __len__(self) -> int:
+        return len(self._snapshot.items)
+
+    def refresh(self) -> None:
+        """
+        Rebuilds the index from a new listing. Searches running meanwhile use the previous one.
+        """
+        snapshot = self._build(self.load())
+        with self._lock:
+            self._snapshot = snapshot
+
+    def search(self,
+               query: str,
+               prefix: bool = False,
+               limit: Optional[int] = None,
+               output: str = 'pandas') -> Output:
+        """
+        Items whose name contains the query.
+
+        :param query: Text searched, accents and case do not matter.
+        :param prefix: If set, the query must match the start of a word of the name, as typed in autocompletion.
+        :param limit: Maximum number of items returned, the best ranked ones.
+        :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'. The pandas output is sorted by id, as the
+            external API; the others keep the ranking. 'dict' is the fastest.
+        :return: Same layout as the listing call, such as pyntual.api.banks(query).
+        """
+        _verify_type(query, str, 'query')
+        _verify_output(output)
+        snapshot = self._current()
+        normalized = normalize(query)
+        if not normalized:
+            return _convert([], output)
+
+        if prefix:
+            ranked = self._prefix_search(snapshot, normalized, limit)
+        else:
+            ranked = self._substring_search(snapshot, normalized, limit)
+        return _convert([snapshot.items[index] for index in ranked], output)
+
+    def lookup_run(self, run: str, output: str = 'pandas') -> Output:
+        """
+        Items with a run, such as conceptual assets by the run of their fund.
+
+        :param run: Run, dots, hyphens and case do not matter.
+        :param output: One of 'pandas', 'numpy', 'dict' or 'arrow'.
+        :return: Same layout as the listing call, such as pyntual.api.conceptual_assets(run=run).
+        """
+        _verify_type(run, str, 'run')
+        _verify_output(output)
+        snapshot = self._current()
+        indexes = snapshot.runs.get(normalize_run(run), [])
+        return _convert([snapshot.items[index] for index in indexes], output)
+
+    def _current(self) -> _Snapshot:
+        """
+        Internal utility that returns the current snapshot, refreshing it first if older than max_age.
+        """
+        snapshot = self._snapshot
+        if self.max_age is not None and time.monotonic() - snapshot.built > self.max_age:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    @staticmethod
+    def _prefix_search(snapshot: _Snapshot, query: str, limit: Optional[int]) -> List[int]:
+        """
+        Internal utility that finds the names with a word starting with the query: names starting with it, then
+        names with a later word starting with it, each group in alphabetical order. Both groups are ranges of sorted
+        arrays; the first one is read up to the limit, the second one is sorted by name, since it is sorted by the
+        matching word instead.
+        """
+        found: Dict[int, None] = {}
+        keys, indexes = snapshot.heads
+        position = bisect.bisect_left(keys, query)
+        while position < len(keys) and keys[position].startswith(query):
+            found.setdefault(indexes[position])
+            if limit is not None and len(found) >= limit:
+                return list(found)
+            position += 1
+        keys, indexes = snapshot.words
+        position, later = bisect.bisect_left(keys, query), set()
+        while position < len(keys) and keys[position].startswith(query):
+            if indexes[position] not in found:
+                later.add(indexes[position])
+            position += 1
+        names = snapshot.names
+        ranked = list(found) + sorted(later, key=lambda index: (names[index], index))
+        return ranked if limit is None else ranked[:limit]
+
+    @staticmethod
+    def _substring_search(snapshot: _Snapshot, query: str, limit: Optional[int]) -> List[int]:
+        """
+        Internal utility that finds the names containing the query, ranked as in _prefix_search and then the names
+        containing it inside a word.
+        """
+        text, starts, names = snapshot.text, snapshot.starts, snapshot.names
+        best: Dict[int, int] = {}
+        position = text.find(query)
+        while position != -1:
+            index = bisect.bisect_right(starts, position) - 1
+            # the first match of a name is its best one, normalized queries never span two names
+            best.setdefault(index, position - starts[index])
+            position = text.find(query, position + 1)
+
+        def rank(index: int) -> tuple:
+            offset, name = best[index], names[index]
+            group = 0 if offset == 0 else 1 if name[offset - 1] == ' ' or ' ' + query in name else 2
+            return group, name, index
+
+        return sorted(best, key=rank) if limit is None else heapq.nsmallest(limit, best, key=rank)
+
+    @staticmethod
+    def _build(items: list) -> _Snapshot:
+        """
+        Internal utility that builds the search structures of a listing: the normalized names joined into a single
+        text, so a substring search is a scan of str.find, along with the offsets of each name in it; the sorted
+        names and the sorted suffixes starting at each later word, so a prefix search is a binary search; and the
+        items by run.
+        """
+        items = list(items)
+        names = [normalize(item.get('attributes', {}).get('name')) for item in items]
+        starts, position = [], len(_SEPARATOR)
+        for name in names:
+            starts.append(position)
+            position += len(name) + len(_SEPARATOR)
+        heads = sorted((name, index) for index, name in enumerate(names))
+        words = sorted((name[offset + 1:], index) for index, name in enumerate(names)
+                       for offset, char in enumerate(name) if char == ' ')
+        runs: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            run = normalize_run(item.get('attributes', {}).get('run'))
+            if run:
+                runs.setdefault(run, []).append(index)
+        return _Snapshot(items, names, _SEPARATOR + _SEPARATOR.join(names), starts,
+                         ([key for key, _ in heads], [index for _, index in heads]),
+                         ([key for key, _ in words], [index for _, index in words]),
+                         runs, time.monotonic())
+
+
+def banks_index(client: Optional[Client] = None, max_age: Optional[float] = None) -> SearchIndex:
+    """
+    Search index of /banks, a local replacement of pyntual.api.banks(query).
+
+    :param client: Client performing the requests, the default client if absent.
+    :param max_age: If set, seconds after which the next search refreshes the index first.
+    :return: New index.
+    """
+    return SearchIndex(lambda: _get_request('banks', client), max_age)
+
+
+def conceptual_assets_index(client: Optional[Client] = None, max_age: Optional[float] = None) -> SearchIndex:
+    """
+    Search index of /conceptual_assets, a local replacement of pyntual.api.conceptual_assets(name=...) and
+    pyntual.api.conceptual_assets(run=...).
+
+    :param client: Client performing the requests, the default client if absent.
+    :param max_age: If set, seconds after which the next search refreshes the index first.
+    :return: New index.
+    """
+    return SearchIndex(lambda: _get_request('conceptual_assets', client), max_age)
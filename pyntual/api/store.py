@@ -0,0 +1,268 @@
+import json
+import sqlite3
+import threading
+
+from datetime import date as date_, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .._lazy import LazyModule
+from .api import _real_asset_days_data, _to_dataframe, _verify_type
+from .client import Client
+from .decoding import loads
+
+pd = LazyModule('pandas')
+
+Range = Tuple[date_, date_]
+
+# days this close to today may still be published late, only those received are marked as held
+PUBLICATION_LAG = timedelta(days=7)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS days (
+    real_asset_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    id TEXT NOT NULL,
+    attributes TEXT NOT NULL,
+    PRIMARY KEY (real_asset_id, date)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    real_asset_id INTEGER NOT NULL,
+    from_date TEXT NOT NULL,
+    to_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_real_asset_id ON coverage (real_asset_id);
+'''
+
+
+def _str_to_date(text: str) -> date_:
+    """
+    Internal utility that parses dates stored with the format yyyy-mm-dd.
+
+    :param text: Date as string.
+    :return: Parsed date.
+    """
+    return datetime.strptime(text, '%Y-%m-%d').date()
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    """
+    Internal utility that merges overlapping or contiguous date ranges.
+
+    :param ranges: Inclusive date ranges.
+    :return: Sorted, disjoint and non contiguous inclusive date ranges.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class DayStore:
+    """
+    Persistent SQLite store of /real_assets/{real_asset_id}/days. Published days never change, so the store keeps
+    track of the date ranges it already holds for each real asset and only requests the missing ones.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Path of the SQLite database, created if absent. ':memory:' keeps it in memory.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def coverage(self, id_: int) -> List[Range]:
+        """
+        Date ranges already held for a real asset.
+
+        :param id_: Real asset id.
+        :return: Sorted, disjoint inclusive date ranges.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT from_date, to_date FROM coverage WHERE real_asset_id = ? ORDER BY from_date', (id_,)
+            ).fetchall()
+        return [(_str_to_date(start), _str_to_date(end)) for start, end in rows]
+
+    def missing_ranges(self, id_: int, from_date: date_, to_date: date_) -> List[Range]:
+        """
+        Date ranges of [from_date, to_date] not yet held for a real asset.
+
+        :param id_: Real asset id.
+        :param from_date: First date of the range.
+        :param to_date: Last date of the range.
+        :return: Sorted inclusive date ranges.
+        """
+        missing, start = [], from_date
+        for covered_start, covered_end in self.coverage(id_):
+            if covered_end < start:
+                continue
+            if covered_start > to_date:
+                break
+            if covered_start > start:
+                missing.append((start, covered_start - timedelta(days=1)))
+            start = covered_end + timedelta(days=1)
+            if start > to_date:
+                break
+        if start <= to_date:
+            missing.append((start, to_date))
+        return missing
+
+    def sync(self,
+             id_: int,
+             to_date: Optional[datetime] = None,
+             from_date: Optional[datetime] = None,
+             client: Optional[Client] = None) -> int:
+        """
+        Requests the days of a real asset missing from the store and saves them. Ranges reaching recent days (see
+        PUBLICATION_LAG) are only marked as held up to the latest day received, and never beyond yesterday, so the days
+        still to be published are requested again on the next sync.
+
+        :param id_: Real asset id.
+        :param to_date: Last date to be held, today if absent.
+        :param from_date: First date to be held, the whole history if absent.
+        :param client: Client performing the requests, the default client if absent.
+        :return: Number of requests performed.
+        """
+        _verify_type(id_, int, 'Real asset id')
+        start, end = self._bounds(to_date, from_date)
+        missing = self.missing_ranges(id_, start, end)
+        for missing_start, missing_end in missing:
+            self.fetch(id_, missing_start, missing_end, client)
+        return len(missing)
+
+    def fetch(self, id_: int, from_date: date_, to_date: date_, client: Optional[Client] = None) -> int:
+        """
+        Requests the days of a real asset in a date range, whether held or not, and saves them over the held ones.
+        As in sync, recent days are not marked as held beyond the latest day received.
+
+        :param id_: Real asset id.
+        :param from_date: First date of the range, date.min for the whole history.
+        :param to_date: Last date of the range.
+        :param client: Client performing the request, the default client if absent.
+        :return: Number of days received.
+        """
+        data = _real_asset_days_data(
+            id_,
+            to_date=datetime.combine(to_date, datetime.min.time()),
+            from_date=datetime.combine(from_date, datetime.min.time()) if from_date > date_.min else None,
+            client=client,
+        )
+        held: Optional[date_] = min(to_date, date_.today() - timedelta(days=1))
+        if held >= date_.today() - PUBLICATION_LAG:
+            latest = max((_str_to_date(item['attributes']['date']) for item in data), default=None)
+            held = min(held, latest) if latest else None
+        self._save(id_, data, from_date, held)
+        return len(data)
+
+    def last_days(self, ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[date_, Optional[float]]]:
+        """
+        Latest day held for each real asset, in a single query.
+
+        :param ids: Real asset ids, every one held if absent.
+        :return: Mapping from real asset id to the date and close price of its latest day held. Real assets without
+            days are left out.
+        """
+        with self._lock:
+            # SQLite reads bare columns from the row holding the MAX
+            rows = self._connection.execute(
+                'SELECT real_asset_id, MAX(date), attributes FROM days GROUP BY real_asset_id'
+            ).fetchall()
+        wanted = None if ids is None else set(ids)
+        return {id_: (_str_to_date(day), loads(attributes).get('close_price'))
+                for id_, day, attributes in rows if wanted is None or id_ in wanted}
+
+    def load(self,
+             id_: int,
+             to_date: Optional[datetime] = None,
+             from_date: Optional[datetime] = None) -> 'pd.DataFrame':
+        """
+        Reads the days held for a real asset, without requesting anything.
+
+        :param id_: Real asset id.
+        :param to_date: Last date to be read, today if absent.
+        :param from_date: First date to be read, the whole history if absent.
+        :return: Pandas DataFrame with the same layout as pyntual.api.real_asset_days.
+        """
+        start, end = self._bounds(to_date, from_date)
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, attributes FROM days WHERE real_asset_id = ? AND date BETWEEN ? AND ?',
+                (id_, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return _to_dataframe([{'id': day_id, 'attributes': loads(attributes)} for day_id, attributes in rows])
+
+    def real_asset_days(self,
+                        id_: int,
+                        date: Optional[datetime] = None,
+                        to_date: Optional[datetime] = None,
+                        from_date: Optional[datetime] = None,
+                        client: Optional[Client] = None) -> 'pd.DataFrame':
+        """
+        Drop-in replacement of pyntual.api.real_asset_days backed by the store: only the missing date ranges are
+        requested before reading.
+
+        :param id_: parameter on external API.
+        :param date: parameter on external API. If set, to_date and from_date must be absent.
+        :param to_date: parameter on external API. If set, date must be absent.
+        :param from_date: parameter on external API. If set, date must be absent.
+        :param client: Client performing the requests, the default client if absent.
+        :return: Pandas DataFrame with the response data.
+        """
+        if date and (to_date or from_date):
+            raise ValueError('Cannot set date along with to or from date.')
+        if date:
+            to_date = from_date = date
+        self.sync(id_, to_date, from_date, client)
+        return self.load(id_, to_date, from_date)
+
+    def close(self) -> None:
+        """
+        Closes the database.
+        """
+        self._connection.close()
+
+    def __enter__(self) -> 'DayStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _bounds(to_date: Optional[datetime], from_date: Optional[datetime]) -> Range:
+        """
+        Internal utility that validates optional bounds and replaces missing ones by the whole history up to today.
+        """
+        for name, value in [('to_date', to_date), ('from_date', from_date)]:
+            if value:
+                _verify_type(value, datetime, name)
+        start = from_date.date() if from_date else date_.min
+        end = to_date.date() if to_date else date_.today()
+        if start > end:
+            raise ValueError(f'from_date ({start.isoformat()}) must not be after to_date ({end.isoformat()}).')
+        return start, end
+
+    def _save(self, id_: int, data: list, from_date: date_, to_date: Optional[date_]) -> None:
+        """
+        Internal utility that saves fetched days and marks [from_date, to_date] as held, nothing if to_date is None.
+        """
+        rows = [(id_, item['attributes']['date'], item['id'], json.dumps(item['attributes'])) for item in data]
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)', rows)
+            if to_date is None or from_date > to_date:
+                return
+            ranges = self._connection.execute(
+                'SELECT from_date, to_date FROM coverage WHERE real_asset_id = ?', (id_,)
+            ).fetchall()
+            ranges = [(_str_to_date(start), _str_to_date(end)) for start, end in ranges]
+            self._connection.execute('DELETE FROM coverage WHERE real_asset_id = ?', (id_,))
+            self._connection.executemany(
+                'INSERT INTO coverage VALUES (?, ?, ?)',
+                [(id_, start.isoformat(), end.isoformat())
+                 for start, end in _merge_ranges(ranges + [(from_date, to_date)])],
+            )
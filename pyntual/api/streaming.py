@@ -0,0 +1,93 @@
+import codecs
+import json
+import re
+
+from typing import Iterable, Iterator, Pattern
+
+_DATA_MEMBER = re.compile(r'"data"\s*:\s*')
+_SEPARATOR = re.compile(r'[\s,]*')
+_COMPACT_SIZE = 1 << 16
+
+
+class _Reader:
+    """
+    Internal utility holding the part of a response body not parsed yet.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+
+    def read(self) -> bool:
+        """
+        Appends the next chunk to the buffer, dropping the part already parsed.
+
+        :return: False if the body is exhausted.
+        """
+        if self.position > _COMPACT_SIZE:
+            self.buffer, self.position = self.buffer[self.position:], 0
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        return False
+
+    def skip(self, pattern: Pattern) -> str:
+        """
+        Moves past the characters matching a pattern, reading as needed.
+
+        :return: Next character, empty if the body is exhausted.
+        """
+        while True:
+            self.position = pattern.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self.read():
+                return self.buffer[self.position:self.position + 1]
+
+    def decode(self) -> object:
+        """
+        Decodes the JSON value starting at the current position, reading as needed.
+
+        :return: Decoded value.
+        """
+        while True:
+            try:
+                value, self.position = self.json_decoder.raw_decode(self.buffer, self.position)
+                return value
+            except json.JSONDecodeError:
+                if not self.read():
+                    raise
+
+
+def iter_data(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Incrementally parses the body of an external API response, yielding the items of its data member one at a time,
+    so neither the whole body nor the whole decoded tree is ever held in memory. A single object data member is
+    yielded as one item.
+
+    :param chunks: Body of the response, as UTF-8 encoded chunks.
+    :return: Iterator of JSON items.
+    """
+    reader = _Reader(chunks)
+    while True:
+        match = _DATA_MEMBER.search(reader.buffer)
+        if match:
+            reader.position = match.end()
+            break
+        if not reader.read():
+            raise ValueError('Response has no data member.')
+
+    if reader.skip(_SEPARATOR) != '[':
+        yield reader.decode()
+        return
+    reader.position += 1
+    while True:
+        character = reader.skip(_SEPARATOR)
+        if character == ']':
+            return
+        if character == '':
+            raise ValueError('Response ended before the end of its data member.')
+        yield reader.decode()
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional, Tuple
+
+from .._lazy import LazyModule
+
+asyncio = LazyModule('asyncio')
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter, meant to be shared by every client of a process. Tokens refill continuously at rate
+    per second up to burst. Callers reserve a token and wait for their turn, so concurrent threads and async tasks
+    are served in order, at the highest sustainable pace.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        :param rate: Sustained requests per second.
+        :param burst: Requests that may be sent at once after an idle period, rate rounded up if absent.
+        """
+        if rate <= 0:
+            raise ValueError(f'rate ({rate}) must be positive.')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate + 0.999))
+        if self.burst < 1:
+            raise ValueError(f'burst ({self.burst}) must be positive.')
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._throttled = 0
+
+    def reserve(self) -> float:
+        """
+        Takes a token, possibly in advance.
+
+        :return: Seconds to wait before the token may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self._throttled += 1
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """
+        Blocks the calling thread until a token is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            self._wait(+1)
+            try:
+                time.sleep(delay)
+            finally:
+                self._wait(-1)
+
+    async def acquire_async(self) -> None:
+        """
+        Suspends the calling task until a token is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            self._wait(+1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._wait(-1)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of callers currently waiting for a token.
+        """
+        with self._lock:
+            return self._waiting
+
+    @property
+    def throttled(self) -> int:
+        """
+        Number of reservations that had to wait.
+        """
+        with self._lock:
+            return self._throttled
+
+    def _wait(self, delta: int) -> None:
+        """
+        Internal utility that keeps the number of waiting callers.
+        """
+        with self._lock:
+            self._waiting += delta
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures: connection errors, timeouts and the configured HTTP
+    statuses. A Retry-After header is honored, capped at max_delay.
+    """
+
+    def __init__(self,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 max_delay: float = 60.0,
+                 statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                 jitter: bool = True) -> None:
+        """
+        :param retries: Number of times a request is sent again.
+        :param backoff: Base delay in seconds, doubled on every attempt.
+        :param max_delay: Maximum delay in seconds between attempts.
+        :param statuses: HTTP statuses considered transient.
+        :param jitter: If set, each delay is drawn uniformly between zero and its exponential value.
+        """
+        if retries < 0 or backoff < 0 or max_delay < 0:
+            raise ValueError('retries, backoff and max_delay must not be negative.')
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+        self.jitter = jitter
+
+    def delay(self, attempt: int, retry_after: Any = None) -> float:
+        """
+        Seconds to wait before sending a request again.
+
+        :param attempt: Number of the failed attempt, starting at zero.
+        :param retry_after: Value of the Retry-After header of the failed response, if any.
+        :return: Delay in seconds.
+        """
+        requested = _parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        delay = min(self.max_delay, self.backoff * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    """
+    Internal utility that parses a Retry-After header, either delay seconds or an HTTP date.
+
+    :param value: Value of the header.
+    :return: Seconds to wait, None if absent or invalid.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,108 @@
+"""Console script for pyntual."""
+
+import argparse
+import logging
+import sys
+
+from datetime import datetime
+from typing import List, Optional
+
+
+def _date(text: str) -> datetime:
+    """
+    Internal utility that parses dates given as yyyy-mm-dd.
+    """
+    try:
+        return datetime.strptime(text, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text} is not a yyyy-mm-dd date.')
+
+
+def _parser() -> argparse.ArgumentParser:
+    """
+    Internal utility that builds the parser of the command line.
+    """
+    parser = argparse.ArgumentParser(prog='pyntual', description='Fintual API Python client.')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    crawl = subparsers.add_parser('crawl', help='Store the days of every real asset of the catalog.')
+    crawl.add_argument('database', help='SQLite database the days are stored to, created if absent.')
+    crawl.add_argument('--checkpoint', help='Progress file, {database}.checkpoint.json by default.')
+    crawl.add_argument('--from-date', type=_date, help='First date to be stored, yyyy-mm-dd.')
+    crawl.add_argument('--to-date', type=_date, help='Last date to be stored, yyyy-mm-dd.')
+    crawl.add_argument('--workers', type=int, default=8, help='Worker threads of each stage.')
+    crawl.add_argument('--queue-size', type=int, default=256, help='Items waiting between two stages.')
+    crawl.add_argument('--rate', type=float, help='Maximum requests per second.')
+    crawl.add_argument('--retries', type=int, default=3, help='Retries of transient failures.')
+    crawl.add_argument('-v', '--verbose', action='store_true', help='Log every failure.')
+
+    refresh = subparsers.add_parser('refresh', help='Store the days published since the last run.')
+    refresh.add_argument('database', help='SQLite database the days are stored to, created if absent.')
+    refresh.add_argument('--conceptual-assets', type=int, nargs='+', metavar='ID',
+                         help='Conceptual assets to be refreshed, the whole catalog by default.')
+    refresh.add_argument('--from-date', type=_date, help='First date to be stored, yyyy-mm-dd.')
+    refresh.add_argument('--workers', type=int, default=8, help='Requests in flight.')
+    refresh.add_argument('--rate', type=float, help='Maximum requests per second.')
+    refresh.add_argument('--retries', type=int, default=3, help='Retries of transient failures.')
+    refresh.add_argument('-v', '--verbose', action='store_true', help='Log every failure.')
+    return parser
+
+
+def _crawl(args: argparse.Namespace) -> int:
+    """
+    Internal utility that runs the crawl command.
+    """
+    from .api import Client, DayStore, RateLimiter, RetryPolicy
+    from .api.crawler import crawl
+
+    rate_limiter = RateLimiter(args.rate) if args.rate else None
+    client = Client(pool_maxsize=3 * args.workers, rate_limiter=rate_limiter, retry=RetryPolicy(args.retries))
+    checkpoint = args.checkpoint or f'{args.database}.checkpoint.json'
+    with client, DayStore(args.database) as store:
+        try:
+            result = crawl(store, checkpoint, args.to_date, args.from_date, args.workers, args.queue_size, client)
+        except KeyboardInterrupt:
+            print(f'Interrupted, progress saved to {checkpoint}.', file=sys.stderr)
+            return 130
+    print(f'Asset providers: {result.asset_providers}, conceptual assets: {result.conceptual_assets}, '
+          f'real assets: {result.real_assets}.')
+    failures = sum(len(errors) for errors in result.errors.values())
+    if failures:
+        print(f'{failures} items failed, run again to retry them.', file=sys.stderr)
+        return 1
+    return 0
+
+
+def _refresh(args: argparse.Namespace) -> int:
+    """
+    Internal utility that runs the refresh command.
+    """
+    from .api import Client, DayStore, RateLimiter, RetryPolicy
+    from .api.refresh import refresh
+
+    rate_limiter = RateLimiter(args.rate) if args.rate else None
+    client = Client(pool_maxsize=args.workers, rate_limiter=rate_limiter, retry=RetryPolicy(args.retries))
+    with client, DayStore(args.database) as store:
+        result = refresh(store, args.conceptual_assets, args.from_date, args.workers, client)
+    print(f'Real assets: {result.real_assets}, refreshed: {len({task.real_asset_id for task in result.tasks})}.')
+    failures = sum(len(errors) for errors in result.errors.values())
+    if failures:
+        print(f'{failures} items failed, run again to retry them.', file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console script for pyntual."""
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR, format='%(levelname)s %(message)s')
+    if args.command == 'crawl':
+        return _crawl(args)
+    if args.command == 'refresh':
+        return _refresh(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())  # pragma: no cover
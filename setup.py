@@ -25,19 +25,31 @@ test_requirements = requirements
 setup(
     author="Vicente Lizana Estivill",
     author_email='v.lizana.e@gmail.com',
-    python_requires='>=3.6',
+    python_requires='>=3.8',
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Natural Language :: English',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
     description="Fintual API Python client.",
+    entry_points={
+        'console_scripts': [
+            'pyntual=pyntual.cli:main',
+        ],
+    },
     install_requires=requirements,
+    extras_require={
+        'arrow': ['pyarrow>=14.0'],
+        'async': ['httpx>=0.23'],
+        'speedups': ['orjson>=3.0', 'brotli>=1.0'],
+    },
     license="MIT license",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
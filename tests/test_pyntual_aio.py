@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.aio` module."""
+
+import asyncio
+import os
+import pandas as pd
+import tempfile
+import threading
+import unittest
+
+from datetime import datetime
+from typing import Callable, Optional
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import aio
+
+from .utils import json_response, mock_response
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def mock_transport(name: str, delay: float = 0.0, log: Optional[list] = None,
+                   statuses: Optional[list] = None) -> 'httpx.MockTransport':
+    """
+    Builds an httpx transport serving one of the recorded external API responses, after a delay. Requests are logged
+    along with the number of them in flight and the thread serving them; queued statuses are answered first.
+    """
+    state = {'current': 0}
+
+    async def handler(request: 'httpx.Request') -> 'httpx.Response':
+        state['current'] += 1
+        if log is not None:
+            log.append((request, state['current'], threading.get_ident()))
+        await asyncio.sleep(delay)
+        state['current'] -= 1
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, json=json_response(name))
+    return httpx.MockTransport(handler)
+
+
+def offline(*args, **kwargs):
+    raise AssertionError('blocking requests must not be performed')
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class TestPyntualAsyncAPI(unittest.TestCase):
+    """Tests for `pyntual.api.aio` module."""
+
+    def run_async(self, transport: 'httpx.MockTransport', coroutine_function: Callable, *args,
+                  client: Optional[api.Client] = None, **kwargs):
+        async def main():
+            async with api.AsyncClient(client, max_concurrency=4, transport=transport) as async_client:
+                return await coroutine_function(*args, client=async_client, **kwargs)
+
+        with patch('requests.Session.get', side_effect=offline):
+            return asyncio.run(main())
+
+    def test_001_same_dataframes(self):
+        cases = [
+            ('asset_provider_3', aio.asset_provider, api.asset_provider, (3,)),
+            ('asset_providers', aio.asset_providers, api.asset_providers, ()),
+            ('banks_q_de_chile', aio.banks, api.banks, ('de chile',)),
+            ('conceptual_asset_25', aio.conceptual_asset, api.conceptual_asset, (25,)),
+            ('conceptual_assets_3', aio.conceptual_assets, api.conceptual_assets, (3,)),
+            ('real_asset_166', aio.real_asset, api.real_asset, (166,)),
+            ('real_assets_25', aio.real_assets, api.real_assets, (25,)),
+            ('real_asset_days_166', aio.real_asset_days, api.real_asset_days, (166,)),
+        ]
+        for json_response_name, async_call, api_call, args in cases:
+            with self.subTest(json_response_name):
+                dataframe = self.run_async(mock_transport(json_response_name), async_call, *args)
+                with patch('requests.Session.get') as mock_get:
+                    mock_get.return_value = mock_response(json_response_name)
+                    expected = api_call(*args)
+                pd.testing.assert_frame_equal(dataframe, expected)
+        columns = self.run_async(mock_transport('real_asset_166'), aio.real_asset, 166, output='dict')
+        self.assertEqual(columns['name'], ['CLF/CLP'])
+
+    def test_002_errors_propagate(self):
+        self.assertRaises(TypeError, self.run_async, mock_transport('empty_data'), aio.real_asset_days, 'string')
+        self.assertRaises(ValueError, self.run_async, mock_transport('empty_data'), aio.real_asset_days, 166,
+                          date=datetime.now(), from_date=datetime.now())
+        self.assertRaises(httpx.HTTPStatusError, self.run_async, mock_transport('empty_data', statuses=[404]),
+                          aio.real_asset, 404)
+
+    def test_003_bounded_concurrency_on_the_loop(self):
+        log = []
+
+        async def fan_out(client):
+            return await asyncio.gather(*[aio.real_asset_days(id_, client=client) for id_ in range(1, 13)])
+
+        dataframes = self.run_async(mock_transport('real_asset_days_166', delay=0.02, log=log), fan_out)
+        self.assertEqual(len(dataframes), 12)
+        peak = max(current for _, current, _ in log)
+        self.assertLessEqual(peak, 4)
+        self.assertGreater(peak, 1)
+        # every request is served by the event loop thread
+        self.assertSetEqual({thread for _, _, thread in log}, {threading.get_ident()})
+
+    def test_004_client_configuration(self):
+        log = []
+        client = api.Client(base_url='https://example.com/api', cache=api.ResponseCache(), compression=False,
+                            retry=api.RetryPolicy(retries=1, backoff=0.0))
+
+        async def twice(client):
+            await aio.banks(client=client)
+            return await aio.banks(client=client)
+
+        transport = mock_transport('banks', log=log, statuses=[503])
+        self.assertEqual(len(self.run_async(transport, twice, client=client)), 10)
+        # the 503 is retried, the second call is served by the cache
+        self.assertEqual(len(log), 2)
+        request = log[0][0]
+        self.assertEqual(str(request.url), 'https://example.com/api/banks')
+        self.assertEqual(request.headers['Accept-Encoding'], 'identity')
+
+    def test_005_coalescing_and_archive(self):
+        log = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshot.jsonl.gz')
+
+            async def fan_out(client):
+                return await asyncio.gather(*[aio.conceptual_assets(client=client) for _ in range(8)])
+
+            with api.Archive(path, 'record') as archive:
+                transport = mock_transport('conceptual_assets', delay=0.02, log=log)
+                self.assertEqual(len(self.run_async(transport, fan_out, client=api.Client(archive=archive))), 8)
+            self.assertEqual(len(log), 1)
+            with api.Archive(path) as archive:
+                dataframes = self.run_async(mock_transport('empty_data', log=log), fan_out,
+                                            client=api.Client(archive=archive))
+            self.assertEqual(len(log), 1)
+            self.assertTrue(all(not dataframe.empty for dataframe in dataframes))
+
+            with api.Archive(path, 'record') as archive:
+                self.assertRaises(httpx.HTTPStatusError, self.run_async, mock_transport('banks', statuses=[404]),
+                                  aio.real_asset, 175, client=api.Client(archive=archive))
+            with api.Archive(path) as archive, self.assertRaises(httpx.HTTPStatusError) as raised:
+                self.run_async(mock_transport('empty_data', log=log), aio.real_asset, 175,
+                               client=api.Client(archive=archive))
+            self.assertEqual(raised.exception.response.status_code, 404)
+            self.assertEqual(len(log), 1)
+
+    def test_006_wrong_params(self):
+        self.assertRaises(ValueError, api.AsyncClient, max_concurrency=0)
+        self.assertRaises(TypeError, aio.set_default_async_client, api.Client())
+        self.assertRaises(ValueError, self.run_async, mock_transport('banks'), aio.banks, output='polars')
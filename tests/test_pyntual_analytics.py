@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.analytics` module."""
+
+import numpy as np
+import pandas as pd
+import unittest
+
+from datetime import date
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import analytics
+
+from .utils import days_server
+
+
+def random_prices(rows: int = 300, assets: int = 6, seed: int = 0) -> pd.DataFrame:
+    generator = np.random.default_rng(seed)
+    values = 1000 * np.cumprod(1 + generator.normal(0.0005, 0.01, size=(rows, assets)), axis=0)
+    index = pd.date_range('2020-01-01', periods=rows, name='date')
+    prices = pd.DataFrame(values, index=index, columns=pd.Index(range(100, 100 + assets), name='real_asset_id'))
+    # ragged series: a late start, an early end and a few holes
+    prices.iloc[:40, 1] = np.nan
+    prices.iloc[250:, 2] = np.nan
+    prices.iloc[[10, 11, 120], 3] = np.nan
+    return prices
+
+
+class TestPyntualAnalytics(unittest.TestCase):
+    """Tests for `pyntual.api.analytics` module."""
+
+    def setUp(self):
+        self.prices = random_prices()
+
+    def test_001_price_matrix_from_bulk(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.side_effect = days_server(1, date(2020, 1, 1), date(2020, 1, 10))
+            first = api.real_asset_days(1, client=api.Client())
+            mock_get.side_effect = days_server(2, date(2020, 1, 5), date(2020, 1, 15))
+            second = api.real_asset_days(2, client=api.Client())
+        matrix = analytics.price_matrix({1: first, 2: second})
+        self.assertEqual(matrix.shape, (15, 2))
+        self.assertTrue(matrix.loc['2020-01-11':, 1].isna().all())
+        self.assertTrue(matrix.loc[:'2020-01-04', 2].isna().all())
+        self.assertEqual(matrix.loc['2020-01-05', 2], 1000.0)
+
+        long = pd.concat({1: first.set_index('date'), 2: second.set_index('date')}, names=['real_asset_id', 'date'])
+        pd.testing.assert_frame_equal(analytics.price_matrix(long), matrix, check_freq=False)
+
+    def test_002_fill_inside(self):
+        values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [4.0, 5.0], [np.nan, np.nan]])
+        filled = analytics._fill_inside(values)
+        np.testing.assert_array_equal(filled, [[np.nan, 1], [2, 1], [2, 1], [4, 5], [np.nan, np.nan]])
+
+    def test_003_returns(self):
+        pd.testing.assert_frame_equal(analytics.returns(self.prices), self.prices / self.prices.shift(1) - 1)
+        expected = self.prices / self.prices.shift(21) - 1
+        pd.testing.assert_frame_equal(analytics.rolling_returns(self.prices, 21), expected)
+        annualized = analytics.rolling_returns(self.prices, 21, periods_per_year=252)
+        expected = (self.prices / self.prices.shift(21)) ** (252 / 21) - 1
+        pd.testing.assert_frame_equal(annualized, expected)
+        np.testing.assert_array_equal(analytics.returns(self.prices.to_numpy(), 5),
+                                      (self.prices / self.prices.shift(5) - 1).to_numpy())
+
+    def test_004_volatility(self):
+        expected = self.prices.pct_change(fill_method=None).std() * np.sqrt(252)
+        pd.testing.assert_series_equal(analytics.annualized_volatility(self.prices), expected)
+        self.assertTrue(np.isnan(analytics.annualized_volatility(np.array([[1.0], [2.0]])))[0])
+
+    def test_005_max_drawdown(self):
+        filled = self.prices.ffill()
+        expected = (self.prices / filled.cummax() - 1).min()
+        pd.testing.assert_series_equal(analytics.max_drawdown(self.prices), expected)
+        prices = np.array([[100.0], [120.0], [90.0], [110.0], [60.0], [130.0]])
+        self.assertAlmostEqual(analytics.max_drawdown(prices)[0], -0.5)
+        self.assertTrue(np.isnan(analytics.max_drawdown(np.full((3, 1), np.nan))[0]))
+
+    def test_006_correlation(self):
+        daily = self.prices.pct_change(fill_method=None)
+        pd.testing.assert_frame_equal(analytics.correlation(self.prices), daily.corr(), rtol=1e-9)
+        short = analytics.correlation(self.prices.iloc[:45], min_periods=10)
+        self.assertTrue(np.isnan(short.iloc[0, 1]))
+        self.assertFalse(np.isnan(short.iloc[0, 2]))
+
+    def test_007_wrong_params(self):
+        self.assertRaises(ValueError, analytics.returns, self.prices, 0)
+        self.assertRaises(ValueError, analytics.correlation, self.prices, min_periods=0)
+        self.assertRaises(ValueError, analytics.returns, np.ones(5))
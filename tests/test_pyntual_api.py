@@ -2,19 +2,23 @@
 
 """Tests for `pyntual` package."""
 
-import json
+import numpy as np
 import os
 import pandas as pd
+import subprocess
+import sys
 import unittest
 
-from datetime import datetime
+from datetime import date, datetime
 from requests import Response
-from requests.exceptions import HTTPError
+from requests.exceptions import ConnectionError, HTTPError
 from typing import Optional, List, Callable
 from unittest.mock import patch
 
 from pyntual import api
 
+from .utils import days_server, mock_response
+
 
 class TestPyntualAPI(unittest.TestCase):
     """Tests for `pyntual.api` package."""
@@ -30,18 +34,18 @@ class TestPyntualAPI(unittest.TestCase):
                                      *args,
                                      columns: Optional[List[str]] = None,
                                      **kwargs) -> None:
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.return_value.status_code = 200
             dirname = os.path.dirname(__file__)
             with open(os.path.join(dirname, 'json_responses', f'{json_response}.json')) as json_response_file:
-                mock_get.return_value.json.return_value = json.load(json_response_file)
+                mock_get.return_value.content = json_response_file.read().encode('utf-8')
             dataframe = api_call(*args, **kwargs)
         self.assertIsInstance(dataframe, pd.DataFrame, 'Response must be DataFrame')
         if columns:
             self.assertListEqual(dataframe.columns.to_list(), columns, 'Incorrect DataFrame columns')
 
     def not_found_test(self, api_call: Callable[..., pd.DataFrame], *args, **kwargs) -> None:
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.return_value = Response()
             mock_get.return_value.status_code = 404
             self.assertRaises(HTTPError, api_call, *args, **kwargs)
@@ -146,3 +150,93 @@ class TestPyntualAPI(unittest.TestCase):
 
     def test_029_real_asset_days_not_found(self):
         self.not_found_test(api.real_asset_days, 1)
+
+    def test_030_real_asset_days_chunked(self):
+        get = days_server(166, date(2020, 1, 1), date(2020, 3, 31))
+        with patch('requests.Session.get', side_effect=get) as mock_get:
+            dataframe = api.real_asset_days(166, from_date=datetime(2020, 1, 10), to_date=datetime(2020, 2, 20),
+                                            chunk_days=7)
+            expected = api.real_asset_days(166, from_date=datetime(2020, 1, 10), to_date=datetime(2020, 2, 20))
+        self.assertEqual(mock_get.call_count, 6 + 1)
+        pd.testing.assert_frame_equal(dataframe, expected)
+
+    def test_031_real_asset_days_chunked_start_date(self):
+        get = days_server(166, date(2020, 1, 1), date(2020, 3, 31), start_date=date(2020, 1, 1))
+        with patch('requests.Session.get', side_effect=get) as mock_get:
+            dataframe = api.real_asset_days(166, to_date=datetime(2020, 3, 31), chunk_days=30)
+        self.assertEqual(mock_get.call_count, 1 + 4)
+        self.assertEqual(len(dataframe), 91)
+        self.assertTrue(dataframe['date'].is_monotonic_increasing)
+
+    def test_032_real_asset_days_chunked_unknown_start(self):
+        with patch('requests.Session.get', side_effect=days_server(166, date(2020, 1, 1), date(2020, 3, 31))):
+            dataframe = api.real_asset_days(166, to_date=datetime(2020, 3, 31), chunk_days=10, max_workers=4)
+        self.assertEqual(len(dataframe), 91)
+        self.assertEqual(dataframe['date'].min(), datetime(2020, 1, 1))
+
+    def test_033_real_asset_days_chunked_retry(self):
+        get = days_server(166, date(2020, 1, 1), date(2020, 3, 31))
+        failures = []
+
+        def flaky_get(url, **kwargs):
+            if 'from_date=2020-01-01' in url and not failures:
+                failures.append(url)
+                raise ConnectionError('connection reset')
+            return get(url, **kwargs)
+
+        with patch('requests.Session.get', side_effect=flaky_get), patch('pyntual.api.api.sleep') as mock_sleep:
+            dataframe = api.real_asset_days(166, from_date=datetime(2020, 1, 1), to_date=datetime(2020, 3, 31),
+                                            chunk_days=30)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(len(dataframe), 91)
+        # the window is retried after a backoff
+        self.assertEqual(mock_sleep.call_count, 1)
+
+        # a client retry policy retries the requests, windows are not retried again
+        failures.clear()
+        client = api.Client(retry=api.RetryPolicy(retries=0))
+        with patch('requests.Session.get', side_effect=flaky_get), patch('pyntual.api.api.sleep') as mock_sleep:
+            self.assertRaises(ConnectionError, api.real_asset_days, 166, from_date=datetime(2020, 1, 1),
+                              to_date=datetime(2020, 3, 31), chunk_days=30, client=client)
+        mock_sleep.assert_not_called()
+
+    def test_034_real_asset_days_chunked_wrong_params(self):
+        self.assertRaises(ValueError, api.real_asset_days, 166, chunk_days=0)
+        self.assertRaises(TypeError, api.real_asset_days, 166, from_date='string', chunk_days=7)
+        self.assertRaises(ValueError, api.real_asset_days, 166, chunk_days=7, retries=-1)
+
+    def test_035_outputs(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            dataframe = api.real_asset_days(166)
+            arrays = api.real_asset_days(166, output='numpy')
+            columns = api.real_asset_days(166, output='dict')
+        self.assertListEqual(list(arrays.keys()), ['id'] + self.REAL_ASSET_DAY_COLUMNS)
+        self.assertEqual(arrays['date'].dtype, np.dtype('datetime64[D]'))
+        self.assertEqual(arrays['price'].dtype, np.float64)
+        self.assertListEqual(sorted(arrays['price'].tolist()), sorted(dataframe['price'].to_list()))
+        self.assertIsInstance(columns['price'], list)
+        self.assertEqual(columns['id'][0], '166-2020-10-05')
+        self.assertEqual(columns['date'][0], '2020-10-05')
+
+    def test_036_outputs_nested(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_assets_25')
+            arrays = api.real_assets(25, output='numpy')
+            mock_get.return_value = mock_response('empty_data')
+            empty = api.real_assets(25, output='dict')
+        self.assertListEqual(list(arrays.keys()), ['id'] + self.REAL_ASSET_COLUMNS)
+        self.assertEqual(arrays['id'].dtype, np.int64)
+        self.assertEqual(arrays['last_day_date'][0], np.datetime64('2020-10-05'))
+        self.assertDictEqual(empty, {})
+
+    def test_037_wrong_output(self):
+        self.assertRaises(ValueError, api.banks, output='polars')
+
+    def test_038_lazy_imports(self):
+        statement = "import sys, pyntual.api; print(' '.join(m for m in ('pandas', 'numpy', 'requests', 'asyncio') " \
+                    "if m in sys.modules))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        loaded = subprocess.run([sys.executable, '-c', statement], cwd=root, check=True, capture_output=True,
+                                text=True)
+        self.assertEqual(loaded.stdout.strip(), '')
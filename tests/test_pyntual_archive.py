@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.archive` module."""
+
+import gzip
+import io
+import os
+import pandas as pd
+import tempfile
+import unittest
+
+from datetime import datetime
+from requests import Response
+from requests.exceptions import HTTPError
+from unittest.mock import patch
+
+from pyntual import api
+
+from .test_pyntual_streaming import streamed_response
+from .utils import mock_response
+
+CALLS = [
+    ('asset_providers', lambda client: api.asset_providers(client=client)),
+    ('banks_q_de_chile', lambda client: api.banks('de chile', client=client)),
+    ('conceptual_assets_3', lambda client: api.conceptual_assets(3, client=client)),
+    ('real_asset_166', lambda client: api.real_asset(166, client=client)),
+    ('real_asset_days_166_20200922', lambda client: api.real_asset_days(166, date=datetime(2020, 9, 22),
+                                                                        client=client)),
+]
+
+
+def offline(*args, **kwargs):
+    raise AssertionError('no request must reach the network')
+
+
+class TestPyntualArchive(unittest.TestCase):
+    """Tests for `pyntual.api.archive` module."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'snapshot.jsonl.gz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, calls=CALLS):
+        expected = {}
+        with api.Archive(self.path, 'record') as archive, api.Client(archive=archive) as client:
+            for json_response, call in calls:
+                with patch('requests.Session.get') as mock_get:
+                    mock_get.return_value = mock_response(json_response)
+                    expected[json_response] = call(client)
+        return expected
+
+    def test_001_record_and_replay(self):
+        expected = self.record()
+        with api.Archive(self.path) as archive, api.Client(archive=archive) as client, \
+                patch('requests.Session.get', side_effect=offline):
+            self.assertEqual(len(archive), len(CALLS))
+            self.assertIn(('real_assets/166/days', (('date', '2020-09-22'),)), archive)
+            for json_response, call in CALLS:
+                with self.subTest(json_response):
+                    pd.testing.assert_frame_equal(call(client), expected[json_response])
+
+    def test_002_replay_miss(self):
+        self.record()
+        with api.Archive(self.path) as archive, api.Client(archive=archive) as client, \
+                patch('requests.Session.get', side_effect=offline):
+            self.assertRaises(KeyError, api.real_asset, 175, client=client)
+            self.assertRaises(KeyError, api.real_asset_days, 166, client=client)
+
+    def test_003_auto(self):
+        self.record(CALLS[:1])
+        with api.Archive(self.path, 'auto') as archive, api.Client(archive=archive) as client:
+            with patch('requests.Session.get') as mock_get:
+                mock_get.return_value = mock_response('real_asset_166')
+                api.asset_providers(client=client)
+                api.real_asset(166, client=client)
+                api.real_asset(166, client=client)
+            self.assertEqual(mock_get.call_count, 1)
+        with api.Archive(self.path) as archive:
+            self.assertListEqual([key[0] for key in archive.keys()], ['asset_providers', 'real_assets/166'])
+
+    def test_004_record_starts_new_archive(self):
+        self.record()
+        self.record(CALLS[:2])
+        with api.Archive(self.path) as archive:
+            self.assertEqual(len(archive), 2)
+
+    def test_005_stream(self):
+        with api.Archive(self.path, 'record') as archive, api.Client(archive=archive) as client:
+            with patch('requests.Session.get') as mock_get:
+                mock_get.return_value = streamed_response('real_asset_days_166')
+                expected = api.real_asset_days_stream(166, client=client)
+        with api.Archive(self.path) as archive, api.Client(archive=archive) as client, \
+                patch('requests.Session.get', side_effect=offline):
+            pd.testing.assert_frame_equal(api.real_asset_days_stream(166, client=client), expected)
+            self.assertEqual(sum(len(batch) for batch in api.iter_real_asset_days(166, client=client)), 10)
+
+    def test_006_truncated_archive(self):
+        self.record()
+        with open(self.path, 'rb') as archive_file:
+            content = archive_file.read()
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(content[:-20])
+        with api.Archive(self.path) as archive:
+            self.assertLess(len(archive), len(CALLS))
+            self.assertGreater(len(archive), 0)
+
+    def test_007_metrics(self):
+        self.record()
+        aggregator = api.MetricsAggregator()
+        with api.Archive(self.path) as archive, api.Client(archive=archive, hooks=[aggregator]) as client:
+            api.real_asset(166, client=client)
+        self.assertEqual(aggregator.records()[0].source, 'archive')
+        self.assertIsNone(aggregator.records()[0].network_time)
+
+    def test_008_wrong_params(self):
+        self.assertRaises(ValueError, api.Archive, self.path, 'rewind')
+        self.assertRaises(FileNotFoundError, api.Archive, self.path)
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(gzip.compress(b''))
+        self.assertEqual(len(api.Archive(self.path)), 0)
+
+    def test_009_failures(self):
+        not_found = Response()
+        not_found.status_code, not_found.reason, not_found.raw = 404, 'Not Found', io.BytesIO(b'')
+        with api.Archive(self.path, 'record') as archive, api.Client(archive=archive) as client, \
+                patch('requests.Session.get', return_value=not_found):
+            self.assertRaises(HTTPError, api.real_asset, 404, client=client)
+            self.assertRaises(HTTPError, api.real_asset_days_stream, 404, client=client)
+        with api.Archive(self.path) as archive, api.Client(archive=archive) as client, \
+                patch('requests.Session.get', side_effect=offline):
+            with self.assertRaises(HTTPError) as raised:
+                api.real_asset(404, client=client)
+            self.assertEqual(raised.exception.response.status_code, 404)
+            self.assertIn('404 Client Error: Not Found', str(raised.exception))
+            self.assertRaises(HTTPError, api.real_asset_days_stream, 404, client=client)
+            self.assertListEqual(api.real_asset_many([404], client=client).attrs['missing'], [404])
+
+    def test_010_flushed_lines(self):
+        with api.Archive(self.path, 'record') as archive, api.Client(archive=archive) as client:
+            for json_response, call in CALLS:
+                with patch('requests.Session.get', return_value=mock_response(json_response)):
+                    call(client)
+            # a copy taken before the archive is closed stands for the file left by a crash
+            with open(self.path, 'rb') as archive_file:
+                content = archive_file.read()
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(content)
+        with api.Archive(self.path) as archive:
+            self.assertEqual(len(archive), len(CALLS))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""Tests for the Arrow output and the Parquet writer of `pyntual.api`."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import schemas
+from pyntual.api.api import _to_dataframe
+
+from .test_pyntual_bulk import fake_get
+from .utils import json_response, mock_response
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = pq = None
+
+
+@unittest.skipIf(pa is None, 'pyarrow is not installed')
+class TestPyntualArrow(unittest.TestCase):
+    """Tests for the Arrow output and the Parquet writer of `pyntual.api`."""
+
+    def test_001_same_data_as_pandas(self):
+        cases = [
+            ('asset_providers', api.asset_providers, ()),
+            ('banks', api.banks, ()),
+            ('conceptual_assets', api.conceptual_assets, ()),
+            ('real_asset_166', api.real_asset, (166,)),
+            ('real_asset_days_166', api.real_asset_days, (166,)),
+        ]
+        for json_response_, call, args in cases:
+            with self.subTest(json_response_):
+                with patch('requests.Session.get') as mock_get:
+                    mock_get.return_value = mock_response(json_response_)
+                    table = call(*args, output='arrow')
+                    expected = call(*args)
+                self.assertIsInstance(table, pa.Table)
+                dataframe = table.to_pandas().set_index('id')
+                self.assertListEqual(dataframe.index.to_list(), expected.index.to_list())
+                self.assertListEqual(dataframe.columns.to_list(), expected.columns.to_list())
+
+    def test_002_types(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            table = api.real_asset_days(166, output='arrow')
+        self.assertEqual(table.schema.field('price').type, pa.float64())
+        self.assertEqual(table.schema.field('date').type, pa.date32())
+        self.assertEqual(table.schema.field('close_price_type').type, pa.string())
+        self.assertEqual(table.column('id').to_pylist(), sorted(table.column('id').to_pylist()))
+
+    def test_003_nulls(self):
+        data = [
+            {'id': '2', 'type': 'real_asset', 'attributes': {'name': 'b', 'last_day': None}},
+            {'id': '1', 'type': 'real_asset', 'attributes': {'name': 'a', 'last_day': {'close_price': '1.5',
+                                                                                       'date': 'bad'}}},
+        ]
+        table = schemas.get_schema('real_asset').table(data)
+        expected = _to_dataframe(data)
+        self.assertListEqual(table.column('id').to_pylist(), [1, 2])
+        self.assertEqual(table.column('last_day_close_price').null_count, 1)
+        self.assertEqual(table.column('last_day_date').null_count, 2)
+        self.assertEqual(table.column('last_day_close_price')[0].as_py(), expected['last_day_close_price'].iloc[0])
+
+    def test_004_categorical(self):
+        schema = schemas.get_schema('conceptual_asset').replace(categorical=True)
+        table = schema.table(json_response('conceptual_assets')['data'])
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('currency').type))
+        self.assertFalse(pa.types.is_dictionary(table.schema.field('name').type))
+
+    def test_005_memoized(self):
+        client = api.Client(validators=api.ValidatorCache())
+        with patch('requests.Session.get') as mock_get:
+            response = mock_response('real_asset_166')
+            response.headers = {'ETag': '"v1"'}
+            mock_get.return_value = response
+            first = api.real_asset(166, client=client, output='arrow')
+            response = mock_response('empty_data', 304)
+            response.headers = {}
+            mock_get.return_value = response
+            second = api.real_asset(166, client=client, output='arrow')
+        self.assertIs(first, second)
+
+    def test_006_real_asset_days_many(self):
+        with patch('requests.Session.get', side_effect=fake_get):
+            table = api.real_asset_days_many([175, 404, 166], output='arrow')
+            expected = api.real_asset_days_many([175, 404, 166])
+        self.assertEqual(table.column_names[:2], ['real_asset_id', 'id'])
+        self.assertEqual(table.num_rows, len(expected))
+        dataframe = table.to_pandas()
+        self.assertListEqual(dataframe['real_asset_id'].unique().tolist(), [166, 175])
+        self.assertListEqual(dataframe['date'].astype('datetime64[ns]').to_list(),
+                             expected.index.get_level_values('date').to_list())
+        self.assertListEqual(list(json.loads(table.schema.metadata[b'errors'])), ['404'])
+
+    def test_007_real_asset_days_many_wrong_output(self):
+        self.assertRaises(ValueError, api.real_asset_days_many, [166], wide=True, output='arrow')
+        self.assertRaises(ValueError, api.real_asset_days_many, [166], output='numpy')
+
+    def test_008_parquet(self):
+        with tempfile.TemporaryDirectory() as root, patch('requests.Session.get', side_effect=fake_get):
+            errors = api.write_real_asset_days_parquet([166, 175, 404], root)
+            self.assertListEqual(list(errors), [404])
+            dataframe = pq.read_table(f'{root}/real_asset_id=175').to_pandas()
+            expected = api.real_asset_days(175)
+            self.assertEqual(len(dataframe), len(expected))
+            self.assertListEqual(dataframe['year'].unique().tolist(), [2020])
+            # a partition written again is replaced rather than duplicated
+            api.write_real_asset_days_parquet([175], root)
+            self.assertEqual(pq.read_table(f'{root}/real_asset_id=175').num_rows, len(expected))
+            self.assertEqual(pq.read_table(root).num_rows, len(api.real_asset_days_many([166, 175])))
+
+    def test_009_parquet_nothing_to_write(self):
+        with tempfile.TemporaryDirectory() as root, patch('requests.Session.get', side_effect=fake_get):
+            errors = api.write_real_asset_days_parquet([404], root)
+            self.assertListEqual(os.listdir(root), [])
+        self.assertListEqual(list(errors), [404])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.bulk` module."""
+
+import unittest
+
+from datetime import datetime
+from requests import Response
+from unittest.mock import patch
+
+from pyntual import api
+
+from .utils import body_response, json_response, mock_response
+
+
+def fake_get(url, **kwargs):
+    if '/real_assets/404/' in url:
+        response = Response()
+        response.status_code = 404
+        return response
+    if '/real_assets/175/' in url:
+        return mock_response('real_asset_days_166_20200922_25')
+    return mock_response('real_asset_days_166')
+
+
+class TestPyntualBulk(unittest.TestCase):
+    """Tests for `pyntual.api.bulk` module."""
+
+    def test_001_real_asset_days_many(self):
+        with patch('requests.Session.get', side_effect=fake_get) as mock_get:
+            dataframe = api.real_asset_days_many([166, 175, 166])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertListEqual(dataframe.index.names, ['real_asset_id', 'date'])
+        self.assertListEqual(dataframe.columns.to_list(), ['price', 'close_price', 'close_price_type'])
+        self.assertListEqual(dataframe.index.get_level_values(0).unique().to_list(), [166, 175])
+        self.assertTrue(dataframe.index.is_monotonic_increasing)
+        self.assertDictEqual(dataframe.attrs['errors'], {})
+
+    def test_002_real_asset_days_many_wide(self):
+        with patch('requests.Session.get', side_effect=fake_get):
+            dataframe = api.real_asset_days_many([166, 175], wide=True, price_column='close_price')
+        self.assertListEqual(dataframe.columns.to_list(), [166, 175])
+        self.assertEqual(dataframe.index.name, 'date')
+        self.assertAlmostEqual(dataframe.loc[datetime(2020, 9, 22), 175], 28700.2)
+
+    def test_003_real_asset_days_many_partial_failure(self):
+        with patch('requests.Session.get', side_effect=fake_get):
+            dataframe = api.real_asset_days_many([166, 404])
+        self.assertListEqual(dataframe.index.get_level_values(0).unique().to_list(), [166])
+        self.assertListEqual(list(dataframe.attrs['errors'].keys()), [404])
+
+    def test_004_real_asset_days_many_all_failed(self):
+        with patch('requests.Session.get', side_effect=fake_get):
+            long = api.real_asset_days_many([404])
+            wide = api.real_asset_days_many([404], wide=True)
+        self.assertTrue(long.empty)
+        self.assertTrue(wide.empty)
+        self.assertListEqual(list(long.attrs['errors'].keys()), [404])
+
+    def test_005_real_asset_days_many_wrong_types(self):
+        self.assertRaises(TypeError, api.real_asset_days_many, ['string'])
+        self.assertRaises(TypeError, api.real_asset_days_many, [166], from_date='string')
+
+    def test_006_conceptual_asset_many_fan_out(self):
+        def get(url, **kwargs):
+            if url.endswith('/conceptual_assets/404'):
+                response = Response()
+                response.status_code = 404
+                return response
+            if url.endswith('/conceptual_assets/500'):
+                response = Response()
+                response.status_code = 500
+                return response
+            return mock_response('conceptual_asset_25')
+
+        with patch('requests.Session.get', side_effect=get) as mock_get:
+            dataframe = api.conceptual_asset_many([25, 404, 25, 500])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertListEqual(dataframe.index.to_list(), [25])
+        self.assertEqual(dataframe.loc[25, 'symbol'], 'USDCLP')
+        self.assertListEqual(dataframe.attrs['missing'], [404])
+        self.assertListEqual(list(dataframe.attrs['errors'].keys()), [500])
+
+    def test_007_asset_provider_many_listing(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('asset_providers')
+            listed = api.asset_providers()
+            ids = listed.index.to_list()[:4]
+            mock_get.reset_mock()
+            dataframe = api.asset_provider_many(ids)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(mock_get.call_args.args[0].endswith('/asset_providers'))
+        self.assertListEqual(dataframe.index.to_list(), sorted(ids))
+        self.assertListEqual(dataframe.attrs['missing'], [])
+
+    def test_008_listing_misses_fetched_one_by_one(self):
+        def get(url, **kwargs):
+            if url.endswith('/asset_providers'):
+                return mock_response('asset_providers')
+            if url.endswith('/asset_providers/3'):
+                return mock_response('asset_provider_3')
+            response = Response()
+            response.status_code = 404
+            return response
+
+        with patch('requests.Session.get', side_effect=get) as mock_get:
+            dataframe = api.asset_provider_many([120, 3, 999], listing_threshold=2)
+            few = api.asset_provider_many([3, 999], listing_threshold=None)
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertListEqual(dataframe.index.to_list(), [3, 120])
+        self.assertListEqual(dataframe.attrs['missing'], [999])
+        self.assertListEqual(few.index.to_list(), [3])
+
+    def test_009_real_asset_many(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_166')
+            dataframe = api.real_asset_many([166])
+            mock_get.return_value = mock_response('empty_data')
+            empty = api.real_asset_many([175])
+        self.assertEqual(dataframe.loc[166, 'name'], 'CLF/CLP')
+        self.assertTrue(empty.empty)
+        self.assertListEqual(empty.attrs['missing'], [175])
+
+    def test_010_many_wrong_types(self):
+        self.assertRaises(TypeError, api.real_asset_many, ['166'])
+        self.assertRaises(TypeError, api.asset_provider_many, [3], listing_threshold='4')
+
+    def test_011_failed_listing_falls_back(self):
+        def get(url, **kwargs):
+            if url.endswith('/conceptual_assets'):
+                response = Response()
+                response.status_code = 503
+                return response
+            body = json_response('conceptual_asset_25')
+            body['data']['id'] = url.rsplit('/', 1)[1]
+            return body_response(body)
+
+        with patch('requests.Session.get', side_effect=get) as mock_get, self.assertLogs('pyntual.api.bulk'):
+            dataframe = api.conceptual_asset_many([25, 26], listing_threshold=2)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertListEqual(dataframe.index.to_list(), [25, 26])
+        self.assertListEqual(dataframe.attrs['missing'], [])
+        self.assertDictEqual(dataframe.attrs['errors'], {})
+
+    def test_012_mismatched_item(self):
+        with patch('requests.Session.get', return_value=mock_response('conceptual_asset_25')):
+            dataframe = api.conceptual_asset_many([25, 26])
+        self.assertListEqual(dataframe.index.to_list(), [25])
+        self.assertListEqual(dataframe.attrs['missing'], [])
+        self.assertListEqual(list(dataframe.attrs['errors']), [26])
+        self.assertIsInstance(dataframe.attrs['errors'][26], ValueError)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.cache` module."""
+
+import pandas as pd
+import unittest
+
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import api as api_module
+from pyntual.api import cache as cache_module
+
+from .utils import mock_response
+
+
+class TestPyntualCache(unittest.TestCase):
+    """Tests for `pyntual.api.cache` module."""
+
+    def setUp(self):
+        self.cache = api.ResponseCache(ttl=60, maxsize=2)
+        self.client = api.Client(cache=self.cache)
+
+    def test_001_hit(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('asset_providers')
+            first = api.asset_providers(client=self.client)
+            second = api.asset_providers(client=self.client)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(first.equals(second))
+        self.assertEqual(self.cache.info(), api.CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1))
+
+    def test_002_normalized_key(self):
+        self.assertEqual(cache_module.cache_key('/conceptual_assets/', {'run': '1', 'name': 'a'}),
+                         cache_module.cache_key('conceptual_assets', {'name': 'a', 'run': '1'}))
+
+    def test_003_ttl(self):
+        with patch('requests.Session.get') as mock_get, patch.object(cache_module.time, 'monotonic') as mock_time:
+            mock_get.return_value = mock_response('asset_providers')
+            mock_time.return_value = 0
+            api.asset_providers(client=self.client)
+            mock_time.return_value = 61
+            api.asset_providers(client=self.client)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_004_lru_eviction(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('conceptual_asset_25')
+            api.conceptual_asset(1, client=self.client)
+            api.conceptual_asset(2, client=self.client)
+            api.conceptual_asset(1, client=self.client)
+            api.conceptual_asset(3, client=self.client)
+            api.conceptual_asset(1, client=self.client)
+            api.conceptual_asset(2, client=self.client)
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(self.cache.info().evictions, 2)
+
+    def test_005_invalidate(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('conceptual_asset_25')
+            api.conceptual_asset(1, client=self.client)
+            api.banks(client=self.client)
+            self.assertEqual(self.cache.invalidate('conceptual_assets'), 1)
+            api.conceptual_asset(1, client=self.client)
+            api.banks(client=self.client)
+            self.assertEqual(self.cache.invalidate(), 2)
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_006_entries_shared_outputs_copied(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('asset_provider_3')
+            data = self.client.get('asset_providers/3')
+            self.assertIs(self.client.get('asset_providers/3'), data)
+            dataframe = api.asset_provider(3, client=self.client)
+            self.assertIn('pandas', data.memo)
+            dataframe.loc[3, 'name'] = 'corrupted'
+            self.assertNotEqual(api.asset_provider(3, client=self.client).loc[3, 'name'], 'corrupted')
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_007_days_not_cached_by_default(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            api.real_asset_days(166, client=self.client)
+            api.real_asset_days(166, client=self.client)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_008_wrong_params(self):
+        self.assertRaises(ValueError, api.ResponseCache, ttl=0)
+        self.assertRaises(ValueError, api.ResponseCache, maxsize=0)
+
+
+class TestPyntualValidatorCache(unittest.TestCase):
+    """Tests for `pyntual.api.cache.ValidatorCache`."""
+
+    def setUp(self):
+        self.validators = api.ValidatorCache(maxsize=2)
+        self.client = api.Client(validators=self.validators)
+
+    @staticmethod
+    def response(name: str, status_code: int = 200, **headers):
+        response = mock_response(name, status_code)
+        response.headers = headers
+        return response
+
+    def test_001_revalidation(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = self.response('conceptual_assets', ETag='"v1"',
+                                                  **{'Last-Modified': 'Mon, 05 Oct 2020 00:00:00 GMT'})
+            first = api.conceptual_assets(client=self.client)
+            self.assertDictEqual(mock_get.call_args.kwargs['headers'], {})
+            mock_get.return_value = self.response('empty_data', 304)
+            second = api.conceptual_assets(client=self.client)
+        self.assertDictEqual(mock_get.call_args.kwargs['headers'],
+                             {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 05 Oct 2020 00:00:00 GMT'})
+        mock_get.return_value.json.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(self.validators.info().hits, 1)
+
+    def test_002_outputs_built_once(self):
+        with patch('requests.Session.get') as mock_get, \
+                patch('pyntual.api.api._build_output', wraps=api_module._build_output) as mock_build:
+            mock_get.return_value = self.response('real_asset_166', ETag='"v1"')
+            api.real_asset(166, client=self.client)
+            mock_get.return_value = self.response('empty_data', 304)
+            dataframe = api.real_asset(166, client=self.client)
+            dataframe.loc[166, 'name'] = 'corrupted'
+            self.assertEqual(api.real_asset(166, client=self.client).loc[166, 'name'], 'CLF/CLP')
+        self.assertEqual(mock_build.call_count, 1)
+
+    def test_003_no_validators(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = self.response('banks')
+            api.banks(client=self.client)
+            api.banks(client=self.client)
+        self.assertDictEqual(mock_get.call_args.kwargs['headers'], {})
+        self.assertEqual(self.validators.info().currsize, 0)
+
+    def test_004_changed(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = self.response('banks', ETag='"v1"')
+            api.banks(client=self.client)
+            mock_get.return_value = self.response('banks_q_de_chile', ETag='"v2"')
+            dataframe = api.banks(client=self.client)
+            api.banks(client=self.client)
+        self.assertEqual(len(dataframe), 2)
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'If-None-Match': '"v2"'})
+
+    def test_005_eviction_and_invalidation(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = self.response('conceptual_asset_25', ETag='"v1"')
+            for id_ in [1, 2, 3]:
+                api.conceptual_asset(id_, client=self.client)
+        self.assertEqual(self.validators.info().evictions, 1)
+        self.assertEqual(self.validators.invalidate('conceptual_assets/3'), 1)
+        self.assertEqual(self.validators.invalidate(), 1)
+
+    def test_006_validators_dropped_in_flight(self):
+        def get(url, headers, **kwargs):
+            if headers:
+                # the entry is dropped while the conditional request is in flight
+                self.validators.invalidate()
+                return self.response('empty_data', 304)
+            return self.response('banks', ETag='"v1"')
+
+        with patch('requests.Session.get', side_effect=get) as mock_get:
+            api.banks(client=self.client)
+            dataframe = api.banks(client=self.client)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertDictEqual(mock_get.call_args.kwargs['headers'], {})
+        self.assertEqual(len(dataframe), 10)
+        self.assertEqual(self.validators.info().currsize, 1)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.client` module."""
+
+import unittest
+
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import client as client_module
+
+from .utils import mock_response
+
+
+class TestPyntualClient(unittest.TestCase):
+    """Tests for `pyntual.api.client` module."""
+
+    def test_001_url(self):
+        client = api.Client()
+        self.assertEqual(client.url('banks'), 'https://fintual.cl/api/banks')
+        self.assertEqual(client.url('banks', q='de chile'), 'https://fintual.cl/api/banks?q=de%20chile')
+
+    def test_002_pool_configuration(self):
+        client = api.Client(pool_connections=2, pool_maxsize=32)
+        adapter = client.session.get_adapter('https://fintual.cl/api')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_003_session_reused(self):
+        client = api.Client(timeout=3)
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('asset_providers')
+            api.asset_providers(client=client)
+            api.banks(client=client)
+        self.assertEqual(mock_get.call_count, 2)
+        for call in mock_get.call_args_list:
+            self.assertEqual(call.kwargs['timeout'], 3)
+
+    def test_004_default_client(self):
+        previous = api.get_default_client()
+        self.assertIs(api.get_default_client(), previous)
+        client = api.Client()
+        try:
+            api.set_default_client(client)
+            self.assertIs(api.get_default_client(), client)
+        finally:
+            api.set_default_client(previous)
+
+    def test_005_default_client_wrong_type(self):
+        self.assertRaises(TypeError, api.set_default_client, 'string')
+
+    def test_006_lazy_default_client(self):
+        with patch.object(client_module, '_default_client', None):
+            self.assertIsInstance(api.get_default_client(), api.Client)
+
+    def test_007_context_manager(self):
+        with patch('requests.Session.close') as mock_close:
+            with api.Client():
+                pass
+        mock_close.assert_called_once()
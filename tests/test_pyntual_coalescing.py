@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.coalescing` module."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import HTTPError
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import aio
+from pyntual.api.coalescing import SingleFlight
+
+from .test_pyntual_aio import httpx, mock_transport
+from .utils import mock_response
+
+
+def slow(name: str, delay: float = 0.05, status_code: int = 200):
+    def get(*args, **kwargs):
+        time.sleep(delay)
+        response = mock_response(name, status_code)
+        if status_code >= 400:
+            response.raise_for_status.side_effect = HTTPError(f'{status_code} Error')
+        return response
+    return get
+
+
+class TestPyntualSingleFlight(unittest.TestCase):
+    """Tests for `pyntual.api.coalescing.SingleFlight`."""
+
+    def test_001_concurrent_calls_shared(self):
+        flights, started = SingleFlight(), threading.Event()
+
+        def work():
+            started.set()
+            time.sleep(0.05)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(flights.do, 'key', work)
+            started.wait()
+            followers = [executor.submit(flights.do, 'key', work) for _ in range(7)]
+            results = [leader.result()] + [future.result() for future in followers]
+        self.assertListEqual(results, [(42, False)] + [(42, True)] * 7)
+        self.assertEqual((flights.calls, flights.shared, flights.in_flight), (1, 7, 0))
+
+    def test_002_sequential_calls_not_shared(self):
+        flights = SingleFlight()
+        self.assertEqual(flights.do('key', lambda: 1), (1, False))
+        self.assertEqual(flights.do('key', lambda: 2), (2, False))
+
+    def test_003_errors_shared(self):
+        flights, started = SingleFlight(), threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flights.do, 'key', fail)
+            started.wait()
+            follower = executor.submit(flights.do, 'key', fail)
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+        self.assertEqual(flights.calls, 1)
+
+
+class TestPyntualClientCoalescing(unittest.TestCase):
+    """Tests for request coalescing of `pyntual.api.client.Client`."""
+
+    def test_001_threads(self):
+        client = api.Client()
+        with patch('requests.Session.get', side_effect=slow('real_asset_166')) as mock_get:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                dataframes = list(executor.map(lambda _: api.real_asset(166, client=client), range(8)))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(all(dataframe.equals(dataframes[0]) for dataframe in dataframes))
+        self.assertIsNot(dataframes[0], dataframes[1])
+
+    def test_002_different_params_not_coalesced(self):
+        client = api.Client()
+        with patch('requests.Session.get', side_effect=slow('conceptual_asset_25')) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda id_: api.conceptual_asset(id_, client=client), [1, 2, 1, 2]))
+        self.assertEqual(mock_get.call_count, 2)
+
+    @unittest.skipIf(httpx is None, 'httpx is not installed')
+    def test_003_async_tasks(self):
+        log = []
+
+        async def fan_out():
+            transport = mock_transport('conceptual_assets', delay=0.05, log=log)
+            async with api.AsyncClient(max_concurrency=8, transport=transport) as client:
+                return await asyncio.gather(*[aio.conceptual_assets(client=client) for _ in range(8)])
+
+        self.assertEqual(len(asyncio.run(fan_out())), 8)
+        self.assertEqual(len(log), 1)
+
+    def test_004_cache_expiry(self):
+        records = []
+        client = api.Client(cache=api.ResponseCache(), hooks=[records.append])
+        with patch('requests.Session.get', side_effect=slow('banks')) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: api.banks(client=client), range(4)))
+            api.banks(client=client)
+        self.assertEqual(mock_get.call_count, 1)
+        sources = [record.source for record in records]
+        self.assertEqual(sources.count('network'), 1)
+        self.assertIn('coalesced', sources)
+        self.assertEqual(sources[-1], 'cache')
+
+    def test_005_errors(self):
+        client = api.Client()
+        with patch('requests.Session.get', side_effect=slow('empty_data', status_code=503)) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(api.banks, client=client) for _ in range(4)]
+                for future in futures:
+                    self.assertRaises(HTTPError, future.result)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_006_disabled(self):
+        client = api.Client(coalesce=False)
+        with patch('requests.Session.get', side_effect=slow('real_asset_166')) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: api.real_asset(166, client=client), range(4)))
+        self.assertEqual(mock_get.call_count, 4)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.crawler` module and the crawl command."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+from pyntual import api, cli
+from pyntual.api.crawler import Checkpoint
+
+from .utils import catalog_server
+
+CATALOG = {1: {10: [100, 101], 11: [110]}, 2: {20: [200]}, 3: {}}
+FIRST, LAST = date(2020, 9, 1), date(2020, 9, 10)
+TO_DATE = datetime(2020, 9, 10)
+
+
+def requested_paths(mock_get) -> list:
+    return [call.args[0].split('/api/', 1)[1].split('?')[0] for call in mock_get.call_args_list]
+
+
+class TestPyntualCrawler(unittest.TestCase):
+    """Tests for `pyntual.api.crawler` module."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'crawl.json')
+        self.store = api.DayStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_001_full_crawl(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        errors = {'asset_providers': {}, 'conceptual_assets': {}, 'real_assets': {}}
+        self.assertEqual(result, api.CrawlResult(3, 3, 4, errors))
+        for id_ in (100, 101, 110, 200):
+            self.assertEqual(len(self.store.load(id_, to_date=TO_DATE)), 10)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_002_failures_resumed(self):
+        failing = ['conceptual_assets/10/real_assets', 'real_assets/200/days']
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, failing)):
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        self.assertListEqual(list(result.errors['conceptual_assets']), [10])
+        self.assertListEqual(list(result.errors['real_assets']), [200])
+        self.assertEqual(result.real_assets, 1)
+        with open(self.checkpoint) as checkpoint_file:
+            state = json.load(checkpoint_file)
+        self.assertListEqual(state['conceptual_assets']['completed'], [11, 20])
+        self.assertListEqual(state['real_assets']['completed'], [110])
+
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)) as mock_get:
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        self.assertEqual((result.asset_providers, result.conceptual_assets, result.real_assets), (0, 1, 3))
+        self.assertCountEqual(requested_paths(mock_get), [
+            'asset_providers', 'conceptual_assets/10/real_assets',
+            'real_assets/100/days', 'real_assets/101/days', 'real_assets/200/days',
+        ])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_003_interrupted_crawl_resumed(self):
+        checkpoint = Checkpoint(self.checkpoint)
+        checkpoint.discover('asset_providers', [1, 2, 3])
+        checkpoint.discover('conceptual_assets', [10, 11])
+        checkpoint.discover('real_assets', [110])
+        for level, id_ in [('asset_providers', 1), ('asset_providers', 3), ('conceptual_assets', 11)]:
+            checkpoint.complete(level, id_)
+        checkpoint.save()
+
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)) as mock_get:
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        self.assertEqual((result.asset_providers, result.conceptual_assets, result.real_assets), (1, 2, 4))
+        self.assertNotIn('asset_providers/1/conceptual_assets', requested_paths(mock_get))
+        self.assertNotIn('conceptual_assets/11/real_assets', requested_paths(mock_get))
+        self.assertEqual(len(self.store.load(110, to_date=TO_DATE)), 10)
+
+    def test_004_bounded_queues(self):
+        catalog = {provider_id: {provider_id * 10 + offset: [provider_id * 100 + offset * 10 + index
+                                                             for index in range(5)] for offset in range(5)}
+                   for provider_id in range(1, 6)}
+        with patch('requests.Session.get', side_effect=catalog_server(catalog, FIRST, LAST)):
+            result = api.crawl(self.store, to_date=TO_DATE, max_workers=2, queue_size=1)
+        self.assertEqual((result.asset_providers, result.conceptual_assets, result.real_assets), (5, 25, 125))
+
+    def test_005_store_kept_days_not_requested(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            api.crawl(self.store, to_date=TO_DATE)
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)) as mock_get:
+            api.crawl(self.store, to_date=TO_DATE)
+        self.assertFalse([path for path in requested_paths(mock_get) if path.endswith('days')])
+
+    def test_006_failing_root_listing(self):
+        checkpoint = Checkpoint(self.checkpoint)
+        checkpoint.discover('conceptual_assets', [11])
+        checkpoint.save()
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, ['asset_providers'])), \
+                patch('pyntual.api.client.time.sleep'), self.assertLogs('pyntual.api.crawler'):
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        self.assertListEqual(list(result.errors['asset_providers']), [None])
+        self.assertEqual((result.asset_providers, result.conceptual_assets, result.real_assets), (0, 1, 1))
+        self.assertTrue(os.path.exists(self.checkpoint))
+
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            result = api.crawl(self.store, self.checkpoint, to_date=TO_DATE)
+        self.assertEqual((result.asset_providers, result.conceptual_assets, result.real_assets), (3, 2, 3))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_007_interrupted(self):
+        checkpoint = Checkpoint(self.checkpoint)
+        checkpoint.discover('real_assets', [100, 101, 110, 200])
+        checkpoint.save()
+        serve = catalog_server(CATALOG, FIRST, LAST)
+
+        def slow(url, **kwargs):
+            time.sleep(0.05)
+            return serve(url, **kwargs)
+
+        with patch('requests.Session.get', side_effect=slow), \
+                patch('pyntual.api.crawler.asset_providers', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, api.crawl, self.store, self.checkpoint, to_date=TO_DATE,
+                              max_workers=1, queue_size=1)
+        with open(self.checkpoint) as checkpoint_file:
+            state = json.load(checkpoint_file)
+        self.assertListEqual(state['real_assets']['discovered'], [100, 101, 110, 200])
+        # the day in flight is stored, the one queued when the crawl stopped is left pending
+        self.assertListEqual(state['real_assets']['completed'], [100, 101, 110])
+
+    def test_008_wrong_params(self):
+        self.assertRaises(TypeError, api.crawl, ':memory:')
+        self.assertRaises(ValueError, api.crawl, self.store, max_workers=0)
+
+    def test_009_cli(self):
+        database = os.path.join(self.directory.name, 'days.sqlite')
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)), \
+                patch('sys.stdout'):
+            self.assertEqual(cli.main(['crawl', database, '--to-date', '2020-09-10', '--workers', '2']), 0)
+        with api.DayStore(database) as store:
+            self.assertEqual(len(store.load(200, to_date=TO_DATE)), 10)
+        self.assertFalse(os.path.exists(f'{database}.checkpoint.json'))
+
+        failing = ['real_assets/200/days']
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, failing)), \
+                patch('pyntual.api.client.time.sleep'), patch('sys.stdout'), patch('sys.stderr'):
+            self.assertEqual(cli.main(['crawl', database, '--to-date', '2020-09-20']), 1)
+        self.assertTrue(os.path.exists(f'{database}.checkpoint.json'))
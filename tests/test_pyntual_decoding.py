@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.decoding` module."""
+
+import gzip
+import json
+import math
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests import Response
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import decoding
+
+from .utils import json_response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def gzip_server(name: str, seen: list) -> ThreadingHTTPServer:
+    """
+    Serves a recorded response on every path, gzip compressed to clients accepting it, and records the
+    Accept-Encoding header of every request.
+    """
+    body = json.dumps(json_response(name)).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            seen.append(self.headers.get('Accept-Encoding'))
+            payload = body
+            self.send_response(200)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                payload = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestPyntualDecoding(unittest.TestCase):
+    """Tests for `pyntual.api.decoding` module."""
+
+    def test_001_backends_agree(self):
+        body = json.dumps(json_response('real_asset_days_166')).encode('utf-8')
+        with patch.object(decoding, '_loads', json.loads):
+            self.assertEqual(decoding.backend(), 'json')
+            expected = decoding.loads(body)
+        self.assertEqual(decoding.loads(body), expected)
+        self.assertEqual(decoding.loads(body.decode('utf-8')), expected)
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_002_orjson_preferred(self):
+        with patch.object(decoding, '_loads', None):
+            self.assertEqual(decoding.backend(), 'orjson')
+
+    def test_003_fallback_and_errors(self):
+        self.assertTrue(math.isnan(decoding.loads(b'{"price": NaN}')['price']))
+        self.assertRaises(json.JSONDecodeError, decoding.loads, b'{"data": [')
+
+    def test_004_decode_response(self):
+        response = Response()
+        response._content = json.dumps({'data': [{'name': 'Peñalolén'}]}).encode('utf-8')
+        with patch.object(Response, 'json') as mock_json:
+            self.assertEqual(decoding.decode_response(response), {'data': [{'name': 'Peñalolén'}]})
+        mock_json.assert_not_called()
+
+    def test_005_accept_encoding(self):
+        self.assertIn('gzip', decoding.accept_encoding())
+        self.assertEqual(decoding.accept_encoding(False), 'identity')
+        with patch('urllib3.util.make_headers', return_value={'accept-encoding': 'gzip,deflate,br'}):
+            client = api.Client()
+        self.assertEqual(client.session.headers['Accept-Encoding'], 'gzip,deflate,br')
+        self.assertEqual(api.Client(compression=False).session.headers['Accept-Encoding'], 'identity')
+
+    def test_006_compressed_transfer(self):
+        seen = []
+        server = gzip_server('real_asset_days_166', seen)
+        base_url = f'http://127.0.0.1:{server.server_address[1]}/api'
+        records = []
+        try:
+            with api.Client(base_url=base_url, hooks=[records.append]) as client:
+                compressed = api.real_asset_days(166, client=client)
+            with api.Client(base_url=base_url, compression=False, hooks=[records.append]) as client:
+                plain = api.real_asset_days(166, client=client)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('gzip', seen[0])
+        self.assertEqual(seen[1], 'identity')
+        self.assertTrue(compressed.equals(plain))
+        self.assertEqual(len(compressed), 10)
+        body = json.dumps(json_response('real_asset_days_166')).encode('utf-8')
+        self.assertEqual([metrics.bytes for metrics in records], [len(gzip.compress(body)), len(body)])
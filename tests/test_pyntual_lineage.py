@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.lineage` module."""
+
+import threading
+import time
+import unittest
+
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+from pyntual import api
+from pyntual.api.lineage import LineageSegment
+
+from .utils import body_response
+
+# real asset id -> (previous_asset_id, start_date, end_date, first published day, last published day)
+CHAIN = {
+    3: (2, date(2020, 9, 8), None, date(2020, 9, 8), date(2020, 9, 12)),
+    2: (1, date(2020, 9, 4), date(2020, 9, 8), date(2020, 9, 4), date(2020, 9, 8)),
+    1: (None, None, date(2020, 9, 4), date(2020, 9, 1), date(2020, 9, 4)),
+}
+
+
+def lineage_server(chain: Dict[int, Tuple], delay: float = 0.0, log: Optional[list] = None) -> Callable:
+    """
+    Fake requests.Session.get serving real assets of a chain and their days, the price of a day being its real
+    asset id times 1000 plus the day of the month.
+    """
+    lock = threading.Lock()
+
+    def get(url: str, **kwargs) -> MagicMock:
+        parsed = urlparse(url)
+        parts = parsed.path.split('/api/', 1)[1].split('/')
+        id_ = int(parts[1])
+        previous, start, end, first, last = chain[id_]
+        with lock:
+            if log is not None:
+                log.append(('/'.join(parts), time.perf_counter()))
+        time.sleep(delay)
+        if len(parts) == 2:
+            attributes = {'name': str(id_), 'previous_asset_id': previous,
+                          'start_date': start.isoformat() if start else None,
+                          'end_date': end.isoformat() if end else None}
+            return body_response({'data': {'id': str(id_), 'type': 'real_asset', 'attributes': attributes}})
+        params = {key: datetime.strptime(value[0], '%Y-%m-%d').date() for key, value in parse_qs(parsed.query).items()}
+        data, day = [], min(params.get('to_date', last), last)
+        while day >= max(params.get('from_date', first), first):
+            price = id_ * 1000.0 + day.day
+            data.append({'id': f'{id_}-{day.isoformat()}', 'type': 'real_asset_day',
+                         'attributes': {'date': day.isoformat(), 'price': price, 'close_price': price,
+                                        'close_price_type': 'clp'}})
+            day -= timedelta(days=1)
+        return body_response({'data': data})
+    return get
+
+
+class TestPyntualLineage(unittest.TestCase):
+    """Tests for `pyntual.api.lineage` module."""
+
+    def test_001_real_asset_lineage(self):
+        with patch('requests.Session.get', side_effect=lineage_server(CHAIN)):
+            segments = api.real_asset_lineage(3)
+        self.assertListEqual(segments, [LineageSegment(1, None, date(2020, 9, 4)),
+                                        LineageSegment(2, date(2020, 9, 4), date(2020, 9, 8)),
+                                        LineageSegment(3, date(2020, 9, 8), None)])
+
+    def test_002_stitched_series(self):
+        with patch('requests.Session.get', side_effect=lineage_server(CHAIN)):
+            dataframe = api.real_asset_days_lineage(3)
+        self.assertEqual(dataframe.index.name, 'date')
+        self.assertTrue(dataframe.index.is_unique)
+        self.assertTrue(dataframe.index.is_monotonic_increasing)
+        self.assertEqual(len(dataframe), 12)
+        self.assertListEqual(dataframe.columns.to_list(), ['real_asset_id', 'price', 'close_price', 'close_price_type'])
+        # overlapping days come from the newest segment
+        self.assertEqual(dataframe.loc[datetime(2020, 9, 4), 'real_asset_id'], 2)
+        self.assertEqual(dataframe.loc[datetime(2020, 9, 8), 'real_asset_id'], 3)
+        self.assertEqual(dataframe.loc[datetime(2020, 9, 1), 'price'], 1001.0)
+
+    def test_003_only_needed_segments_and_dates(self):
+        log = []
+        with patch('requests.Session.get', side_effect=lineage_server(CHAIN, log=log)) as mock_get:
+            dataframe = api.real_asset_days_lineage(3, from_date=datetime(2020, 9, 6), to_date=datetime(2020, 9, 10))
+        paths = [path for path, _ in log]
+        self.assertNotIn('real_assets/1', paths)
+        self.assertListEqual(dataframe.index.strftime('%d').to_list(), ['06', '07', '08', '09', '10'])
+        urls = [call.args[0] for call in mock_get.call_args_list if '/days' in call.args[0]]
+        self.assertIn('real_assets/2/days?to_date=2020-09-08&from_date=2020-09-06', ' '.join(urls))
+        self.assertIn('real_assets/3/days?to_date=2020-09-10&from_date=2020-09-08', ' '.join(urls))
+
+    def test_004_days_fetched_while_walking(self):
+        log = []
+        with patch('requests.Session.get', side_effect=lineage_server(CHAIN, delay=0.05, log=log)):
+            api.real_asset_days_lineage(3)
+        started = {path: moment for path, moment in log}
+        # the days of the newest segment are requested before the walk reaches the oldest one
+        self.assertLess(started['real_assets/3/days'], started['real_assets/1'])
+
+    def test_005_cycles_and_length(self):
+        cycle = {1: (2, None, None, date(2020, 9, 1), date(2020, 9, 2)),
+                 2: (1, None, None, date(2020, 9, 1), date(2020, 9, 2))}
+        with patch('requests.Session.get', side_effect=lineage_server(cycle)):
+            self.assertRaises(ValueError, api.real_asset_lineage, 1)
+        with patch('requests.Session.get', side_effect=lineage_server(CHAIN)):
+            self.assertRaises(ValueError, api.real_asset_days_lineage, 3, max_length=2)
+
+    def test_006_no_days(self):
+        single = {5: (None, None, None, date(2020, 9, 2), date(2020, 9, 1))}
+        with patch('requests.Session.get', side_effect=lineage_server(single)):
+            dataframe = api.real_asset_days_lineage(5)
+        self.assertTrue(dataframe.empty)
+        self.assertEqual(dataframe.index.name, 'date')
+
+    def test_007_wrong_params(self):
+        self.assertRaises(TypeError, api.real_asset_lineage, '3')
+        self.assertRaises(TypeError, api.real_asset_days_lineage, 3, from_date='2020-09-01')
+        self.assertRaises(ValueError, api.real_asset_days_lineage, 3, from_date=datetime(2020, 9, 2),
+                          to_date=datetime(2020, 9, 1))
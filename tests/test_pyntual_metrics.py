@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.metrics` module."""
+
+import gzip
+import io
+import json
+import unittest
+
+from datetime import timedelta
+from requests.exceptions import HTTPError
+from requests.models import Response
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import metrics as metrics_module
+
+from .utils import json_response, mock_response
+
+
+def measured_response(name: str, status_code: int = 200):
+    response = mock_response(name, status_code)
+    response.raw.tell.return_value = len(gzip.compress(response.content))
+    response.elapsed = timedelta(milliseconds=5)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(f'{status_code} Error')
+    return response
+
+
+class TestPyntualMetrics(unittest.TestCase):
+    """Tests for `pyntual.api.metrics` module."""
+
+    def setUp(self):
+        self.records = []
+        self.client = api.Client(hooks=[self.records.append])
+
+    def test_001_endpoint_call(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('conceptual_assets_name_chile')
+            api.conceptual_assets(name='chile', client=self.client)
+        self.assertEqual(len(self.records), 1)
+        metrics = self.records[0]
+        self.assertEqual(metrics.path, 'conceptual_assets')
+        self.assertDictEqual(metrics.params, {'name': 'chile'})
+        self.assertEqual((metrics.source, metrics.status, metrics.rows, metrics.error), ('network', 200, 10, None))
+        self.assertEqual(metrics.bytes, mock_get.return_value.raw.tell.return_value)
+        self.assertLess(metrics.bytes, len(mock_get.return_value.content))
+        self.assertEqual(metrics.ttfb, 0.005)
+        for field in ('network_time', 'decode_time', 'build_time'):
+            self.assertGreaterEqual(getattr(metrics, field), 0)
+        self.assertEqual(metrics.as_dict()['endpoint'], 'conceptual_assets')
+
+    def test_002_endpoint_placeholder(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('real_asset_days_166')
+            api.real_asset_days(166, client=self.client, output='numpy')
+            mock_get.return_value = measured_response('asset_provider_3')
+            api.asset_provider(3, client=self.client)
+        self.assertListEqual([metrics.endpoint for metrics in self.records],
+                             ['real_assets/{id}/days', 'asset_providers/{id}'])
+
+    def test_003_failed_call(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('empty_data', 404)
+            self.assertRaises(HTTPError, api.banks, client=self.client)
+        self.assertEqual(self.records[0].status, 404)
+        self.assertTrue(self.records[0].error.startswith('HTTPError'))
+        self.assertIsNone(self.records[0].build_time)
+
+    def test_004_cache_hit(self):
+        client = api.Client(cache=api.ResponseCache(), hooks=[self.records.append])
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('banks')
+            api.banks(client=client)
+            api.banks(client=client)
+        self.assertListEqual([metrics.source for metrics in self.records], ['network', 'cache'])
+        self.assertIsNone(self.records[1].network_time)
+        self.assertIsNotNone(self.records[1].build_time)
+
+    def test_005_bulk_requests(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('real_asset_days_166')
+            api.real_asset_days_many([1, 2, 3], client=self.client)
+        self.assertEqual(len(self.records), 3)
+        self.assertTrue(all(metrics.rows == 10 and metrics.build_time is None for metrics in self.records))
+
+    def test_006_stream(self):
+        body = json.dumps(json_response('real_asset_days_166')).encode()
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(body)
+        response.elapsed = timedelta(milliseconds=3)
+        with patch('requests.Session.get', return_value=response):
+            self.assertEqual(len(list(self.client.stream('real_assets/166/days'))), 10)
+        metrics = self.records[0]
+        self.assertEqual((metrics.bytes, metrics.rows, metrics.status, metrics.ttfb), (len(body), 10, 200, 0.003))
+        self.assertIsNone(metrics.error)
+
+    def test_007_no_hooks(self):
+        client = api.Client()
+        with patch('requests.Session.get') as mock_get, patch.object(metrics_module, 'RequestMetrics') as mock_metrics:
+            mock_get.return_value = mock_response('banks')
+            api.banks(client=client)
+        mock_metrics.assert_not_called()
+
+
+class TestPyntualMetricsAggregator(unittest.TestCase):
+    """Tests for `pyntual.api.metrics.MetricsAggregator`."""
+
+    def test_001_summary(self):
+        aggregator = api.MetricsAggregator()
+        for index in range(11):
+            metrics = api.RequestMetrics(f'real_assets/{index}/days', {})
+            metrics.network_time, metrics.rows = float(index), 10
+            aggregator(metrics)
+        failed = api.RequestMetrics('banks', {'q': 'x'})
+        failed.error = 'HTTPError: 500'
+        aggregator(failed)
+
+        summary = aggregator.summary(percentiles=(50, 95))
+        self.assertListEqual(list(summary), ['banks', 'real_assets/{id}/days'])
+        days = summary['real_assets/{id}/days']
+        self.assertDictEqual(days['requests'], {'count': 11, 'errors': 0})
+        self.assertDictEqual(days['network_time'], {'count': 11, 'mean': 5.0, 'p50': 5.0, 'p95': 9.5})
+        self.assertEqual(days['rows']['p95'], 10)
+        self.assertNotIn('build_time', days)
+        self.assertDictEqual(summary['banks'], {'requests': {'count': 1, 'errors': 1}})
+        self.assertEqual(len(aggregator.records('banks')), 1)
+
+    def test_002_maxlen_and_reset(self):
+        aggregator = api.MetricsAggregator(maxlen=2)
+        for index in range(5):
+            metrics = api.RequestMetrics('banks', {})
+            metrics.rows = index
+            aggregator(metrics)
+        self.assertListEqual([metrics.rows for metrics in aggregator.records()], [3, 4])
+        aggregator.reset()
+        self.assertDictEqual(aggregator.summary(), {})
+
+    def test_003_as_client_hook(self):
+        aggregator = api.MetricsAggregator()
+        client = api.Client(hooks=[aggregator])
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = measured_response('banks')
+            for _ in range(3):
+                api.banks(client=client)
+        summary = aggregator.summary()['banks']
+        self.assertEqual(summary['requests']['count'], 3)
+        self.assertSetEqual(set(summary), {'requests', 'bytes', 'ttfb', 'network_time', 'decode_time', 'build_time',
+                                           'rows'})
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.prices` module."""
+
+import numpy as np
+import pandas as pd
+import unittest
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+from pyntual import api
+
+from .utils import days_server
+
+
+class TestPyntualPriceIndex(unittest.TestCase):
+    """Tests for `pyntual.api.prices.PriceIndex`."""
+
+    def setUp(self):
+        self.index = api.PriceIndex()
+        # Friday, Monday and Tuesday: the weekend falls back to Friday
+        self.index.add(1, ['2020-10-02', '2020-10-05', '2020-10-06'], [10.0, 11.0, 12.0])
+        self.index.add(2, [date(2020, 10, 6), date(2020, 10, 1)], [200.0, 100.0])
+
+    def test_001_price(self):
+        self.assertEqual(self.index.price(1, date(2020, 10, 2)), 10.0)
+        self.assertEqual(self.index.price(1, datetime(2020, 10, 4, 18)), 10.0)
+        self.assertEqual(self.index.price(1, '2020-10-05'), 11.0)
+        self.assertEqual(self.index.price(1, pd.Timestamp('2021-01-01')), 12.0)
+        self.assertEqual(self.index.price(2, np.datetime64('2020-10-03')), 100.0)
+        self.assertTrue(np.isnan(self.index.price(1, '2020-10-01')))
+        self.assertRaises(KeyError, self.index.price, 3, '2020-10-01')
+
+    def test_002_batch(self):
+        prices, used = self.index.prices([1, 2, 3, 1], ['2020-10-04', '2020-10-04', '2020-10-04', '2020-09-01'],
+                                         return_dates=True)
+        np.testing.assert_array_equal(prices, [10.0, 100.0, np.nan, np.nan])
+        np.testing.assert_array_equal(used, np.array(['2020-10-02', '2020-10-01', 'NaT', 'NaT'], dtype='datetime64[D]'))
+        # broadcasting: every asset at one date, one asset at every date
+        np.testing.assert_array_equal(self.index.prices([1, 2], '2020-10-06'), [12.0, 200.0])
+        dates = pd.date_range('2020-10-01', '2020-10-07')
+        np.testing.assert_array_equal(self.index.prices(1, dates), [np.nan, 10, 10, 10, 11, 12, 12])
+        grid = self.index.prices(np.array([[1], [2]]), dates)
+        self.assertEqual(grid.shape, (2, 7))
+
+    def test_003_max_staleness(self):
+        index = api.PriceIndex(max_staleness=2)
+        index.add(1, ['2020-10-02'], [10.0])
+        np.testing.assert_array_equal(index.prices(1, ['2020-10-04', '2020-10-05']), [10.0, np.nan])
+        self.assertTrue(np.isnan(index.price(1, '2020-10-05')))
+
+    def test_004_missing_and_repeated(self):
+        self.index.add(3, ['2020-10-01', '2020-10-02', '2020-10-02', None], [1.0, np.nan, 3.0, 4.0])
+        self.index.add(4, ['2020-10-02', '2020-10-01', '2020-10-02'], [5.0, 1.0, 6.0])
+        np.testing.assert_array_equal(self.index.prices([3, 4], '2020-10-02'), [3.0, 6.0])
+        self.index.remove(3)
+        self.assertNotIn(3, self.index)
+        self.assertListEqual(self.index.ids, [1, 2, 4])
+        self.assertTrue(np.isnan(api.PriceIndex().prices([1], ['2020-10-02'])[0]))
+
+    def test_005_from_days(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.side_effect = days_server(7, date(2020, 1, 1), date(2020, 1, 31))
+            days = api.real_asset_days(7, client=api.Client())
+            long = api.real_asset_days_many([7], client=api.Client())
+        for index in (api.PriceIndex.from_days({7: days}), api.PriceIndex.from_days(long)):
+            self.assertEqual(index.price(7, '2020-01-15'), 1014.0)
+            self.assertEqual(index.price(7, '2020-03-01'), 1030.0)
+
+    def test_006_large_batch(self):
+        index = api.PriceIndex()
+        dates = np.arange('2010-01-01', '2020-01-01', dtype='datetime64[D]')
+        for id_ in range(100):
+            index.add(id_, dates, np.arange(len(dates), dtype=np.float64))
+        ids = np.random.default_rng(0).integers(0, 100, 100000)
+        wanted = dates[np.random.default_rng(1).integers(0, len(dates), 100000)]
+        # timed in benchmarks/bench_prices.py
+        prices = index.prices(ids, wanted)
+        np.testing.assert_array_equal(prices, (wanted - dates[0]).astype(np.float64))
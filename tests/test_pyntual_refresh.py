@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.refresh` module and the refresh command."""
+
+import os
+import pandas as pd
+import tempfile
+import unittest
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from pyntual import api, cli
+from pyntual.api.refresh import MISSING, REVISED, RefreshTask, plan_refresh, refresh
+
+from .utils import catalog_server
+
+CATALOG = {1: {10: [100, 101], 11: [110]}, 2: {20: [200]}}
+FIRST, LAST = date(2020, 9, 1), date(2020, 9, 10)
+
+
+def requested_paths(mock_get) -> list:
+    return [call.args[0].split('/api/', 1)[1].split('?')[0] for call in mock_get.call_args_list]
+
+
+def listing(**last_days) -> pd.DataFrame:
+    ids = [int(id_[1:]) for id_ in last_days]
+    return pd.DataFrame({'last_day_date': pd.to_datetime([value[0] for value in last_days.values()]),
+                         'last_day_close_price': [value[1] for value in last_days.values()]}, index=ids)
+
+
+class TestPyntualRefresh(unittest.TestCase):
+    """Tests for `pyntual.api.refresh` module."""
+
+    def setUp(self):
+        self.store = api.DayStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_001_first_refresh(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            result = refresh(self.store)
+        self.assertEqual(result.real_assets, 4)
+        self.assertListEqual(result.tasks, [RefreshTask(id_, date.min, LAST, MISSING) for id_ in (100, 101, 110, 200)])
+        self.assertDictEqual(result.errors, {'asset_providers': {}, 'conceptual_assets': {}, 'real_assets': {}})
+        for id_ in (100, 101, 110, 200):
+            self.assertEqual(len(self.store.load(id_)), 10)
+
+    def test_002_up_to_date(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            refresh(self.store)
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)) as mock_get:
+            result = refresh(self.store, [10, 11, 20])
+        self.assertListEqual(result.tasks, [])
+        self.assertCountEqual(requested_paths(mock_get), ['conceptual_assets/10/real_assets',
+                                                          'conceptual_assets/11/real_assets',
+                                                          'conceptual_assets/20/real_assets'])
+
+    def test_003_only_new_days(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            refresh(self.store)
+        lasts = {100: LAST + timedelta(days=2)}
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, lasts=lasts)) as mock_get:
+            result = refresh(self.store, [10, 11, 20])
+        self.assertListEqual(result.tasks, [RefreshTask(100, LAST + timedelta(days=1), LAST + timedelta(days=2),
+                                                        MISSING)])
+        urls = [call.args[0] for call in mock_get.call_args_list if '/days' in call.args[0]]
+        self.assertEqual(len(urls), 1)
+        self.assertIn('from_date=2020-09-11', urls[0])
+        self.assertIn('to_date=2020-09-12', urls[0])
+        self.assertEqual(len(self.store.load(100)), 12)
+
+    def test_004_plan(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            refresh(self.store, [10])
+        held_price = 1000.0 + (LAST - FIRST).days
+        plan = plan_refresh(self.store, listing(r100=('2020-09-10', held_price), r101=('2020-09-10', held_price + 1),
+                                                r110=('2020-09-10', None), r200=(None, None)))
+        self.assertListEqual(plan, [RefreshTask(101, LAST, LAST, REVISED), RefreshTask(110, date.min, LAST, MISSING)])
+        plan = plan_refresh(self.store, listing(r110=('2020-09-10', None)), from_date=datetime(2020, 9, 5))
+        self.assertListEqual(plan, [RefreshTask(110, date(2020, 9, 5), LAST, MISSING)])
+        self.assertListEqual(plan_refresh(self.store, pd.DataFrame()), [])
+
+    def test_005_late_publication(self):
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+            self.store.sync(100, to_date=datetime(2020, 9, 12))
+        plan = plan_refresh(self.store, listing(r100=('2020-09-12', 1011.0)))
+        self.assertListEqual(plan, [RefreshTask(100, date(2020, 9, 11), date(2020, 9, 12), MISSING)])
+
+    def test_006_failures(self):
+        failing = ['conceptual_assets/10/real_assets', 'real_assets/200/days']
+        with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, failing)), \
+                patch('pyntual.api.client.time.sleep'):
+            result = refresh(self.store)
+        self.assertListEqual(list(result.errors['conceptual_assets']), [10])
+        self.assertListEqual(list(result.errors['real_assets']), [RefreshTask(200, date.min, LAST, MISSING)])
+        self.assertListEqual([task.real_asset_id for task in result.tasks], [110])
+
+        # every failing task of a real asset is reported, not only the last one
+        with api.DayStore(':memory:') as store:
+            with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)):
+                store.fetch(200, date(2020, 9, 4), date(2020, 9, 6))
+            with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, failing)), \
+                    patch('pyntual.api.client.time.sleep'):
+                result = refresh(store, [20])
+        self.assertListEqual(list(result.errors['real_assets']), [RefreshTask(200, date.min, date(2020, 9, 3), MISSING),
+                                                                  RefreshTask(200, date(2020, 9, 7), LAST, MISSING)])
+
+        # a failing listing of conceptual assets leaves out its asset provider only
+        failing = ['asset_providers/2/conceptual_assets']
+        with api.DayStore(':memory:') as store, \
+                patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST, failing)), \
+                patch('pyntual.api.client.time.sleep'):
+            result = refresh(store)
+        self.assertListEqual(list(result.errors['asset_providers']), [2])
+        self.assertEqual(result.real_assets, 3)
+        self.assertListEqual(sorted(task.real_asset_id for task in result.tasks), [100, 101, 110])
+
+    def test_007_wrong_params(self):
+        self.assertRaises(TypeError, refresh, ':memory:')
+        self.assertRaises(ValueError, refresh, self.store, max_workers=0)
+        self.assertRaises(TypeError, plan_refresh, self.store, pd.DataFrame(), from_date='2020-09-01')
+
+    def test_008_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, 'days.sqlite')
+            with patch('requests.Session.get', side_effect=catalog_server(CATALOG, FIRST, LAST)), \
+                    patch('sys.stdout'):
+                self.assertEqual(cli.main(['refresh', database, '--conceptual-assets', '10', '20']), 0)
+            with api.DayStore(database) as store:
+                self.assertListEqual(sorted(store.last_days()), [100, 101, 200])
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.schemas` module."""
+
+import numpy as np
+import pandas as pd
+import unittest
+
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api import schemas
+from pyntual.api.api import _to_dataframe
+
+from .utils import json_response, mock_response
+
+
+class TestPyntualSchemas(unittest.TestCase):
+    """Tests for `pyntual.api.schemas` module."""
+
+    def test_001_types(self):
+        dataframe = _to_dataframe(json_response('real_asset_days_166')['data'])
+        self.assertEqual(dataframe['price'].dtype, np.float64)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(dataframe['date']))
+        self.assertTrue(dataframe.index.is_monotonic_increasing)
+        self.assertEqual(dataframe.index[0], '166-2020-09-26')
+
+    def test_002_dtype_choices(self):
+        schema = schemas.get_schema('real_asset_day').replace(categorical=True, float32=True)
+        dataframe = _to_dataframe(json_response('real_asset_days_166')['data'], schema)
+        self.assertEqual(dataframe['price'].dtype, np.float32)
+        self.assertEqual(dataframe['close_price'].dtype, np.float32)
+        self.assertIsInstance(dataframe['close_price_type'].dtype, pd.CategoricalDtype)
+
+    def test_003_configure_schemas(self):
+        with patch.object(schemas, 'SCHEMAS', dict(schemas.SCHEMAS)), \
+                patch.object(schemas, 'DEFAULT_SCHEMA', schemas.DEFAULT_SCHEMA):
+            schemas.configure_schemas(categorical=True)
+            dataframe = _to_dataframe(json_response('conceptual_assets')['data'])
+        self.assertIsInstance(dataframe['category'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(dataframe['currency'].dtype, pd.CategoricalDtype)
+        self.assertEqual(dataframe['max_scale'].dtype, np.int64)
+        dataframe = _to_dataframe(json_response('conceptual_assets')['data'])
+        self.assertNotIsInstance(dataframe['category'].dtype, pd.CategoricalDtype)
+
+    def test_004_irregular_records(self):
+        data = [
+            {'id': '2', 'type': 'real_asset', 'attributes': {'name': 'b', 'last_day': None}},
+            {'id': '1', 'type': 'real_asset', 'attributes': {'name': 'a', 'symbol': 'A',
+                                                             'last_day': {'close_price': '1.5', 'date': 'bad'}}},
+            {'id': '3', 'type': 'real_asset', 'attributes': {'name': 'c', 'last_day': {'close_price': 2.5}}},
+        ]
+        dataframe = _to_dataframe(data)
+        self.assertListEqual(dataframe.index.to_list(), [1, 2, 3])
+        self.assertListEqual(dataframe.columns.to_list(), ['name', 'symbol', 'last_day_close_price', 'last_day_date'])
+        self.assertListEqual(dataframe['last_day_close_price'].to_list()[::2], [1.5, 2.5])
+        self.assertTrue(dataframe['last_day_date'].isna().all())
+
+    def test_005_unknown_type(self):
+        data = [{'id': 'x', 'type': 'unknown', 'attributes': {'price': '3', 'max_scale': 2}}]
+        dataframe = _to_dataframe(data)
+        self.assertEqual(dataframe['price'].dtype, np.float64)
+        self.assertEqual(dataframe['max_scale'].dtype, np.int64)
+
+    def test_006_other_date_forms(self):
+        dates = ['2020-09-22', '2020-09-23T15:30:00', '2020-09-24T00:00:00Z', 'bad', None]
+        data = [{'id': str(i), 'type': 'real_asset_day', 'attributes': {'date': date}} for i, date in enumerate(dates)]
+        dataframe = _to_dataframe(data)
+        self.assertListEqual(dataframe['date'].to_list()[:3], [pd.Timestamp('2020-09-22'),
+                                                               pd.Timestamp('2020-09-23 15:30'),
+                                                               pd.Timestamp('2020-09-24')])
+        self.assertTrue(dataframe['date'].iloc[3:].isna().all())
+
+    def test_007_configure_schemas_rebuilds_memoized_outputs(self):
+        client = api.Client(cache=api.ResponseCache())
+        with patch('requests.Session.get', return_value=mock_response('conceptual_assets')):
+            self.assertNotIsInstance(api.conceptual_assets(client=client)['currency'].dtype, pd.CategoricalDtype)
+            with patch.object(schemas, 'SCHEMAS', dict(schemas.SCHEMAS)), \
+                    patch.object(schemas, 'DEFAULT_SCHEMA', schemas.DEFAULT_SCHEMA):
+                schemas.configure_schemas(categorical=True)
+                dataframe = api.conceptual_assets(client=client)
+            self.assertIsInstance(dataframe['currency'].dtype, pd.CategoricalDtype)
+            self.assertNotIsInstance(api.conceptual_assets(client=client)['currency'].dtype, pd.CategoricalDtype)
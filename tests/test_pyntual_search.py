@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.search` module."""
+
+import unittest
+
+from unittest.mock import patch
+
+from pyntual import api
+from pyntual.api.search import normalize, normalize_run
+
+from .utils import mock_response
+
+
+def offline(*args, **kwargs):
+    raise AssertionError('no request must reach the network')
+
+
+class TestPyntualSearch(unittest.TestCase):
+    """Tests for `pyntual.api.search` module."""
+
+    def setUp(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('banks')
+            self.banks = api.banks_index()
+            mock_get.return_value = mock_response('conceptual_assets')
+            self.conceptual_assets = api.conceptual_assets_index()
+
+    def ids(self, *args, **kwargs):
+        return [int(id_) for id_ in self.banks.search(*args, output='dict', **kwargs).get('id', [])]
+
+    def test_001_normalize(self):
+        self.assertEqual(normalize('  Banco   Itaú\t- Corpbanca '), 'banco itau - corpbanca')
+        self.assertEqual(normalize('FONDO DE INVERSIÓN'), normalize('fondo de inversion'))
+        self.assertEqual(normalize(None), '')
+        self.assertEqual(normalize_run(' 8.929-K '), '8929k')
+
+    def test_002_substring(self):
+        with patch('requests.Session.get', side_effect=offline):
+            self.assertListEqual(self.ids('chile'), [1, 3])
+            self.assertListEqual(self.ids('ITAU'), [11])
+            # name start first, then word start, then inside a word
+            self.assertListEqual(self.ids('bc'), [5, 9])
+            self.assertListEqual(self.ids('ank'), [9])
+            self.assertListEqual(self.ids('santander'), [])
+            self.assertListEqual(self.ids('   '), [])
+
+    def test_003_prefix(self):
+        with patch('requests.Session.get', side_effect=offline):
+            self.assertListEqual(self.ids('ban', prefix=True), [8, 15, 1, 3, 6, 11, 16, 9])
+            self.assertListEqual(self.ids('ban', prefix=True, limit=2), [8, 15])
+            self.assertListEqual(self.ids('de ch', prefix=True), [1, 3])
+            self.assertListEqual(self.ids('ank', prefix=True), [])
+            self.assertListEqual(self.ids('ban', limit=3), self.ids('ban', prefix=True, limit=3))
+
+    def test_004_outputs(self):
+        dataframe = self.banks.search('banco', limit=3)
+        self.assertListEqual(dataframe.index.to_list(), [1, 8, 15])
+        self.assertListEqual(dataframe['name'].to_list(), ['Banco de Chile', 'Banco Bice', 'Banco Consorcio'])
+        self.assertEqual(len(self.banks), 10)
+        self.assertEqual(len(self.banks.search('banco', output='numpy')['id']), 7)
+
+    def test_005_lookup_run(self):
+        with patch('requests.Session.get', side_effect=offline):
+            columns = self.conceptual_assets.lookup_run('8.929-K', output='dict')
+            self.assertEqual(columns['name'], ['FONDO MUTUO CREDICORP CAPITAL INDICE CHILE'])
+            self.assertEqual(len(self.conceptual_assets.lookup_run('1234-5')), 0)
+            self.assertEqual(len(self.conceptual_assets.search('fondo de inversion')), 2)
+
+    def test_006_refresh(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('banks_q_de_chile')
+            self.banks.refresh()
+            self.assertEqual(mock_get.call_count, 1)
+            self.assertListEqual(self.ids('banco'), [1, 3])
+
+            mock_get.return_value = mock_response('banks')
+            index = api.banks_index(max_age=60)
+            with patch('time.monotonic', return_value=index._snapshot.built + 30):
+                index.search('banco')
+            self.assertEqual(mock_get.call_count, 2)
+            with patch('time.monotonic', return_value=index._snapshot.built + 61):
+                index.search('banco')
+            self.assertEqual(mock_get.call_count, 3)
+
+    def test_007_wrong_params(self):
+        self.assertRaises(TypeError, self.banks.search, 3)
+        self.assertRaises(TypeError, self.conceptual_assets.lookup_run, 8929)
+        self.assertRaises(ValueError, self.banks.search, 'banco', output='polars')
+        with patch('requests.Session.get', side_effect=offline):
+            self.assertRaises(ValueError, api.banks_index, max_age=0)
+
+    def test_008_word_matches_by_name(self):
+        names = ['Zeta Fondo', 'Alfa Fondo Beta', 'Fondo Gamma', 'Delta Fondo Alfa']
+        index = api.SearchIndex(lambda: [{'id': str(id_), 'attributes': {'name': name}}
+                                         for id_, name in enumerate(names)])
+        for prefix in (True, False):
+            with self.subTest(prefix=prefix):
+                columns = index.search('fondo', prefix=prefix, output='dict')
+                self.assertListEqual(columns['name'], ['Fondo Gamma', 'Alfa Fondo Beta', 'Delta Fondo Alfa',
+                                                       'Zeta Fondo'])
+                self.assertListEqual(index.search('fondo', prefix=prefix, limit=2, output='dict')['name'],
+                                     ['Fondo Gamma', 'Alfa Fondo Beta'])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.store` module."""
+
+import os
+import pandas as pd
+import tempfile
+import unittest
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from pyntual import api
+
+from .utils import days_server, mock_response
+
+
+class TestPyntualStore(unittest.TestCase):
+    """Tests for `pyntual.api.store` module."""
+
+    def setUp(self):
+        self.store = api.DayStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_001_first_sync_fetches(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            dataframe = self.store.real_asset_days(166, from_date=datetime(2020, 9, 26), to_date=datetime(2020, 10, 5))
+            expected = api.real_asset_days(166)
+        self.assertIn('from_date=2020-09-26', mock_get.call_args_list[0].args[0])
+        self.assertIn('to_date=2020-10-05', mock_get.call_args_list[0].args[0])
+        pd.testing.assert_frame_equal(dataframe, expected)
+        self.assertListEqual(self.store.coverage(166), [(date(2020, 9, 26), date(2020, 10, 5))])
+
+    def test_002_held_range_not_fetched(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            self.store.sync(166, from_date=datetime(2020, 9, 26), to_date=datetime(2020, 10, 5))
+            dataframe = self.store.real_asset_days(166, from_date=datetime(2020, 9, 28), to_date=datetime(2020, 9, 30))
+            single = self.store.real_asset_days(166, date=datetime(2020, 10, 1))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(dataframe), 3)
+        self.assertEqual(len(single), 1)
+
+    def test_003_only_missing_ranges_fetched(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('empty_data')
+            self.store.sync(166, from_date=datetime(2020, 9, 10), to_date=datetime(2020, 9, 20))
+            self.assertEqual(self.store.sync(166, from_date=datetime(2020, 9, 1), to_date=datetime(2020, 9, 30)), 2)
+        urls = [call.args[0] for call in mock_get.call_args_list[1:]]
+        self.assertIn('from_date=2020-09-01', urls[0])
+        self.assertIn('to_date=2020-09-09', urls[0])
+        self.assertIn('from_date=2020-09-21', urls[1])
+        self.assertIn('to_date=2020-09-30', urls[1])
+        self.assertListEqual(self.store.coverage(166), [(date(2020, 9, 1), date(2020, 9, 30))])
+
+    def test_004_unbounded_sync(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            self.store.sync(166)
+            self.store.sync(166)
+        self.assertNotIn('from_date', mock_get.call_args_list[0].args[0])
+        self.assertEqual(self.store.coverage(166)[0][0], date.min)
+        # recent days are held up to the latest one received, the following ones are requested again
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn('from_date=2020-10-06', mock_get.call_args_list[1].args[0])
+
+    def test_005_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'days.sqlite')
+            with patch('requests.Session.get') as mock_get:
+                mock_get.return_value = mock_response('real_asset_days_166')
+                with api.DayStore(path) as store:
+                    store.sync(166, from_date=datetime(2020, 9, 26), to_date=datetime(2020, 10, 5))
+                with api.DayStore(path) as store:
+                    self.assertEqual(store.sync(166, from_date=datetime(2020, 9, 26), to_date=datetime(2020, 10, 5)), 0)
+                    self.assertEqual(len(store.load(166)), 10)
+
+    def test_006_wrong_params(self):
+        self.assertRaises(TypeError, self.store.real_asset_days, 'string')
+        self.assertRaises(TypeError, self.store.real_asset_days, 166, from_date='string')
+        self.assertRaises(ValueError, self.store.real_asset_days, 166, date=datetime.now(), to_date=datetime.now())
+        self.assertRaises(ValueError, self.store.real_asset_days, 166,
+                          from_date=datetime(2020, 10, 1), to_date=datetime(2020, 9, 1))
+        self.assertRaises(ValueError, self.store.sync, 166, from_date=datetime(2099, 1, 1))
+        self.assertRaises(ValueError, self.store.load, 166, from_date=datetime(2099, 1, 1))
+
+    def test_007_fetch_and_last_days(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = mock_response('real_asset_days_166')
+            self.store.sync(166, from_date=datetime(2020, 9, 26), to_date=datetime(2020, 10, 5))
+            self.assertEqual(self.store.fetch(166, date(2020, 10, 5), date(2020, 10, 5)), 10)
+            self.assertEqual(mock_get.call_count, 2)
+            expected = api.real_asset_days(166).sort_values('date').iloc[-1]
+        self.assertListEqual(self.store.coverage(166), [(date(2020, 9, 26), date(2020, 10, 5))])
+        last_days = self.store.last_days()
+        self.assertListEqual(list(last_days), [166])
+        self.assertEqual(last_days[166], (date(2020, 10, 5), expected['close_price']))
+        self.assertDictEqual(self.store.last_days([175]), {})
+
+    def test_008_late_publication(self):
+        today = date.today()
+        first = datetime.combine(today - timedelta(days=20), datetime.min.time())
+        with patch('requests.Session.get', side_effect=days_server(166, first.date(), today - timedelta(days=2))):
+            self.store.sync(166, from_date=first)
+        self.assertListEqual(self.store.coverage(166), [(first.date(), today - timedelta(days=2))])
+        with patch('requests.Session.get', side_effect=days_server(166, first.date(), today)) as mock_get:
+            self.store.sync(166, from_date=first)
+        self.assertIn(f'from_date={(today - timedelta(days=1)).isoformat()}', mock_get.call_args.args[0])
+        self.assertEqual(len(self.store.load(166, from_date=first)), 21)
+        self.assertListEqual(self.store.coverage(166), [(first.date(), today - timedelta(days=1))])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.streaming` module."""
+
+import io
+import json
+import pandas as pd
+import unittest
+
+from requests import Response
+from requests.exceptions import HTTPError
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from pyntual import api
+from pyntual.api.streaming import iter_data
+
+from .utils import json_response, mock_response
+
+
+def chunked(body: str, size: int) -> List[bytes]:
+    encoded = body.encode('utf-8')
+    return [encoded[i:i + size] for i in range(0, len(encoded), size)]
+
+
+def streamed_response(name: str, size: int = 7) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.__enter__.return_value = response
+    response.iter_content.return_value = chunked(json.dumps(json_response(name), indent=2), size)
+    return response
+
+
+class TestPyntualStreaming(unittest.TestCase):
+    """Tests for `pyntual.api.streaming` module."""
+
+    def test_001_iter_data(self):
+        for name in ['real_asset_days_166', 'conceptual_assets', 'asset_provider_3', 'empty_data']:
+            expected = json_response(name)['data']
+            expected = expected if isinstance(expected, list) else [expected]
+            for size in [1, 3, 1024]:
+                with self.subTest(name=name, size=size):
+                    body = json.dumps(json_response(name), ensure_ascii=False)
+                    self.assertListEqual(list(iter_data(chunked(body, size))), expected)
+
+    def test_002_iter_data_tricky_strings(self):
+        body = '{"data" :[ {"id": "1", "attributes": {"name": "a]}, \\"b\\" ,[ ó"}} ,\n{"id": "2"} ] }'
+        self.assertListEqual([item['id'] for item in iter_data(chunked(body, 2))], ['1', '2'])
+
+    def test_003_iter_data_malformed(self):
+        self.assertRaises(ValueError, list, iter_data(chunked('{"meta": {}}', 4)))
+        self.assertRaises(ValueError, list, iter_data(chunked('{"data": [{"id": "1"}', 4)))
+        self.assertRaises(ValueError, list, iter_data(chunked('{"data": [{"id": "1", ', 4)))
+
+    def test_004_real_asset_days_stream(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = streamed_response('real_asset_days_166')
+            dataframe = api.real_asset_days_stream(166, batch_size=3)
+            self.assertTrue(mock_get.call_args.kwargs['stream'])
+            mock_get.return_value = mock_response('real_asset_days_166')
+            expected = api.real_asset_days(166)
+        pd.testing.assert_frame_equal(dataframe, expected)
+
+    def test_005_iter_real_asset_days(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = streamed_response('real_asset_days_166')
+            batches = list(api.iter_real_asset_days(166, batch_size=4))
+        self.assertListEqual([len(batch) for batch in batches], [4, 4, 2])
+        self.assertListEqual(batches[0].columns.to_list(), ['date', 'price', 'close_price', 'close_price_type'])
+
+    def test_006_stream_empty(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = streamed_response('empty_data')
+            self.assertTrue(api.real_asset_days_stream(166).empty)
+
+    def test_007_stream_not_found(self):
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = Response()
+            mock_get.return_value.status_code = 404
+            mock_get.return_value.raw = io.BytesIO()
+            self.assertRaises(HTTPError, api.real_asset_days_stream, 1)
+
+    def test_008_stream_wrong_params(self):
+        self.assertRaises(TypeError, api.real_asset_days_stream, 'string')
+        self.assertRaises(ValueError, api.real_asset_days_stream, 166, batch_size=0)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""Tests for `pyntual.api.throttling` module."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from requests.exceptions import ConnectionError, HTTPError
+from unittest.mock import patch
+
+from pyntual import api
+
+from .utils import mock_response
+
+
+def failing_response(status_code: int, retry_after=None):
+    response = mock_response('empty_data', status_code)
+    response.headers = {} if retry_after is None else {'Retry-After': retry_after}
+    response.raise_for_status.side_effect = HTTPError(f'{status_code} Error')
+    return response
+
+
+class TestPyntualRateLimiter(unittest.TestCase):
+    """Tests for `pyntual.api.throttling.RateLimiter`."""
+
+    def test_001_burst_then_rate(self):
+        limiter = api.RateLimiter(rate=1000, burst=2)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertAlmostEqual(limiter.reserve(), 0.001, delta=0.0005)
+        self.assertAlmostEqual(limiter.reserve(), 0.002, delta=0.0005)
+        self.assertEqual(limiter.throttled, 2)
+
+    def test_002_shared_across_threads(self):
+        limiter = api.RateLimiter(rate=200, burst=1)
+        depths = []
+
+        def worker():
+            limiter.acquire()
+            depths.append(limiter.queue_depth)
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.035)
+        self.assertGreater(max(depths), 0)
+        self.assertEqual(limiter.queue_depth, 0)
+
+    def test_003_async(self):
+        limiter = api.RateLimiter(rate=200, burst=1)
+
+        async def run():
+            await asyncio.gather(*[limiter.acquire_async() for _ in range(5)])
+
+        start = time.monotonic()
+        asyncio.run(run())
+        self.assertGreaterEqual(time.monotonic() - start, 0.015)
+
+    def test_004_client(self):
+        limiter = api.RateLimiter(rate=5, burst=1)
+        client = api.Client(rate_limiter=limiter)
+        with patch('requests.Session.get') as mock_get, patch('pyntual.api.throttling.time.sleep') as mock_sleep:
+            mock_get.return_value = mock_response('banks')
+            api.banks(client=client)
+            api.banks(client=client)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.2, delta=0.05)
+
+    def test_005_wrong_params(self):
+        self.assertRaises(ValueError, api.RateLimiter, rate=0)
+        self.assertRaises(ValueError, api.RateLimiter, rate=1, burst=0)
+
+
+class TestPyntualRetryPolicy(unittest.TestCase):
+    """Tests for `pyntual.api.throttling.RetryPolicy`."""
+
+    def test_001_backoff(self):
+        policy = api.RetryPolicy(backoff=1, max_delay=5, jitter=False)
+        self.assertListEqual([policy.delay(attempt) for attempt in range(5)], [1, 2, 4, 5, 5])
+        jittered = api.RetryPolicy(backoff=1, max_delay=5)
+        for attempt in range(5):
+            self.assertLessEqual(jittered.delay(attempt), min(5, 2 ** attempt))
+
+    def test_002_retry_after(self):
+        policy = api.RetryPolicy(max_delay=30)
+        self.assertEqual(policy.delay(0, '7'), 7)
+        self.assertEqual(policy.delay(0, '120'), 30)
+        in_ten = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+        self.assertAlmostEqual(policy.delay(0, in_ten), 10, delta=1.5)
+        self.assertLessEqual(policy.delay(0, 'garbage'), 0.5)
+
+    def test_003_client_retries(self):
+        client = api.Client(retry=api.RetryPolicy(retries=3))
+        responses = [failing_response(503, '2'), failing_response(429), mock_response('banks')]
+        with patch('requests.Session.get', side_effect=responses) as mock_get, \
+                patch('pyntual.api.client.time.sleep') as mock_sleep:
+            dataframe = api.banks(client=client)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_sleep.call_args_list[0].args[0], 2)
+        self.assertFalse(dataframe.empty)
+
+    def test_004_client_gives_up(self):
+        client = api.Client(retry=api.RetryPolicy(retries=2))
+        with patch('requests.Session.get', return_value=failing_response(503)) as mock_get, \
+                patch('pyntual.api.client.time.sleep'):
+            self.assertRaises(HTTPError, api.banks, client=client)
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_005_client_connection_errors(self):
+        client = api.Client(retry=api.RetryPolicy(retries=1))
+        with patch('requests.Session.get', side_effect=[ConnectionError('reset'), mock_response('banks')]), \
+                patch('pyntual.api.client.time.sleep'):
+            self.assertFalse(api.banks(client=client).empty)
+        with patch('requests.Session.get', side_effect=ConnectionError('reset')), \
+                patch('pyntual.api.client.time.sleep'):
+            self.assertRaises(ConnectionError, api.banks, client=client)
+
+    def test_006_not_transient(self):
+        client = api.Client(retry=api.RetryPolicy(retries=3))
+        with patch('requests.Session.get', return_value=failing_response(404)) as mock_get:
+            self.assertRaises(HTTPError, api.banks, client=client)
+        self.assertEqual(mock_get.call_count, 1)
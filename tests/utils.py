@@ -0,0 +1,125 @@
+"""Shared helpers for the `pyntual` test suite."""
+
+import json
+import os
+
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+from requests.exceptions import HTTPError
+
+
+def json_response(name: str) -> dict:
+    """
+    Loads one of the recorded external API responses in `tests/json_responses`.
+
+    :param name: Name of the file, without extension.
+    :return: Decoded JSON response.
+    """
+    dirname = os.path.dirname(__file__)
+    with open(os.path.join(dirname, 'json_responses', f'{name}.json')) as json_response_file:
+        return json.load(json_response_file)
+
+
+def body_response(body: dict, status_code: int = 200) -> MagicMock:
+    """
+    Builds a mocked requests.Response whose body is the given JSON document.
+
+    :param body: Decoded JSON body.
+    :param status_code: HTTP status of the response.
+    :return: Mocked response.
+    """
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(body).encode('utf-8')
+    return response
+
+
+def mock_response(name: str, status_code: int = 200) -> MagicMock:
+    """
+    Builds a mocked requests.Response serving one of the recorded external API responses.
+
+    :param name: Name of the file, without extension.
+    :param status_code: HTTP status of the response.
+    :return: Mocked response.
+    """
+    return body_response(json_response(name), status_code)
+
+
+def days_server(real_asset_id: int, first: date, last: date, start_date: Optional[date] = None) -> Callable:
+    """
+    Builds a fake requests.Session.get serving a synthetic daily series of a real asset between two dates, honoring
+    the date, from_date and to_date parameters. /real_assets/{id} is served too, with the given start_date.
+
+    :param real_asset_id: Id of the real asset.
+    :param first: First published date.
+    :param last: Last published date.
+    :param start_date: start_date attribute of the real asset.
+    :return: Function to be used as side effect of a requests.Session.get mock.
+    """
+    def get(url: str, **kwargs) -> MagicMock:
+        parsed = urlparse(url)
+        params = {key: datetime.strptime(value[0], '%Y-%m-%d').date() for key, value in parse_qs(parsed.query).items()}
+        if not parsed.path.endswith('/days'):
+            attributes = {'name': 'Synthetic', 'start_date': start_date.isoformat() if start_date else None,
+                          'end_date': None, 'previous_asset_id': None,
+                          'last_day': {'close_price': 1000.0, 'date': last.isoformat()}}
+            return body_response({'data': {'id': str(real_asset_id), 'type': 'real_asset', 'attributes': attributes}})
+        low = params.get('date', params.get('from_date', first))
+        high = params.get('date', params.get('to_date', last))
+        data, day = [], min(high, last)
+        while day >= max(low, first):
+            price = 1000.0 + (day - first).days
+            data.append({'id': f'{real_asset_id}-{day.isoformat()}', 'type': 'real_asset_day',
+                         'attributes': {'date': day.isoformat(), 'price': price, 'close_price': price,
+                                        'close_price_type': 'clp'}})
+            day -= timedelta(days=1)
+        return body_response({'data': data})
+    return get
+
+
+def catalog_server(catalog: Dict[int, Dict[int, List[int]]], first: date, last: date,
+                   failing: Iterable[str] = (), lasts: Optional[Dict[int, date]] = None) -> Callable:
+    """
+    Builds a fake requests.Session.get serving a synthetic catalog: asset providers, their conceptual assets, their
+    real assets and a daily series of each real asset between two dates (see days_server).
+
+    :param catalog: Real asset ids by conceptual asset id, by asset provider id.
+    :param first: First published date of every real asset.
+    :param last: Last published date of every real asset.
+    :param failing: Paths answered with a 500 error, such as 'conceptual_assets/10/real_assets'.
+    :param lasts: Last published date of some real assets, instead of last. Listings of real assets report the last
+        day of each one, as last_day.
+    :return: Function to be used as side effect of a requests.Session.get mock.
+    """
+    failing = set(failing)
+    lasts = lasts or {}
+
+    def attributes(type_: str, id_: int) -> dict:
+        if type_ != 'real_asset':
+            return {'name': str(id_)}
+        day = lasts.get(id_, last)
+        return {'name': str(id_), 'last_day': {'close_price': 1000.0 + (day - first).days, 'date': day.isoformat()}}
+
+    listings = {'asset_providers': ('asset_provider', list(catalog))}
+    for provider_id, conceptual_assets in catalog.items():
+        listings[f'asset_providers/{provider_id}/conceptual_assets'] = ('conceptual_asset', list(conceptual_assets))
+        for conceptual_asset_id, real_asset_ids in conceptual_assets.items():
+            listings[f'conceptual_assets/{conceptual_asset_id}/real_assets'] = ('real_asset', real_asset_ids)
+
+    def get(url: str, **kwargs) -> MagicMock:
+        path = urlparse(url).path.split('/api/', 1)[1]
+        if path in failing:
+            response = MagicMock()
+            response.status_code = 500
+            response.raise_for_status.side_effect = HTTPError(f'500 Server Error for url: {url}')
+            return response
+        if path in listings:
+            type_, ids = listings[path]
+            return body_response({'data': [{'id': str(id_), 'type': type_, 'attributes': attributes(type_, id_)}
+                                           for id_ in ids]})
+        real_asset_id = int(path.split('/')[1])
+        return days_server(real_asset_id, first, lasts.get(real_asset_id, last))(url, **kwargs)
+    return get